@@ -0,0 +1,3 @@
+"""Subcomandos da linha de comando (modo headless, sem PyQt6)."""
+
+# "A linha de comando é a linguagem franca dos servidores." — Anônimo
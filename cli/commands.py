@@ -0,0 +1,531 @@
+import json
+import sys
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import click
+
+from cli.common import (
+    REPORT_FORMATS,
+    batch_options,
+    collect_pdfs,
+    emit_report,
+    input_options,
+    output_dir_option,
+    parse_pages,
+    parse_ranges,
+    run_operation,
+)
+from config.settings import (
+    COMPRESS_PROFILES,
+    OCR_AUTO_MIN_QUALITY,
+    OCR_BACKEND,
+    OCR_CPU_WORKERS,
+    WATCH_POLL_S,
+    WATCH_QUEUE_SIZE,
+    WATCH_SETTLE_S,
+)
+
+if TYPE_CHECKING:
+    from core.batch_operations import OperationSpec
+
+# Os módulos de core são importados dentro de cada comando (ou nos workers, via
+# OperationSpec), para que "pdfforge rotate" não carregue torch, cv2 nem PyQt6.
+
+_PATHS = click.argument("paths", nargs=-1, required=True, type=click.Path(exists=True))
+
+
+def _spec(name: str, params: dict | None = None) -> "OperationSpec":
+    from core.batch_operations import OperationSpec
+
+    return OperationSpec(name, params or {})
+
+
+@click.command()
+@_PATHS
+@click.option(
+    "-o",
+    "--output",
+    type=click.Path(dir_okay=False, path_type=Path),
+    required=True,
+    help="PDF de saída.",
+)
+@input_options
+def merge(paths: tuple[str, ...], output: Path, recursive: bool, report_format: str) -> None:
+    """Concatena PDFs (na ordem informada) em um único arquivo.
+
+    A concatenação é sequencial e gera uma só saída: não há --jobs, --dedupe nem
+    --estimate.
+    """
+    from core.batch_processor import BatchReport, FileResult
+    from core.pdf_merger import MergeEntry, PDFMerger
+
+    files = collect_pdfs(paths, recursive)
+    if not files:
+        click.echo("Erro: nenhum PDF encontrado.", err=True)
+        sys.exit(1)
+
+    def on_progress(current: int, total: int, filename: str) -> None:
+        click.echo(f"  [{current}/{total}] {filename}", err=True)
+
+    output.parent.mkdir(parents=True, exist_ok=True)
+    start = time.monotonic()
+    result = PDFMerger().merge([MergeEntry(p) for p in files], output, on_progress)
+    report = BatchReport()
+    report.add(
+        FileResult(
+            path=output,
+            success=result.success,
+            duration_s=time.monotonic() - start,
+            message=(
+                f"{len(result.sources)} arquivos, {result.total_pages} páginas"
+                if result.success
+                else result.error
+            ),
+            output_path=output if result.success else None,
+            pages=result.total_pages,
+            input_bytes=sum(p.stat().st_size for p in files),
+            output_bytes=output.stat().st_size if result.success else 0,
+        )
+    )
+    report.duration_s = time.monotonic() - start
+    emit_report(report, report_format)
+    if report.failed:
+        sys.exit(1)
+
+
+@click.command()
+@_PATHS
+@click.option("--every", type=click.IntRange(min=1), help="Uma parte a cada N páginas.")
+@click.option("--ranges", "ranges_spec", help='Faixas base 1, ex.: "1-3,4-10".')
+@click.option("--max-mb", type=click.FloatRange(min=0.01), help="Tamanho máximo por parte.")
+@click.option("--bookmarks", is_flag=True, default=False, help="Uma parte por marcador.")
+@output_dir_option
+@batch_options
+def split(
+    paths: tuple[str, ...],
+    every: int | None,
+    ranges_spec: str | None,
+    max_mb: float | None,
+    bookmarks: bool,
+    output_dir: Path,
+    jobs: int,
+    recursive: bool,
+    report_format: str,
+) -> None:
+    """Divide cada PDF em partes, gravadas em <saída>/<nome do PDF>/."""
+    chosen = [v for v in (every, ranges_spec, max_mb, bookmarks or None) if v is not None]
+    if len(chosen) > 1:
+        raise click.UsageError("Use apenas um de --every, --ranges, --max-mb e --bookmarks.")
+    if ranges_spec:
+        params = {"mode": "ranges", "ranges": parse_ranges(ranges_spec)}
+    elif max_mb is not None:
+        params = {"mode": "size", "max_mb": max_mb}
+    elif bookmarks:
+        params = {"mode": "bookmarks"}
+    else:
+        params = {"mode": "pages", "pages": every or 1}
+    run_operation(paths, _spec("split", params), output_dir, jobs, recursive, report_format)
+
+
+@click.command()
+@_PATHS
+@click.option(
+    "--profile",
+    type=click.Choice(list(COMPRESS_PROFILES)),
+    default="medio",
+    show_default=True,
+    help="Perfil de compressão.",
+)
+@output_dir_option
+@batch_options
+def compress(
+    paths: tuple[str, ...],
+    profile: str,
+    output_dir: Path,
+    jobs: int,
+    recursive: bool,
+    report_format: str,
+) -> None:
+    """Recomprime imagens e reescreve os PDFs com deflate."""
+    spec = _spec("compress", {"profile": profile})
+    run_operation(paths, spec, output_dir, jobs, recursive, report_format)
+
+
+@click.command()
+@_PATHS
+@click.option(
+    "--lang",
+    "languages",
+    multiple=True,
+    default=("pt", "en"),
+    show_default=True,
+    help="Idioma do OCR (repita para vários).",
+)
+@click.option(
+    "--mode",
+    type=click.Choice(["all", "auto", "regions"]),
+    default="all",
+    show_default=True,
+    help="auto: só páginas sem camada de texto (ou com camada ilegível). regions: também "
+    "as imagens (carimbos, tabelas coladas) das páginas com texto, sem rasterizar o resto.",
+)
+@click.option(
+    "--min-quality",
+    type=click.FloatRange(0.0, 1.0),
+    default=OCR_AUTO_MIN_QUALITY,
+    show_default=True,
+    help="Nos modos auto e regions, camadas com ao menos essa fração legível são mantidas.",
+)
+@click.option(
+    "--cpu-workers",
+    type=click.IntRange(min=0),
+    default=OCR_CPU_WORKERS,
+    show_default=True,
+    help="Sem CUDA: processos de OCR, cada um com seu modelo (0 = núcleos / "
+    "OCR_CPU_THREADS_PER_WORKER).",
+)
+@click.option(
+    "--backend",
+    type=click.Choice(["easyocr", "tesseract"]),
+    default=OCR_BACKEND,
+    show_default=True,
+    help="Motor de OCR: easyocr (GPU) ou tesseract (CPU, mais leve).",
+)
+@output_dir_option
+@batch_options
+@click.pass_obj
+def ocr(
+    obj: dict,
+    paths: tuple[str, ...],
+    languages: tuple[str, ...],
+    mode: str,
+    min_quality: float,
+    cpu_workers: int,
+    backend: str,
+    output_dir: Path,
+    jobs: int,
+    recursive: bool,
+    report_format: str,
+) -> None:
+    """Reconhece o texto de páginas escaneadas e grava a camada de texto invisível."""
+    params = {"use_gpu": obj.get("use_gpu", True), "languages": list(languages), "mode": mode}
+    if mode in ("auto", "regions"):
+        params["min_quality"] = min_quality
+    if cpu_workers != OCR_CPU_WORKERS:
+        params["cpu_workers"] = cpu_workers
+    if backend != OCR_BACKEND:
+        params["backend"] = backend
+    from core.ocr_engine import close_shared_engines
+
+    try:
+        run_operation(paths, _spec("ocr", params), output_dir, jobs, recursive, report_format)
+    finally:
+        close_shared_engines()
+
+
+@click.command()
+@_PATHS
+@click.option(
+    "--angle",
+    type=click.Choice(["90", "180", "270"]),
+    default="90",
+    show_default=True,
+    help="Ângulo de rotação (horário).",
+)
+@output_dir_option
+@batch_options
+def rotate(
+    paths: tuple[str, ...],
+    angle: str,
+    output_dir: Path,
+    jobs: int,
+    recursive: bool,
+    report_format: str,
+) -> None:
+    """Rotaciona todas as páginas."""
+    spec = _spec("rotate", {"angle": int(angle)})
+    run_operation(paths, spec, output_dir, jobs, recursive, report_format)
+
+
+@click.command()
+@_PATHS
+@click.option("--text", help="Texto da marca d'água.")
+@click.option(
+    "--image", type=click.Path(exists=True, dir_okay=False), help="Imagem da marca d'água."
+)
+@click.option("--opacity", type=click.FloatRange(0.0, 1.0), default=0.3, show_default=True)
+@click.option("--font-size", type=click.IntRange(min=1), default=48, show_default=True)
+@click.option("--rotation", type=float, default=-45.0, show_default=True)
+@click.option(
+    "--position", type=click.Choice(["center", "tile"]), default="center", show_default=True
+)
+@output_dir_option
+@batch_options
+def watermark(
+    paths: tuple[str, ...],
+    text: str | None,
+    image: str | None,
+    opacity: float,
+    font_size: int,
+    rotation: float,
+    position: str,
+    output_dir: Path,
+    jobs: int,
+    recursive: bool,
+    report_format: str,
+) -> None:
+    """Aplica marca d'água de texto ou imagem em todas as páginas."""
+    if bool(text) == bool(image):
+        raise click.UsageError("Informe exatamente um de --text e --image.")
+    if image:
+        params: dict = {"image_path": str(Path(image).resolve()), "opacity": opacity}
+    else:
+        params = {
+            "text": text,
+            "opacity": opacity,
+            "font_size": font_size,
+            "rotation": rotation,
+            "position": position,
+        }
+    run_operation(paths, _spec("watermark", params), output_dir, jobs, recursive, report_format)
+
+
+@click.command()
+@_PATHS
+@click.option(
+    "--password",
+    envvar="PDFFORGE_PASSWORD",
+    prompt=True,
+    hide_input=True,
+    confirmation_prompt=True,
+    help="Senha de abertura (ou variável PDFFORGE_PASSWORD).",
+)
+@click.option("--owner-password", default=None, help="Senha de permissões (padrão: a mesma).")
+@output_dir_option
+@batch_options
+def encrypt(
+    paths: tuple[str, ...],
+    password: str,
+    owner_password: str | None,
+    output_dir: Path,
+    jobs: int,
+    recursive: bool,
+    report_format: str,
+) -> None:
+    """Encripta os PDFs com AES-256."""
+    params = {"user_password": password, "owner_password": owner_password}
+    run_operation(paths, _spec("encrypt", params), output_dir, jobs, recursive, report_format)
+
+
+@click.command()
+@_PATHS
+@output_dir_option
+@batch_options
+def classify(
+    paths: tuple[str, ...], output_dir: Path, jobs: int, recursive: bool, report_format: str
+) -> None:
+    """Classifica o tipo de cada documento (contrato, nota fiscal, laudo...)."""
+    run_operation(paths, _spec("classify"), output_dir, jobs, recursive, report_format)
+
+
+@click.command()
+@_PATHS
+@click.option(
+    "--format",
+    "fmt",
+    type=click.Choice(["png", "jpg"]),
+    default="png",
+    show_default=True,
+    help="Formato das imagens.",
+)
+@click.option("--dpi", type=click.IntRange(min=36, max=1200), default=150, show_default=True)
+@output_dir_option
+@batch_options
+def images(
+    paths: tuple[str, ...],
+    fmt: str,
+    dpi: int,
+    output_dir: Path,
+    jobs: int,
+    recursive: bool,
+    report_format: str,
+) -> None:
+    """Exporta cada página como imagem em <saída>/<nome do PDF>/."""
+    spec = _spec("images", {"fmt": fmt, "dpi": dpi})
+    run_operation(paths, spec, output_dir, jobs, recursive, report_format)
+
+
+@click.command()
+@_PATHS
+@click.option("--order", "order_spec", help='Nova ordem das páginas (base 1), ex.: "3,1-2".')
+@click.option("--delete", "delete_spec", help='Páginas a remover (base 1), ex.: "2,5-6".')
+@click.option("--reverse", is_flag=True, default=False, help="Inverte a ordem das páginas.")
+@output_dir_option
+@batch_options
+def organize(
+    paths: tuple[str, ...],
+    order_spec: str | None,
+    delete_spec: str | None,
+    reverse: bool,
+    output_dir: Path,
+    jobs: int,
+    recursive: bool,
+    report_format: str,
+) -> None:
+    """Reordena, remove ou inverte páginas."""
+    if not (order_spec or delete_spec or reverse):
+        raise click.UsageError("Informe --order, --delete ou --reverse.")
+    params: dict = {"reverse": reverse}
+    if order_spec:
+        params["order"] = parse_pages(order_spec)
+    if delete_spec:
+        params["delete"] = parse_pages(delete_spec)
+    run_operation(paths, _spec("organize", params), output_dir, jobs, recursive, report_format)
+
+
+@click.command()
+@_PATHS
+@click.option(
+    "--pair",
+    "pairs",
+    multiple=True,
+    required=True,
+    help="Par BUSCAR=SUBSTITUIR (repita para vários).",
+)
+@click.option("--case-sensitive", is_flag=True, help="Diferencia maiúsculas de minúsculas.")
+@output_dir_option
+@batch_options
+def replace(
+    paths: tuple[str, ...],
+    pairs: tuple[str, ...],
+    case_sensitive: bool,
+    output_dir: Path,
+    jobs: int,
+    recursive: bool,
+    report_format: str,
+) -> None:
+    """Substitui textos preservando a fonte, o tamanho e a cor originais."""
+    parsed = []
+    for pair in pairs:
+        search, sep, replacement = pair.partition("=")
+        if not sep or not search:
+            raise click.BadParameter(
+                f"use BUSCAR=SUBSTITUIR, recebido '{pair}'", param_hint="--pair"
+            )
+        parsed.append([search, replacement])
+    spec = _spec("replace", {"pairs": parsed, "case_sensitive": case_sensitive})
+    run_operation(paths, spec, output_dir, jobs, recursive, report_format)
+
+
+@click.command()
+@click.argument("input_dir", type=click.Path(file_okay=False, path_type=Path))
+@click.option("--operation", "op_name", default="compress", show_default=True, help="Operação.")
+@click.option(
+    "--params", "params_json", default="{}", help="Parâmetros JSON, ex.: '{\"angle\": 90}'."
+)
+@click.option(
+    "--pipeline",
+    "pipeline_file",
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+    help="Arquivo JSON com as etapas do pipeline (substitui --operation).",
+)
+@output_dir_option
+@click.option("--done-dir", type=click.Path(file_okay=False, path_type=Path), default=None)
+@click.option("--failed-dir", type=click.Path(file_okay=False, path_type=Path), default=None)
+@click.option(
+    "--settle",
+    type=click.FloatRange(min=0.0),
+    default=WATCH_SETTLE_S,
+    show_default=True,
+    help="Segundos com tamanho estável antes de processar.",
+)
+@click.option("--poll", type=click.FloatRange(min=0.05), default=WATCH_POLL_S, show_default=True)
+@click.option(
+    "--queue-size", type=click.IntRange(min=1), default=WATCH_QUEUE_SIZE, show_default=True
+)
+@click.option("-j", "--jobs", type=click.IntRange(min=1), default=1, show_default=True)
+@click.option(
+    "--report",
+    "report_format",
+    type=click.Choice(REPORT_FORMATS),
+    default="text",
+    show_default=True,
+    help="Formato do relatório impresso ao encerrar.",
+)
+def watch(
+    input_dir: Path,
+    op_name: str,
+    params_json: str,
+    pipeline_file: Path | None,
+    output_dir: Path,
+    done_dir: Path | None,
+    failed_dir: Path | None,
+    settle: float,
+    poll: float,
+    queue_size: int,
+    jobs: int,
+    report_format: str,
+) -> None:
+    """Monitora uma pasta e processa cada PDF novo (encerre com SIGTERM ou Ctrl+C).
+
+    Concluídos vão para INPUT_DIR/done, falhas para INPUT_DIR/failed.
+    """
+    from core.watch_folder import WatchConfig, WatchFolder
+
+    try:
+        if pipeline_file is not None:
+            steps = json.loads(pipeline_file.read_text(encoding="utf-8"))
+            if isinstance(steps, dict):
+                steps = steps.get("steps", [])
+            spec = _spec("pipeline", {"steps": steps})
+        else:
+            spec = _spec(op_name, json.loads(params_json))
+    except (ValueError, OSError) as exc:
+        raise click.UsageError(str(exc)) from None
+
+    config = WatchConfig(
+        input_dir=input_dir,
+        output_dir=output_dir,
+        done_dir=done_dir,
+        failed_dir=failed_dir,
+        settle_s=settle,
+        poll_s=poll,
+        queue_size=queue_size,
+        workers=jobs,
+    )
+
+    def on_result(result: Any) -> None:
+        status = "OK  " if result.success else "ERRO"
+        click.echo(f"  {status} | {result.path.name} | {result.message}", err=True)
+
+    daemon = WatchFolder(spec, config, on_result=on_result)
+    daemon.install_signal_handlers()
+    click.echo(f"Monitorando {input_dir} ({spec.name}); Ctrl+C para encerrar.", err=True)
+    report = daemon.run()
+    emit_report(report, report_format)
+
+
+COMMANDS = (
+    merge,
+    split,
+    compress,
+    ocr,
+    rotate,
+    watermark,
+    encrypt,
+    classify,
+    images,
+    organize,
+    replace,
+    watch,
+)
+
+
+def register_commands(group: click.Group) -> None:
+    for command in COMMANDS:
+        group.add_command(command)
+
+
+# "Na dúvida, use a força bruta." — Ken Thompson
@@ -0,0 +1,223 @@
+import os
+import sys
+from collections.abc import Callable, Iterable
+from pathlib import Path
+from typing import Any
+
+import click
+
+from config.settings import BATCH_DEDUP_MODE
+from utils.file_utils import iter_pdfs
+
+REPORT_FORMATS = ("text", "json")
+DEDUP_MODES = ("off", "symlink", "copy")  # espelha core.dedup sem importar o núcleo
+DEFAULT_OUTPUT_DIR = Path("data_output")
+
+
+def _store_meta(ctx: click.Context, param: click.Parameter, value: Any) -> Any:
+    ctx.meta[f"pdfforge.{param.name}"] = value
+    return value
+
+
+def input_options(fn: Callable[..., Any]) -> Callable[..., Any]:
+    """--recursive e --report: comuns a todos os subcomandos, inclusive o merge."""
+    fn = click.option(
+        "--report",
+        "report_format",
+        type=click.Choice(REPORT_FORMATS),
+        default="text",
+        show_default=True,
+        help="Formato do relatório final (json vai para stdout, progresso para stderr).",
+    )(fn)
+    return click.option(
+        "-r", "--recursive", is_flag=True, default=False, help="Inclui PDFs de subpastas."
+    )(fn)
+
+
+def batch_options(fn: Callable[..., Any]) -> Callable[..., Any]:
+    """
+    Opções dos subcomandos que processam arquivo a arquivo por run_operation:
+    --jobs, --dedupe e --estimate (as duas últimas guardadas em ctx.meta e lidas
+    por run_operation), além das de input_options.
+    """
+    fn = click.option(
+        "--estimate",
+        is_flag=True,
+        default=False,
+        expose_value=False,
+        callback=_store_meta,
+        help="Prevê a duração pelo histórico do diário e mostra o tempo restante.",
+    )(fn)
+    fn = click.option(
+        "--dedupe",
+        type=click.Choice(DEDUP_MODES),
+        default=BATCH_DEDUP_MODE,
+        show_default=True,
+        expose_value=False,
+        callback=_store_meta,
+        help="Processa entradas de conteúdo repetido uma vez e replica a saída.",
+    )(fn)
+    fn = input_options(fn)
+    fn = click.option(
+        "-j",
+        "--jobs",
+        type=click.IntRange(min=1),
+        default=1,
+        show_default=True,
+        help="Processos paralelos.",
+    )(fn)
+    return fn
+
+
+def output_dir_option(fn: Callable[..., Any]) -> Callable[..., Any]:
+    return click.option(
+        "-o",
+        "--output-dir",
+        type=click.Path(file_okay=False, path_type=Path),
+        default=DEFAULT_OUTPUT_DIR,
+        show_default=True,
+        help="Pasta de saída.",
+    )(fn)
+
+
+def collect_pdfs(paths: Iterable[str], recursive: bool) -> list[Path]:
+    """
+    Expande arquivos e pastas em uma lista de PDFs sem repetição. Arquivos
+    informados explicitamente entram mesmo sem extensão .pdf.
+    """
+    seen: set[Path] = set()
+    found: list[Path] = []
+
+    def _add(pdf: Path) -> None:
+        key = pdf.resolve()
+        if key not in seen:
+            seen.add(key)
+            found.append(pdf)
+
+    for raw in paths:
+        path = Path(raw)
+        if path.is_file():
+            _add(path)
+        elif path.is_dir():
+            if recursive:
+                for root, dirs, _files in os.walk(path):
+                    dirs.sort()
+                    for pdf in sorted(iter_pdfs(Path(root))):
+                        _add(pdf)
+            else:
+                for pdf in sorted(iter_pdfs(path)):
+                    _add(pdf)
+        else:
+            raise click.BadParameter(f"'{raw}' não existe", param_hint="PATHS")
+    return found
+
+
+def parse_pages(spec: str) -> list[int]:
+    """Converte "1-3,5" (base 1, inclusivo) em índices base 0: [0, 1, 2, 4]."""
+    pages: list[int] = []
+    for part in spec.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        try:
+            if "-" in part:
+                start, end = (int(v) for v in part.split("-", 1))
+                if start < 1 or end < start:
+                    raise ValueError
+                pages.extend(range(start - 1, end))
+            else:
+                number = int(part)
+                if number < 1:
+                    raise ValueError
+                pages.append(number - 1)
+        except ValueError:
+            raise click.BadParameter(f"faixa de páginas inválida: '{part}'") from None
+    return pages
+
+
+def parse_ranges(spec: str) -> list[tuple[int, int]]:
+    """Converte "1-3,4-9" (base 1, inclusivo) em faixas base 0: [(0, 2), (3, 8)]."""
+    ranges: list[tuple[int, int]] = []
+    for part in spec.split(","):
+        pages = parse_pages(part)
+        if pages:
+            ranges.append((pages[0], pages[-1]))
+    return ranges
+
+
+def emit_report(report: Any, report_format: str) -> None:
+    if report_format == "json":
+        click.echo(report.to_json())
+        return
+    click.echo(report.summary())
+    for result in report.results:
+        status = "OK  " if result.success else "ERRO"
+        click.echo(
+            f"  {status} | {result.path.name:<40} | {result.duration_s:.2f}s | {result.message}"
+        )
+
+
+def run_operation(
+    paths: Iterable[str],
+    operation: Any,
+    output_dir: Path,
+    jobs: int,
+    recursive: bool,
+    report_format: str,
+) -> None:
+    """Aplica uma operação registrada a cada PDF e imprime o relatório."""
+    from core.batch_processor import BatchProcessor
+
+    files = collect_pdfs(paths, recursive)
+    if not files:
+        click.echo("Erro: nenhum PDF encontrado.", err=True)
+        sys.exit(1)
+
+    # entradas recursivas preservam a estrutura de pastas na saída
+    mirror_root = None
+    if recursive:
+        mirror_root = Path(os.path.commonpath([p.resolve().parent for p in files]))
+        files = [p.resolve() for p in files]
+
+    meta = click.get_current_context().meta
+    journal = eta = None
+    if meta.get("pdfforge.estimate"):
+        from core.batch_estimator import BatchEstimator, LiveETA
+        from core.batch_journal import BatchJournal
+
+        # o diário guarda o histórico de vazão que alimenta as próximas estimativas
+        journal = BatchJournal()
+        estimator = BatchEstimator(journal)
+        probes = [estimator.probe(p) for p in files]
+        estimate = estimator.estimate(files, operation.name, workers=jobs, probes=probes)
+        click.echo(estimate.summary(), err=True)
+        eta = LiveETA(estimate, probes)
+
+    def on_progress(current: int, total: int, filename: str) -> None:
+        suffix = f" — {eta.summary()}" if eta is not None else ""
+        click.echo(f"  [{current}/{total}] {filename}{suffix}", err=True)
+
+    processor = BatchProcessor(
+        output_dir,
+        journal=journal,
+        mirror_root=mirror_root,
+        dedupe=meta.get("pdfforge.dedupe", BATCH_DEDUP_MODE),
+    )
+    try:
+        report = processor.run(
+            Path.cwd(),
+            operation,
+            on_progress,
+            file_list=files,
+            workers=jobs,
+            on_result=eta.observe if eta is not None else None,
+        )
+    finally:
+        if journal is not None:
+            journal.close()
+    emit_report(report, report_format)
+    if report.failed:
+        sys.exit(1)
+
+
+# "Faça uma coisa e faça-a bem." — Doug McIlroy
@@ -28,11 +28,68 @@ CACHE_DIR = APP_DIR / "cache"
 
 # Limites de hardware (RTX 3050 4GB VRAM)
 GPU_VRAM_LIMIT_GB = 3.5  # Margem de segurança de 0.5GB
+OCR_BACKEND = "easyocr"  # Motor de reconhecimento: "easyocr" (GPU) ou "tesseract" (CPU, leve)
 OCR_BATCH_MAX_PAGES = 2  # Máximo de páginas OCR simultâneas
 OCR_IMAGE_SCALE = 2.0  # Fator de escala para rasterização de páginas
+OCR_RENDER_GRAY = True  # Rasteriza em cinza: 1/3 dos bytes, e o reconhecedor já usa cinza
+OCR_RENDER_AHEAD_PAGES = 4  # Páginas rasterizadas em paralelo à frente do OCR (0 desativa)
+OCR_RECOGNIZER_BATCH = 16  # Recortes de texto por passada do reconhecedor no lote
+OCR_PAD_MAX_WASTE = 0.5  # Fração máxima de branco por imagem completada num lote do detector
+OCR_CPU_WORKERS = 1  # Processos de OCR sem CUDA (1 = no próprio processo, 0 = automático)
+OCR_CPU_THREADS_PER_WORKER = 4  # torch.set_num_threads de cada processo de OCR em CPU
+OCR_ADAPTIVE_SCALE = True  # Escala por página pela altura do texto (OCR_IMAGE_SCALE sem medida)
+OCR_SCALE_PROBE = 1.0  # Escala da pré-passada que mede o texto (72 dpi)
+OCR_SCALE_PROBE_MAX_MEGAPIXELS = 1.0  # Páginas grandes medem em escala menor
+OCR_TARGET_XHEIGHT_PX = 12  # Altura-x desejada na imagem do OCR (corpo 11 pt → escala 2.0)
+OCR_SCALE_MIN = 0.5
+OCR_SCALE_MAX = 4.0
+OCR_SCALE_MIN_COMPONENTS = 20  # Componentes com cara de caractere para confiar na medida
+OCR_PAGE_MAX_MEGAPIXELS = 12.0  # Teto de pixels por página rasterizada, limita a escala
+OCR_REGION_MIN_SIDE_PT = 24.0  # Modo "regions": imagens menores (ícones, fios) ficam sem OCR
+OCR_REGION_PADDING_PT = 2.0  # Folga em volta de cada imagem recortada para o OCR
+
+# Processamento em lote
+BATCH_MP_START_METHOD = "spawn"  # fork é inseguro com MuPDF e threads Qt ativas
+BATCH_PENDING_PER_WORKER = 2  # Janela de backpressure: arquivos em voo por processo
+BATCH_FILE_TIMEOUT_S = 600.0  # Tempo máximo por arquivo antes de encerrar o worker
+BATCH_MAX_RSS_MB = 4096.0  # Teto de memória por worker durante uma tarefa
+BATCH_MAX_TASKS_PER_WORKER = 200  # Reciclagem do worker após N arquivos
+BATCH_RECYCLE_RSS_MB = 1536.0  # Reciclagem do worker se o RSS passar disso entre tarefas
+BATCH_POOL_POLL_S = 0.2  # Intervalo de verificação de limites pelo supervisor
+BATCH_SCHEDULE_POLICY = "largest_first"  # Ordem de submissão no modo paralelo (ou "fifo")
+BATCH_COST_BYTES_PER_PAGE = 256 * 1024  # Peso do tamanho no custo estimado (bytes ≈ 1 página)
+BATCH_SPLIT_MIN_PAGES = 400  # Documentos a partir daqui viram sub-tarefas por faixa de páginas
+BATCH_SPLIT_MIN_CHUNK_PAGES = 100  # Menor faixa de páginas de uma sub-tarefa
+BATCH_PREFETCH_FILES = 4  # Arquivos lidos antecipadamente para a memória (0 desativa)
+BATCH_PREFETCH_MAX_MB = 256  # Teto de bytes em leitura antecipada; acima, abre pelo caminho
+BATCH_DEDUP_MODE = "off"  # Entradas repetidas: "off", "symlink" ou "copy" da saída do original
+BATCH_DEDUP_PARTIAL_KB = 64  # Bytes do início e do fim usados no hash parcial
+BATCH_DEDUP_WORKERS = 4  # Threads de leitura e hash na deduplicação
+ESTIMATE_SAMPLE_PAGES = 3  # Páginas amostradas por arquivo para o tipo de conteúdo
+ESTIMATE_MIN_SAMPLES = 5  # Arquivos no histórico para confiar na vazão de um grupo
+ESTIMATE_HISTORY_LIMIT = 500  # Arquivos mais recentes consultados no diário
+ESTIMATE_PRIOR_PAGES = 50  # Peso (em páginas) do histórico frente à vazão ao vivo
+RESULT_CACHE_DIR = CACHE_DIR / "results"
+RESULT_CACHE_MAX_MB = 2048  # Orçamento do cache de resultados (despejo LRU)
+OCR_CACHE_ENABLED = True  # Reaproveita o OCR de páginas já reconhecidas (mesmos pixels)
+OCR_CACHE_DIR = CACHE_DIR / "ocr"
+OCR_CACHE_MAX_MB = 256  # Orçamento do cache de OCR por página (despejo LRU)
+WATCH_SETTLE_S = 5.0  # Tamanho estável por esse tempo antes de processar (cópia concluída)
+WATCH_POLL_S = 2.0  # Intervalo de varredura sem inotify (e teto de espera com inotify)
+WATCH_QUEUE_SIZE = 64  # Fila de arquivos prontos; cheia, a pasta aguarda o lote
+WATCH_DONE_DIRNAME = "done"
+WATCH_FAILED_DIRNAME = "failed"
+
+# Perfis de compressão (qualidade JPEG na recompressão de imagens)
+COMPRESS_PROFILES: dict[str, dict] = {
+    "leve": {"dpi": 150, "jpeg_quality": 85, "deflate_images": False},
+    "medio": {"dpi": 120, "jpeg_quality": 72, "deflate_images": True},
+    "agressivo": {"dpi": 96, "jpeg_quality": 55, "deflate_images": True},
+}
 
 # Limiares de detecção
 OCR_TEXT_MIN_CHARS = 10  # Abaixo disso, página é tratada como imagem
+OCR_AUTO_MIN_QUALITY = 0.85  # OCR automático mantém camadas com ao menos essa fração legível
 PDF_MAX_PREVIEW_SIZE_MB = 50  # PDFs maiores que isso: preview desabilitado
 
 # Logging
@@ -1,38 +1,42 @@
-from .batch_processor import BatchProcessor
-from .document_classifier import DocumentClassifier
-from .font_detector import FontDetector
-from .metadata import PDFMetadata
-from .ocr_engine import OCREngine
-from .pdf_compressor import PDFCompressor
-from .pdf_editor import PDFEditor
-from .pdf_image_converter import PDFImageConverter
-from .pdf_merger import PDFMerger
-from .pdf_page_organizer import PDFPageOrganizer
-from .pdf_reader import PDFReader
-from .pdf_rotator import PDFRotator
-from .pdf_security import PDFSecurity
-from .pdf_splitter import PDFSplitter
-from .pdf_watermark import PDFWatermark
-from .signature_handler import SignatureHandler
-
-__all__ = [
-    "BatchProcessor",
-    "DocumentClassifier",
-    "FontDetector",
-    "OCREngine",
-    "PDFCompressor",
-    "PDFEditor",
-    "PDFImageConverter",
-    "PDFMetadata",
-    "PDFMerger",
-    "PDFPageOrganizer",
-    "PDFReader",
-    "PDFRotator",
-    "PDFSecurity",
-    "PDFSplitter",
-    "PDFWatermark",
-    "SignatureHandler",
-]
+import importlib
+from typing import Any
+
+# Importação preguiçosa (PEP 562): "import core.pdf_rotator" não arrasta OCR (torch),
+# compressão (cv2) nem os demais módulos. A CLI e os workers do lote dependem disso
+# para iniciar rápido.
+_EXPORTS = {
+    "BatchProcessor": ".batch_processor",
+    "DocumentClassifier": ".document_classifier",
+    "FontDetector": ".font_detector",
+    "OCREngine": ".ocr_engine",
+    "PDFCompressor": ".pdf_compressor",
+    "PDFEditor": ".pdf_editor",
+    "PDFImageConverter": ".pdf_image_converter",
+    "PDFMetadata": ".metadata",
+    "PDFMerger": ".pdf_merger",
+    "PDFPageOrganizer": ".pdf_page_organizer",
+    "PDFPipeline": ".pdf_pipeline",
+    "PDFReader": ".pdf_reader",
+    "PDFRotator": ".pdf_rotator",
+    "PDFSecurity": ".pdf_security",
+    "PDFSplitter": ".pdf_splitter",
+    "PDFWatermark": ".pdf_watermark",
+    "SignatureHandler": ".signature_handler",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str) -> Any:
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(__all__)
 
 
 # "O todo é maior que a soma das partes." — Aristóteles
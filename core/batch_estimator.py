@@ -0,0 +1,281 @@
+import logging
+import socket
+import statistics
+import time
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import fitz
+
+from config.settings import (
+    ESTIMATE_HISTORY_LIMIT,
+    ESTIMATE_MIN_SAMPLES,
+    ESTIMATE_PRIOR_PAGES,
+    ESTIMATE_SAMPLE_PAGES,
+    OCR_TEXT_MIN_CHARS,
+)
+from core.batch_journal import BatchJournal, PageRate
+from core.batch_metrics import percentile
+from core.batch_report import FileResult
+
+logger = logging.getLogger("pdfforge.batch.estimator")
+
+# Faixa relativa da previsão ao vivo quando não há histórico
+_LIVE_SPREAD = 0.25
+
+
+def format_duration(seconds: float) -> str:
+    """Duração curta e legível: 45s, 12min, 1h05."""
+    seconds = max(0.0, seconds)
+    if seconds < 60:
+        return f"{seconds:.0f}s"
+    minutes = round(seconds / 60)
+    if minutes < 60:
+        return f"{minutes}min"
+    return f"{minutes // 60}h{minutes % 60:02d}"
+
+
+def quick_content_type(doc: fitz.Document, sample_pages: int = ESTIMATE_SAMPLE_PAGES) -> str:
+    """
+    Versão barata de PDFCompressor.analyze_content_type: olha só texto e imagens
+    das páginas amostradas, sem rasterizar. Páginas com imagem e quase sem texto
+    contam como digitalizadas. Devolve o valor de PageContentType correspondente.
+    """
+    total = doc.page_count
+    if total == 0:
+        return "TEXT_ONLY"
+    step = max(1, total // max(1, sample_pages))
+    indices = list(range(0, total, step))[:sample_pages]
+    text_chars = images = scanned = 0
+    for idx in indices:
+        page = doc[idx]
+        chars = len(page.get_text().strip())
+        count = len(page.get_images())
+        text_chars += chars
+        images += count
+        if count and chars < OCR_TEXT_MIN_CHARS:
+            scanned += 1
+    if scanned == len(indices):
+        return "SCANNED"
+    if images == 0:
+        return "TEXT_ONLY"
+    if images > text_chars / 100:
+        return "IMAGE_HEAVY"
+    return "MIXED"
+
+
+@dataclass
+class FileProbe:
+    path: Path
+    pages: int
+    size_bytes: int
+    content_type: str
+
+
+@dataclass
+class BatchEstimate:
+    operation: str
+    files: int
+    pages: int
+    workers: int = 1
+    pages_by_type: dict[str, int] = field(default_factory=dict)
+    pages_per_s: float | None = None  # vazão mediana por worker no histórico
+    eta_s: float | None = None
+    low_s: float | None = None
+    high_s: float | None = None
+    samples: int = 0
+    basis: str = "sem histórico"
+    probe_s: float = 0.0
+
+    @property
+    def confidence(self) -> str:
+        if self.eta_s is None:
+            return "nenhuma"
+        if self.basis == "esta máquina" and self.samples >= 4 * ESTIMATE_MIN_SAMPLES:
+            return "alta"
+        return "média" if self.samples >= ESTIMATE_MIN_SAMPLES else "baixa"
+
+    def summary(self) -> str:
+        mix = ", ".join(
+            f"{name} {count * 100 // max(1, self.pages)}%"
+            for name, count in sorted(self.pages_by_type.items(), key=lambda kv: -kv[1])
+        )
+        head = f"{self.files} arquivos, {self.pages} páginas" + (f" ({mix})" if mix else "")
+        if self.eta_s is None or self.low_s is None or self.high_s is None:
+            return f"{head} — sem histórico de {self.operation} para estimar o tempo"
+        return (
+            f"{head} — estimativa {format_duration(self.eta_s)}"
+            f" ({format_duration(self.low_s)}–{format_duration(self.high_s)},"
+            f" confiança {self.confidence}, {self.samples} arquivos de {self.basis})"
+        )
+
+
+class BatchEstimator:
+    """
+    Prevê a duração de um lote antes de executá-lo.
+
+    Sonda cada entrada (páginas e tipo de conteúdo; o resultado fica no diário e
+    é reaproveitado enquanto o arquivo não mudar) e combina com o histórico de
+    páginas por segundo da operação no diário: primeiro desta máquina, senão de
+    qualquer máquina. Cada tipo de conteúdo usa a própria vazão quando há amostras
+    suficientes dele. A faixa de confiança vem dos quartis da vazão histórica.
+
+    Uso típico:
+        with BatchJournal() as journal:
+            estimate = BatchEstimator(journal).estimate(paths, "ocr", workers=2)
+            print(estimate.summary())
+    """
+
+    def __init__(self, journal: BatchJournal | None = None, host: str | None = None) -> None:
+        self._journal = journal
+        self._host = host or socket.gethostname()
+
+    def probe(self, path: Path) -> FileProbe:
+        try:
+            size = path.stat().st_size
+        except OSError:
+            return FileProbe(path, 0, 0, "MIXED")
+        cached = self._journal.find_probe(path) if self._journal else None
+        if cached is not None:
+            return FileProbe(path, cached[0], size, cached[1])
+        try:
+            with fitz.open(str(path)) as doc:
+                pages = doc.page_count
+                content_type = quick_content_type(doc)
+        except Exception as exc:
+            logger.debug("Sonda falhou em %s: %s", path.name, exc)
+            return FileProbe(path, 0, size, "MIXED")
+        if self._journal is not None:
+            self._journal.store_probe(path, pages, content_type)
+        return FileProbe(path, pages, size, content_type)
+
+    def _history(self, operation: str) -> tuple[list[PageRate], str]:
+        if self._journal is None:
+            return [], "sem histórico"
+        local = self._journal.page_rates(operation, self._host, ESTIMATE_HISTORY_LIMIT)
+        if len(local) >= ESTIMATE_MIN_SAMPLES:
+            return local, "esta máquina"
+        anywhere = self._journal.page_rates(operation, None, ESTIMATE_HISTORY_LIMIT)
+        if anywhere:
+            return anywhere, "outras máquinas" if len(anywhere) > len(local) else "esta máquina"
+        return [], "sem histórico"
+
+    def estimate(
+        self,
+        paths: Sequence[Path],
+        operation: str,
+        workers: int = 1,
+        probes: Sequence[FileProbe] | None = None,
+    ) -> BatchEstimate:
+        start = time.monotonic()
+        probes = list(probes) if probes is not None else [self.probe(p) for p in paths]
+        pages_by_type: dict[str, int] = {}
+        for probe in probes:
+            if probe.pages:
+                pages_by_type[probe.content_type] = (
+                    pages_by_type.get(probe.content_type, 0) + probe.pages
+                )
+        total_pages = sum(pages_by_type.values())
+        parallel = max(1, min(workers, len(probes)))
+        estimate = BatchEstimate(
+            operation=operation,
+            files=len(probes),
+            pages=total_pages,
+            workers=parallel,
+            pages_by_type=pages_by_type,
+            probe_s=time.monotonic() - start,
+        )
+
+        history, basis = self._history(operation)
+        if not history:
+            return estimate
+        estimate.samples = len(history)
+        estimate.basis = basis
+        estimate.pages_per_s = statistics.median(r.pages_per_s for r in history)
+
+        eta = low = high = 0.0
+        for content_type, pages in pages_by_type.items():
+            same_type = [r for r in history if r.content_type == content_type]
+            group = same_type if len(same_type) >= ESTIMATE_MIN_SAMPLES else history
+            rates = [r.pages_per_s for r in group]
+            eta += pages / statistics.median(rates)
+            low += pages / percentile(rates, 75)  # vazão alta → fim mais cedo
+            high += pages / max(percentile(rates, 25), 1e-9)
+        estimate.eta_s = eta / parallel
+        estimate.low_s = low / parallel
+        estimate.high_s = high / parallel
+        return estimate
+
+
+class LiveETA:
+    """
+    Atualiza a previsão durante o lote a partir da vazão observada.
+
+    A vazão do histórico entra como ESTIMATE_PRIOR_PAGES páginas "já vistas":
+    no começo ela domina, e conforme páginas reais são processadas a vazão ao
+    vivo (páginas por segundo de relógio, já incluindo o paralelismo) assume.
+    Arquivos pulados, vindos do cache ou duplicados abatem as páginas restantes
+    sem contar como vazão. A faixa de confiança estreita com o progresso.
+    """
+
+    def __init__(
+        self,
+        estimate: BatchEstimate,
+        probes: Sequence[FileProbe] = (),
+        prior_pages: int = ESTIMATE_PRIOR_PAGES,
+    ) -> None:
+        self._estimate = estimate
+        self._pages_of = {probe.path: probe.pages for probe in probes}
+        self._prior_pages = prior_pages
+        self._start = time.monotonic()
+        self._done_pages = 0  # todas as páginas concluídas, processadas ou não
+        self._processed_pages = 0  # só as processadas de fato (base da vazão ao vivo)
+
+    def observe(self, result: FileResult) -> None:
+        """Contabiliza um arquivo concluído."""
+        self._done_pages += max(self._pages_of.get(result.path, 0), result.pages)
+        if not (result.skipped or result.cached or result.duplicate_of is not None):
+            self._processed_pages += result.pages
+
+    def remaining(self, now: float | None = None) -> tuple[float, float, float] | None:
+        """(previsão, mínimo, máximo) em segundos para terminar, ou None sem base."""
+        total = self._estimate.pages
+        left = max(0, total - self._done_pages)
+        if left == 0:
+            return (0.0, 0.0, 0.0)
+        elapsed = (now if now is not None else time.monotonic()) - self._start
+        prior = self._estimate.pages_per_s
+        if prior:
+            prior_wall = prior * self._estimate.workers
+            rate = (self._prior_pages + self._processed_pages) / (
+                self._prior_pages / prior_wall + elapsed
+            )
+        elif self._processed_pages and elapsed > 0:
+            rate = self._processed_pages / elapsed
+        else:
+            return None
+
+        eta = left / rate
+        progress = self._done_pages / total if total else 0.0
+        est = self._estimate
+        if est.eta_s and est.low_s is not None and est.high_s is not None:
+            low_ratio, high_ratio = est.low_s / est.eta_s, est.high_s / est.eta_s
+        else:
+            low_ratio, high_ratio = 1 - _LIVE_SPREAD, 1 + _LIVE_SPREAD
+        shrink = 1.0 - progress
+        return (
+            eta,
+            eta * (1 - (1 - low_ratio) * shrink),
+            eta * (1 + (high_ratio - 1) * shrink),
+        )
+
+    def summary(self) -> str:
+        remaining = self.remaining()
+        if remaining is None:
+            return "calculando tempo restante..."
+        eta, low, high = remaining
+        return f"restam ~{format_duration(eta)} ({format_duration(low)}–{format_duration(high)})"
+
+
+# "Governar é prever." — Émile de Girardin
@@ -0,0 +1,328 @@
+import json
+import logging
+import os
+import socket
+import sqlite3
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from config.settings import CACHE_DIR
+from core.batch_operations import redact_secrets
+
+logger = logging.getLogger("pdfforge.batch.journal")
+
+DEFAULT_JOURNAL_PATH = CACHE_DIR / "batch_journal.sqlite3"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    operation TEXT NOT NULL,
+    params TEXT NOT NULL,
+    host TEXT NOT NULL,
+    started_at REAL NOT NULL,
+    finished_at REAL
+);
+CREATE TABLE IF NOT EXISTS files (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    path TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime REAL NOT NULL,
+    operation TEXT NOT NULL,
+    params TEXT NOT NULL,
+    success INTEGER NOT NULL,
+    message TEXT NOT NULL,
+    output_path TEXT,
+    duration_s REAL NOT NULL,
+    finished_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_files_lookup ON files(path, operation, params, success);
+CREATE INDEX IF NOT EXISTS idx_files_run ON files(run_id);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS probes (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime REAL NOT NULL,
+    pages INTEGER NOT NULL,
+    content_type TEXT NOT NULL
+);
+"""
+
+# Colunas acrescentadas depois da primeira versão do esquema: (tabela, coluna, definição)
+_MIGRATIONS = (("files", "pages", "INTEGER NOT NULL DEFAULT 0"),)
+
+
+@dataclass
+class JournalEntry:
+    path: Path
+    success: bool
+    message: str
+    duration_s: float
+    output_path: Path | None = None
+
+
+@dataclass
+class RunStats:
+    run_id: int
+    operation: str
+    started_at: float
+    files: int
+    succeeded: int
+    wall_s: float
+    busy_s: float
+
+    @property
+    def files_per_s(self) -> float:
+        return self.files / self.wall_s if self.wall_s > 0 else 0.0
+
+    @property
+    def mean_file_s(self) -> float:
+        return self.busy_s / self.files if self.files > 0 else 0.0
+
+
+@dataclass
+class PageRate:
+    """Vazão de um arquivo concluído: páginas e tempo de processamento."""
+
+    pages: int
+    duration_s: float
+    content_type: str | None = None  # do perfil gravado em probes, se houver
+
+    @property
+    def pages_per_s(self) -> float:
+        return self.pages / self.duration_s if self.duration_s > 0 else 0.0
+
+
+def _params_key(params: dict[str, Any]) -> str:
+    return json.dumps(params, sort_keys=True, ensure_ascii=False, default=str)
+
+
+_SALT_BYTES = 16
+
+
+class BatchJournal:
+    """
+    Diário persistente (SQLite) de execuções em lote.
+
+    Cada arquivo processado é gravado com caminho, tamanho, mtime, operação,
+    parâmetros, resultado, duração e páginas. Uma nova execução com resume=True
+    consulta o diário e pula arquivos já concluídos com sucesso e não modificados
+    desde então. O histórico de páginas por segundo (por operação e máquina) e os
+    perfis de conteúdo em probes alimentam o estimador de tempo do lote.
+    Parâmetros secretos (senhas) são gravados só como resumo com o salt do diário.
+    """
+
+    def __init__(self, path: Path | None = None) -> None:
+        self._path = path if path is not None else DEFAULT_JOURNAL_PATH
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self._path))
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._migrate()
+        self._salt = self._load_salt()
+        logger.debug("Diário de lote aberto: %s", path)
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def __enter__(self) -> "BatchJournal":
+        return self
+
+    def __exit__(self, *_: object) -> None:
+        self.close()
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    def _migrate(self) -> None:
+        for table, column, definition in _MIGRATIONS:
+            existing = {row[1] for row in self._conn.execute(f"PRAGMA table_info({table})")}
+            if column not in existing:
+                with self._conn:
+                    self._conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+
+    def _load_salt(self) -> bytes:
+        """Salt aleatório do diário, criado na primeira abertura e fixo depois."""
+        with self._conn:
+            self._conn.execute(
+                "INSERT OR IGNORE INTO meta (key, value) VALUES ('salt', ?)",
+                (os.urandom(_SALT_BYTES),),
+            )
+        (salt,) = self._conn.execute("SELECT value FROM meta WHERE key = 'salt'").fetchone()
+        return bytes(salt)
+
+    def _params_key(self, operation: str, params: dict[str, Any]) -> str:
+        """Parâmetros como gravados no diário: senhas (secret=True) só como resumo."""
+        return _params_key(redact_secrets(operation, params, self._salt))
+
+    def start_run(self, operation: str, params: dict[str, Any]) -> int:
+        with self._conn:
+            cursor = self._conn.execute(
+                "INSERT INTO runs (operation, params, host, started_at) VALUES (?, ?, ?, ?)",
+                (operation, self._params_key(operation, params), socket.gethostname(), time.time()),
+            )
+        run_id = int(cursor.lastrowid or 0)
+        logger.info("Execução %d registrada no diário (%s)", run_id, operation)
+        return run_id
+
+    def finish_run(self, run_id: int) -> None:
+        with self._conn:
+            self._conn.execute(
+                "UPDATE runs SET finished_at = ? WHERE id = ?", (time.time(), run_id)
+            )
+
+    def record(
+        self,
+        run_id: int,
+        path: Path,
+        operation: str,
+        params: dict[str, Any],
+        success: bool,
+        message: str,
+        duration_s: float,
+        output_path: Path | None = None,
+        pages: int = 0,
+    ) -> None:
+        try:
+            stat = path.stat()
+            size, mtime = stat.st_size, stat.st_mtime
+        except OSError:
+            size, mtime = -1, 0.0
+        with self._conn:
+            self._conn.execute(
+                "INSERT INTO files (run_id, path, size, mtime, operation, params, success,"
+                " message, output_path, duration_s, finished_at, pages)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    run_id,
+                    str(path.resolve()),
+                    size,
+                    mtime,
+                    operation,
+                    self._params_key(operation, params),
+                    int(success),
+                    message,
+                    str(output_path) if output_path else None,
+                    duration_s,
+                    time.time(),
+                    pages,
+                ),
+            )
+
+    def find_completed(
+        self,
+        path: Path,
+        operation: str,
+        params: dict[str, Any],
+    ) -> JournalEntry | None:
+        """Retorna a última conclusão bem-sucedida do arquivo, se ele não mudou desde então."""
+        try:
+            stat = path.stat()
+        except OSError:
+            return None
+        row = self._conn.execute(
+            "SELECT message, duration_s, output_path FROM files"
+            " WHERE path = ? AND operation = ? AND params = ? AND success = 1"
+            " AND size = ? AND mtime = ? ORDER BY id DESC LIMIT 1",
+            (
+                str(path.resolve()),
+                operation,
+                self._params_key(operation, params),
+                stat.st_size,
+                stat.st_mtime,
+            ),
+        ).fetchone()
+        if row is None:
+            return None
+        message, duration_s, output_path = row
+        if output_path and not Path(output_path).exists():
+            return None  # saída removida: precisa reprocessar
+        return JournalEntry(
+            path=path,
+            success=True,
+            message=message,
+            duration_s=duration_s,
+            output_path=Path(output_path) if output_path else None,
+        )
+
+    def find_probe(self, path: Path) -> tuple[int, str] | None:
+        """Páginas e tipo de conteúdo já sondados, se o arquivo não mudou desde então."""
+        try:
+            stat = path.stat()
+        except OSError:
+            return None
+        row = self._conn.execute(
+            "SELECT pages, content_type FROM probes WHERE path = ? AND size = ? AND mtime = ?",
+            (str(path.resolve()), stat.st_size, stat.st_mtime),
+        ).fetchone()
+        return (int(row[0]), str(row[1])) if row else None
+
+    def store_probe(self, path: Path, pages: int, content_type: str) -> None:
+        try:
+            stat = path.stat()
+        except OSError:
+            return
+        with self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO probes (path, size, mtime, pages, content_type)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (str(path.resolve()), stat.st_size, stat.st_mtime, pages, content_type),
+            )
+
+    def page_rates(
+        self, operation: str, host: str | None = None, limit: int = 500
+    ) -> list[PageRate]:
+        """
+        Páginas e duração dos últimos arquivos concluídos com sucesso pela operação
+        (na máquina host, se informada), com o tipo de conteúdo quando sondado.
+        """
+        query = (
+            "SELECT f.pages, f.duration_s, p.content_type FROM files f"
+            " JOIN runs r ON r.id = f.run_id"
+            " LEFT JOIN probes p ON p.path = f.path AND p.size = f.size AND p.mtime = f.mtime"
+            " WHERE f.operation = ? AND f.success = 1 AND f.pages > 0 AND f.duration_s > 0"
+        )
+        args: tuple[Any, ...] = (operation,)
+        if host is not None:
+            query += " AND r.host = ?"
+            args = (*args, host)
+        query += " ORDER BY f.id DESC LIMIT ?"
+        rows = self._conn.execute(query, (*args, limit)).fetchall()
+        return [PageRate(int(row[0]), float(row[1]), row[2]) for row in rows]
+
+    def throughput(self, operation: str | None = None, limit: int = 20) -> list[RunStats]:
+        """Histórico de vazão das últimas execuções (mais recentes primeiro)."""
+        query = (
+            "SELECT r.id, r.operation, r.started_at, COUNT(f.id), COALESCE(SUM(f.success), 0),"
+            " COALESCE(MAX(f.finished_at), r.finished_at, r.started_at) - r.started_at,"
+            " COALESCE(SUM(f.duration_s), 0)"
+            " FROM runs r LEFT JOIN files f ON f.run_id = r.id"
+        )
+        args: tuple[Any, ...] = ()
+        if operation is not None:
+            query += " WHERE r.operation = ?"
+            args = (operation,)
+        query += " GROUP BY r.id ORDER BY r.id DESC LIMIT ?"
+        rows = self._conn.execute(query, (*args, limit)).fetchall()
+        return [
+            RunStats(
+                run_id=row[0],
+                operation=row[1],
+                started_at=row[2],
+                files=row[3],
+                succeeded=row[4],
+                wall_s=max(0.0, row[5]),
+                busy_s=row[6],
+            )
+            for row in rows
+        ]
+
+
+# "Quem não conhece a história está condenado a repeti-la." — George Santayana
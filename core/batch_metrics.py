@@ -0,0 +1,177 @@
+import json
+import logging
+import math
+import os
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger("pdfforge.batch.metrics")
+
+_MB = 1024 * 1024
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    """Percentil por posto mais próximo (nearest-rank); 0.0 para lista vazia."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def _distribution(samples: list[float]) -> dict[str, float]:
+    return {
+        "p50": round(percentile(samples, 50), 6),
+        "p95": round(percentile(samples, 95), 6),
+        "max": round(max(samples), 6) if samples else 0.0,
+    }
+
+
+@dataclass
+class BatchMetrics:
+    """
+    Amostras por arquivo para agregação em p50/p95/máximo.
+
+    Guarda apenas números (não os FileResult), então cresce pouco mesmo em lotes
+    de dezenas de milhares de arquivos processados via iter_run().
+    """
+
+    files: int = 0
+    pages: int = 0
+    input_bytes: int = 0
+    output_bytes: int = 0
+    durations: list[float] = field(default_factory=list)
+    stages: dict[str, list[float]] = field(default_factory=dict)
+    pages_per_s: list[float] = field(default_factory=list)
+    mb_per_s: list[float] = field(default_factory=list)
+
+    def add(
+        self,
+        duration_s: float,
+        stages: dict[str, float],
+        pages: int,
+        input_bytes: int,
+        output_bytes: int,
+    ) -> None:
+        self.files += 1
+        self.pages += pages
+        self.input_bytes += input_bytes
+        self.output_bytes += output_bytes
+        self.durations.append(duration_s)
+        for name, seconds in stages.items():
+            self.stages.setdefault(name, []).append(seconds)
+        if duration_s > 0:
+            self.pages_per_s.append(pages / duration_s)
+            self.mb_per_s.append(input_bytes / _MB / duration_s)
+
+    def summary(self) -> dict[str, Any]:
+        return {
+            "files": self.files,
+            "pages": self.pages,
+            "input_bytes": self.input_bytes,
+            "output_bytes": self.output_bytes,
+            "duration_s": _distribution(self.durations),
+            "stages_s": {name: _distribution(v) for name, v in sorted(self.stages.items())},
+            "pages_per_s": _distribution(self.pages_per_s),
+            "mb_per_s": _distribution(self.mb_per_s),
+        }
+
+
+def report_to_dict(report: Any) -> dict[str, Any]:
+    """Serializa um BatchReport (agregados + métricas + resultados retidos)."""
+    return {
+        "total": report.total,
+        "succeeded": report.succeeded,
+        "failed": report.failed,
+        "duplicates": report.duplicates,
+        "duration_s": round(report.duration_s, 6),
+        "metrics": report.metrics.summary(),
+        "results": [
+            {
+                "path": str(r.path),
+                "success": r.success,
+                "message": r.message,
+                "output_path": str(r.output_path) if r.output_path else None,
+                "duration_s": round(r.duration_s, 6),
+                "stages_s": {k: round(v, 6) for k, v in r.stages.items()},
+                "pages": r.pages,
+                "input_bytes": r.input_bytes,
+                "output_bytes": r.output_bytes,
+                "skipped": r.skipped,
+                "cached": r.cached,
+                "duplicate_of": str(r.duplicate_of) if r.duplicate_of else None,
+            }
+            for r in report.results
+        ],
+    }
+
+
+def report_to_json(report: Any, indent: int | None = 2) -> str:
+    return json.dumps(report_to_dict(report), indent=indent, ensure_ascii=False)
+
+
+def _prom_line(name: str, value: float, labels: dict[str, str] | None = None) -> str:
+    if labels:
+        rendered = ",".join(f'{k}="{v}"' for k, v in labels.items())
+        return f"{name}{{{rendered}}} {float(value)!r}"
+    return f"{name} {float(value)!r}"
+
+
+def report_to_prometheus(report: Any, job: str = "pdfforge_batch") -> str:
+    """Snapshot no formato textfile do node exporter (métricas gauge)."""
+    metrics: BatchMetrics = report.metrics
+    base = {"job": job}
+    lines: list[str] = []
+
+    def _gauge(name: str, help_text: str, samples: list[tuple[dict[str, str], float]]) -> None:
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} gauge")
+        for labels, value in samples:
+            lines.append(_prom_line(name, value, {**base, **labels}))
+
+    def _dist(values: list[float], extra: dict[str, str] | None = None) -> list:
+        stats = _distribution(values)
+        return [({**(extra or {}), "stat": key}, value) for key, value in stats.items()]
+
+    _gauge(
+        "pdfforge_batch_files",
+        "Arquivos do último lote por status.",
+        [({"status": "succeeded"}, report.succeeded), ({"status": "failed"}, report.failed)],
+    )
+    _gauge("pdfforge_batch_duration_seconds", "Duração total do lote.", [({}, report.duration_s)])
+    _gauge("pdfforge_batch_pages", "Páginas processadas no lote.", [({}, metrics.pages)])
+    _gauge(
+        "pdfforge_batch_bytes",
+        "Bytes lidos e gravados no lote.",
+        [
+            ({"direction": "input"}, metrics.input_bytes),
+            ({"direction": "output"}, metrics.output_bytes),
+        ],
+    )
+    _gauge("pdfforge_batch_file_seconds", "Duração por arquivo.", _dist(metrics.durations))
+    stage_samples: list[tuple[dict[str, str], float]] = []
+    for name, values in sorted(metrics.stages.items()):
+        stage_samples.extend(_dist(values, {"stage": name}))
+    _gauge("pdfforge_batch_stage_seconds", "Duração por estágio e arquivo.", stage_samples)
+    _gauge("pdfforge_batch_pages_per_second", "Vazão em páginas/s.", _dist(metrics.pages_per_s))
+    _gauge("pdfforge_batch_mb_per_second", "Vazão em MB/s de entrada.", _dist(metrics.mb_per_s))
+    _gauge(
+        "pdfforge_batch_last_run_timestamp_seconds",
+        "Momento em que o snapshot foi gerado.",
+        [({}, time.time())],
+    )
+    return "\n".join(lines) + "\n"
+
+
+def write_prometheus_textfile(report: Any, path: Path, job: str = "pdfforge_batch") -> None:
+    """Grava o snapshot atomicamente (tmp + rename) para o coletor textfile do node exporter."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp.write_text(report_to_prometheus(report, job), encoding="utf-8")
+    os.replace(tmp, path)
+    logger.info("Métricas Prometheus gravadas em %s", path)
+
+
+# "O que não é medido não pode ser gerenciado." — Peter Drucker
@@ -0,0 +1,555 @@
+import hashlib
+import json
+import logging
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+import fitz
+
+from config.settings import COMPRESS_PROFILES, OCR_AUTO_MIN_QUALITY, OCR_BACKEND, OCR_CPU_WORKERS
+from core.ocr_backends import available_backends
+from utils.file_utils import OUTPUT_SUFFIX
+from utils.timing import stage
+
+logger = logging.getLogger("pdfforge.batch.operations")
+
+# Assinatura de uma operação de lote: (doc, output_path, **params) → mensagem opcional
+OperationFn = Callable[..., str | None]
+
+# Tipos de parâmetro aceitos; todos têm representação direta em JSON
+PARAM_TYPES = ("int", "float", "bool", "str", "ints", "strs", "pairs", "ranges", "color", "steps")
+
+
+@dataclass(frozen=True)
+class Param:
+    """Parâmetro tipado de uma operação registrada (também descreve o formulário da GUI)."""
+
+    name: str
+    type: str
+    default: Any = None
+    choices: tuple[Any, ...] = ()
+    label: str = ""
+    minimum: float | None = None
+    maximum: float | None = None
+    secret: bool = False  # senhas: campo mascarado na GUI
+    file: bool = False  # caminho de um arquivo lido pela operação (o conteúdo entra no cache)
+
+    def __post_init__(self) -> None:
+        if self.type not in PARAM_TYPES:
+            raise ValueError(f"Tipo de parâmetro inválido: '{self.type}'")
+
+
+SPLIT_MODES = ("pages", "ranges", "size", "bookmarks")
+
+_REGISTRY: dict[str, OperationFn] = {}
+_PARAMS: dict[str, tuple[Param, ...]] = {}
+_SPLITTABLE: set[str] = set()
+_UNCACHEABLE: set[str] = set()
+
+
+def register_operation(
+    name: str,
+    splittable: bool = False,
+    cacheable: bool = True,
+    params: Sequence[Param] = (),
+) -> Callable[[OperationFn], OperationFn]:
+    """
+    Registra uma função de nível de módulo como operação de lote nomeada.
+    Funções registradas podem ser despachadas para processos filhos por nome.
+
+    params declara os parâmetros aceitos, com tipo e valor padrão; OperationSpec
+    valida e normaliza os valores recebidos (de JSON, da CLI ou da GUI) contra
+    essa lista e recusa nomes desconhecidos.
+
+    splittable=True declara que a operação trata cada página de forma
+    independente e grava um PDF com as mesmas páginas da entrada: o lote pode
+    então processar faixas de páginas em paralelo e concatenar as saídas.
+
+    cacheable=False marca operações cujas saídas não cabem no cache de
+    resultados (que guarda apenas o PDF em output_path), como split e images.
+    """
+
+    def decorator(fn: OperationFn) -> OperationFn:
+        if name in _REGISTRY and _REGISTRY[name] is not fn:
+            raise ValueError(f"Operação já registrada: '{name}'")
+        _REGISTRY[name] = fn
+        _PARAMS[name] = tuple(params)
+        if splittable:
+            _SPLITTABLE.add(name)
+        if not cacheable:
+            _UNCACHEABLE.add(name)
+        return fn
+
+    return decorator
+
+
+def get_operation(name: str) -> OperationFn:
+    try:
+        return _REGISTRY[name]
+    except KeyError:
+        raise ValueError(f"Operação desconhecida: '{name}'. Use: {sorted(_REGISTRY)}") from None
+
+
+def list_operations() -> list[str]:
+    return sorted(_REGISTRY)
+
+
+def operation_params(name: str) -> tuple[Param, ...]:
+    get_operation(name)
+    return _PARAMS[name]
+
+
+def _is_pair(value: Any) -> bool:
+    return isinstance(value, (list, tuple)) and len(value) == 2
+
+
+def _coerce(param: Param, value: Any) -> Any:
+    kind = param.type
+    if kind == "bool":
+        if isinstance(value, bool):
+            return value
+        if isinstance(value, str) and value.lower() in ("true", "false", "1", "0"):
+            return value.lower() in ("true", "1")
+        raise ValueError("esperado verdadeiro ou falso")
+    if kind in ("int", "float"):
+        if isinstance(value, bool):
+            raise ValueError("esperado número")
+        number = int(value) if kind == "int" else float(value)
+        if param.minimum is not None and number < param.minimum:
+            raise ValueError(f"mínimo {param.minimum:g}")
+        if param.maximum is not None and number > param.maximum:
+            raise ValueError(f"máximo {param.maximum:g}")
+        return number
+    if kind == "str":
+        return str(value)
+    if not isinstance(value, (list, tuple)):
+        raise ValueError("esperada uma lista")
+    if kind == "ints":
+        return [int(v) for v in value]
+    if kind == "strs":
+        return [str(v) for v in value]
+    if kind == "pairs":
+        if not all(_is_pair(v) for v in value):
+            raise ValueError("esperados pares [buscar, substituir]")
+        return [[str(a), str(b)] for a, b in value]
+    if kind == "ranges":
+        if not all(_is_pair(v) for v in value):
+            raise ValueError("esperadas faixas [início, fim]")
+        return [[int(a), int(b)] for a, b in value]
+    if kind == "color":
+        if len(value) != 3:
+            raise ValueError("esperada cor [r, g, b]")
+        return [int(v) for v in value]
+    if not all(isinstance(v, dict) and "name" in v for v in value):  # steps
+        raise ValueError('esperadas etapas {"name": ..., "params": {...}}')
+    from core.pdf_pipeline import PDFPipeline
+
+    # as etapas são conferidas já aqui, e não só ao processar o primeiro arquivo
+    return [{"name": s.name, "params": s.params} for s in PDFPipeline.from_dicts(value).steps]
+
+
+def validate_params(
+    name: str, params: dict[str, Any], extra: Sequence[Param] = ()
+) -> dict[str, Any]:
+    """
+    Confere params contra a declaração da operação e devolve uma cópia com os
+    valores convertidos para o tipo declarado (ex.: "90" → 90 vindo da GUI).
+    Parâmetros omitidos ficam de fora, e a função usa o próprio padrão. extra
+    acrescenta parâmetros aceitos só num contexto (as etapas do pipeline).
+    """
+    declared = {param.name: param for param in (*operation_params(name), *extra)}
+    unknown = sorted(set(params) - set(declared))
+    if unknown:
+        raise ValueError(
+            f"Parâmetro desconhecido para '{name}': {unknown[0]}. Use: {sorted(declared)}"
+        )
+    normalized: dict[str, Any] = {}
+    for key, value in params.items():
+        param = declared[key]
+        if value is None:
+            if param.default is not None:
+                raise ValueError(f"Parâmetro '{key}' de '{name}' não aceita nulo")
+            normalized[key] = None
+            continue
+        try:
+            value = _coerce(param, value)
+        except (TypeError, ValueError) as exc:
+            raise ValueError(f"Parâmetro '{key}' de '{name}' inválido: {exc}") from None
+        if param.choices and value not in param.choices:
+            raise ValueError(
+                f"Parâmetro '{key}' de '{name}' inválido: '{value}'. Use: {list(param.choices)}"
+            )
+        normalized[key] = value
+    return normalized
+
+
+def is_splittable(name: str) -> bool:
+    return name in _SPLITTABLE
+
+
+def is_cacheable(name: str) -> bool:
+    return name not in _UNCACHEABLE
+
+
+@dataclass(frozen=True)
+class OperationSpec:
+    """
+    Referência serializável (picklable e JSON) a uma operação registrada.
+    Em vez de carregar uma closure, carrega apenas o nome e os parâmetros, já
+    validados contra a declaração da operação.
+    """
+
+    name: str
+    params: dict[str, Any] = field(default_factory=dict)
+
+    def __post_init__(self) -> None:
+        # falha cedo para nomes e parâmetros inválidos, ainda no processo principal
+        object.__setattr__(self, "params", validate_params(self.name, dict(self.params)))
+
+    def __call__(self, doc: fitz.Document, output_path: Path) -> str | None:
+        return get_operation(self.name)(doc, output_path, **self.params)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {"name": self.name, "params": dict(self.params)}
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "OperationSpec":
+        return cls(data["name"], data.get("params") or {})
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict(), ensure_ascii=False)
+
+    @classmethod
+    def from_json(cls, text: str) -> "OperationSpec":
+        return cls.from_dict(json.loads(text))
+
+
+def ocr_message(recognized: int, total: int) -> str:
+    """Mensagem de resultado do OCR, comum ao caminho por arquivo e ao agrupado."""
+    if recognized == total:
+        return f"{recognized} páginas com OCR"
+    return f"{recognized} páginas com OCR ({total - recognized} já tinham texto)"
+
+
+def redact_secrets(name: str, params: dict[str, Any], salt: bytes) -> dict[str, Any]:
+    """
+    Cópia de params com cada parâmetro secret=True (senhas) trocado por um
+    resumo BLAKE2 com a chave salt, inclusive nas etapas de um "pipeline".
+    O mesmo valor e o mesmo salt dão o mesmo resumo, então chaves de diário
+    (retomada, vazão) continuam estáveis sem guardar a senha.
+    """
+    declared = {param.name: param for param in _PARAMS.get(name, ())}
+    redacted: dict[str, Any] = {}
+    for key, value in params.items():
+        param = declared.get(key)
+        if param is not None and param.secret and value is not None:
+            payload = json.dumps(value, ensure_ascii=False).encode()
+            value = "blake2b:" + hashlib.blake2b(payload, key=salt, digest_size=16).hexdigest()
+        elif param is not None and param.type == "steps" and value:
+            value = [
+                {**step, "params": redact_secrets(step["name"], step.get("params") or {}, salt)}
+                for step in value
+            ]
+        redacted[key] = value
+    return redacted
+
+
+def input_files(name: str, params: dict[str, Any]) -> list[Path]:
+    """
+    Arquivos lidos pela operação além do PDF (parâmetros file=True, como a
+    imagem da marca d'água), inclusive nas etapas de um "pipeline", na ordem
+    dos parâmetros. O cache de resultados inclui o conteúdo deles na chave.
+    """
+    declared = {param.name: param for param in _PARAMS.get(name, ())}
+    files: list[Path] = []
+    for key, value in params.items():
+        param = declared.get(key)
+        if param is not None and param.file and value:
+            files.append(Path(value))
+        elif param is not None and param.type == "steps" and value:
+            for step in value:
+                files.extend(input_files(step["name"], step.get("params") or {}))
+    return files
+
+
+def describe_operation(operation: Callable[..., str | None]) -> tuple[str, dict[str, Any]]:
+    """Nome e parâmetros que identificam uma operação (para diário e cache)."""
+    if isinstance(operation, OperationSpec):
+        return operation.name, dict(operation.params)
+    return getattr(operation, "__qualname__", type(operation).__name__), {}
+
+
+@register_operation("metadata")
+def metadata_operation(doc: fitz.Document, output_path: Path) -> str:
+    from core.metadata import PDFMetadata
+
+    meta = PDFMetadata().read(doc)
+    title = meta.title[:40] if meta.title else "(sem título)"
+    return f"título='{title}'"
+
+
+@register_operation(
+    "rotate",
+    splittable=True,
+    params=[Param("angle", "int", 90, choices=(90, 180, 270), label="Ângulo")],
+)
+def rotate_operation(doc: fitz.Document, output_path: Path, angle: int = 90) -> str:
+    from core.pdf_rotator import PDFRotator
+
+    result = PDFRotator().rotate_all(doc, angle, output_path)
+    if not result.success:
+        raise RuntimeError(result.error)
+    return f"{result.pages_rotated} páginas rotacionadas {angle}°"
+
+
+@register_operation(
+    "ocr",
+    splittable=True,
+    params=[
+        Param("use_gpu", "bool", True, label="Usar GPU"),
+        Param("languages", "strs", None, label="Idiomas"),
+        Param("mode", "str", "all", choices=("all", "auto", "regions"), label="Páginas"),
+        Param("min_quality", "float", OCR_AUTO_MIN_QUALITY, label="Qualidade mínima", maximum=1),
+        Param("cpu_workers", "int", OCR_CPU_WORKERS, label="Processos de OCR sem GPU", minimum=0),
+        Param("backend", "str", OCR_BACKEND, choices=tuple(available_backends()), label="Motor"),
+    ],
+)
+def ocr_operation(
+    doc: fitz.Document,
+    output_path: Path,
+    use_gpu: bool = True,
+    languages: list[str] | None = None,
+    mode: str = "all",
+    min_quality: float = OCR_AUTO_MIN_QUALITY,
+    cpu_workers: int = OCR_CPU_WORKERS,
+    backend: str = OCR_BACKEND,
+) -> str:
+    """
+    mode="auto" reconhece só páginas sem camada de texto ou com camada ilegível.
+    mode="regions" reconhece essas páginas inteiras e, nas demais, só as imagens.
+    cpu_workers > 1 reparte o OCR sem CUDA entre processos (0 = automático).
+    backend escolhe o motor de reconhecimento ("easyocr" ou "tesseract").
+    """
+    from core.ocr_engine import get_shared_engine
+
+    engine = get_shared_engine(languages, use_gpu, cpu_workers, backend)
+    results = engine.recognize_document(doc, mode=mode, min_quality=min_quality)
+    engine.save_ocr_layer(doc, results, output_path)
+    return ocr_message(len(results), doc.page_count)
+
+
+@register_operation("pipeline", params=[Param("steps", "steps", None, label="Etapas")])
+def pipeline_operation(
+    doc: fitz.Document, output_path: Path, steps: list[dict[str, Any]] | None = None
+) -> str:
+    from core.pdf_pipeline import PDFPipeline
+
+    result = PDFPipeline.from_dicts(steps or []).run(doc, output_path)
+    if not result.success:
+        raise RuntimeError(result.error)
+    return result.summary()
+
+
+def _source_stem(doc: fitz.Document, output_path: Path) -> str:
+    """Nome base do PDF de entrada, mesmo para documentos abertos da memória."""
+    if doc.name:
+        return Path(doc.name).stem
+    return output_path.stem.removesuffix(OUTPUT_SUFFIX)
+
+
+def _run_single_step(doc: fitz.Document, output_path: Path, name: str, params: dict) -> str:
+    from core.pdf_pipeline import PDFPipeline, PipelineStep
+
+    result = PDFPipeline([PipelineStep(name, params)]).run(doc, output_path)
+    if not result.success:
+        raise RuntimeError(result.error)
+    return result.steps[0].detail
+
+
+@register_operation(
+    "compress",
+    params=[Param("profile", "str", "medio", choices=tuple(COMPRESS_PROFILES), label="Perfil")],
+)
+def compress_operation(doc: fitz.Document, output_path: Path, profile: str = "medio") -> str:
+    return _run_single_step(doc, output_path, "compress", {"profile": profile})
+
+
+@register_operation(
+    "watermark",
+    params=[
+        Param("text", "str", "", label="Texto"),
+        Param("image_path", "str", None, label="Imagem", file=True),
+        Param("opacity", "float", 0.3, label="Opacidade", minimum=0.0, maximum=1.0),
+        Param("font_size", "int", 48, label="Tamanho da fonte", minimum=1, maximum=500),
+        Param("color", "color", [128, 128, 128], label="Cor RGB"),
+        Param("rotation", "float", -45.0, label="Rotação", minimum=-360, maximum=360),
+        Param("position", "str", "center", choices=("center", "tile"), label="Posição"),
+        Param("scale", "float", 1.0, label="Escala da imagem", minimum=0.01, maximum=10),
+    ],
+)
+def watermark_operation(doc: fitz.Document, output_path: Path, **config: Any) -> str:
+    return _run_single_step(doc, output_path, "watermark", config)
+
+
+@register_operation(
+    "encrypt",
+    params=[
+        Param("user_password", "str", "", label="Senha de abertura", secret=True),
+        Param("owner_password", "str", None, label="Senha de permissões", secret=True),
+        Param("permissions", "int", None, label="Permissões (bits)", minimum=0),
+    ],
+)
+def encrypt_operation(
+    doc: fitz.Document,
+    output_path: Path,
+    user_password: str = "",
+    owner_password: str | None = None,
+    permissions: int | None = None,
+) -> str:
+    if not user_password:
+        raise ValueError("Senha de usuário não informada")
+    params = {
+        "user_password": user_password,
+        "owner_password": owner_password,
+        "permissions": permissions,
+    }
+    return _run_single_step(doc, output_path, "encrypt", params)
+
+
+@register_operation(
+    "organize",
+    params=[
+        Param("order", "ints", None, label="Nova ordem"),
+        Param("delete", "ints", None, label="Páginas a remover"),
+        Param("reverse", "bool", False, label="Inverter"),
+    ],
+)
+def organize_operation(
+    doc: fitz.Document,
+    output_path: Path,
+    order: list[int] | None = None,
+    delete: list[int] | None = None,
+    reverse: bool = False,
+) -> str:
+    """Reordena (order), remove (delete) ou inverte páginas; índices base 0."""
+    total = doc.page_count
+    indices = list(order) if order is not None else list(range(total))
+    invalid = [i for i in indices + list(delete or []) if i < 0 or i >= total]
+    if invalid:
+        raise ValueError(f"Índice de página inválido: {invalid[0]}")
+    if delete:
+        removed = set(delete)
+        indices = [i for i in indices if i not in removed]
+    if reverse:
+        indices.reverse()
+    if not indices:
+        raise ValueError("Não é possível deletar todas as páginas")
+    doc.select(indices)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with stage("save"):
+        doc.save(str(output_path), garbage=4, deflate=True)
+    return f"{len(indices)} de {total} páginas"
+
+
+@register_operation(
+    "split",
+    cacheable=False,
+    params=[
+        Param("mode", "str", "pages", choices=SPLIT_MODES, label="Modo"),
+        Param("pages", "int", 1, label="Páginas por parte", minimum=1),
+        Param("ranges", "ranges", None, label="Faixas"),
+        Param("max_mb", "float", 10.0, label="Tamanho máximo (MB)", minimum=0.01),
+    ],
+)
+def split_operation(
+    doc: fitz.Document,
+    output_path: Path,
+    mode: str = "pages",
+    pages: int = 1,
+    ranges: list[tuple[int, int]] | None = None,
+    max_mb: float = 10.0,
+) -> str:
+    """
+    Divide em arquivos na pasta <saída>/<nome do PDF>/. mode: "pages" (a cada N
+    páginas), "ranges" (faixas [início, fim] base 0), "size" (até max_mb) ou
+    "bookmarks" (marcadores de nível 1).
+    """
+    from core.pdf_splitter import PDFSplitter
+
+    base_name = _source_stem(doc, output_path)
+    target = output_path.parent / base_name
+    splitter = PDFSplitter()
+    if mode == "pages":
+        step = max(1, int(pages))
+        chunks = [(s, min(s + step, doc.page_count) - 1) for s in range(0, doc.page_count, step)]
+        result = splitter.split_by_range(doc, chunks, target, base_name)
+    elif mode == "ranges":
+        chunks = [(int(a), int(b)) for a, b in ranges or []]
+        result = splitter.split_by_range(doc, chunks, target, base_name)
+    elif mode == "size":
+        result = splitter.split_by_size(doc, max_mb, target, base_name)
+    elif mode == "bookmarks":
+        result = splitter.split_by_bookmarks(doc, target, base_name)
+    else:
+        raise ValueError(f"Modo de divisão inválido: '{mode}'")
+    if not result.success:
+        raise RuntimeError(result.error)
+    return f"{len(result.output_files)} partes em {target}"
+
+
+@register_operation(
+    "images",
+    cacheable=False,
+    params=[
+        Param("fmt", "str", "png", choices=("png", "jpg"), label="Formato"),
+        Param("dpi", "int", 150, label="DPI", minimum=1, maximum=1200),
+    ],
+)
+def images_operation(
+    doc: fitz.Document, output_path: Path, fmt: str = "png", dpi: int = 150
+) -> str:
+    """Exporta cada página como imagem na pasta <saída>/<nome do PDF>/."""
+    from core.pdf_image_converter import PDFImageConverter
+
+    target = output_path.parent / _source_stem(doc, output_path)
+    result = PDFImageConverter().doc_to_images(doc, target, fmt=fmt, dpi=dpi)
+    if not result.success:
+        raise RuntimeError(result.error)
+    return f"{result.total_pages} imagens {fmt} em {target}"
+
+
+@register_operation(
+    "replace",
+    params=[
+        Param("pairs", "pairs", [], label="Pares buscar → substituir"),
+        Param("case_sensitive", "bool", False, label="Diferenciar maiúsculas"),
+    ],
+)
+def replace_operation(
+    doc: fitz.Document,
+    output_path: Path,
+    pairs: list[list[str]] | None = None,
+    case_sensitive: bool = False,
+) -> str:
+    """Substitui cada [buscar, substituir] preservando a tipografia original."""
+    from core.pdf_editor import PDFEditor
+
+    valid = [(search, replacement) for search, replacement in pairs or [] if search]
+    if not valid:
+        raise ValueError("Nenhum par de substituição informado")
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    result = PDFEditor().replace_text(doc, valid, output_path, case_sensitive)
+    return f"{result.total_replacements} substituições em {len(result.pages_affected)} páginas"
+
+
+@register_operation("classify")
+def classify_operation(doc: fitz.Document, output_path: Path) -> str:
+    from core.document_classifier import DocumentClassifier
+
+    result = DocumentClassifier().classify(doc)
+    return f"{result.doc_type} ({result.confidence:.2f}, {result.method})"
+
+
+# "Dar nome às coisas é o começo da sabedoria." — Confúcio
@@ -0,0 +1,274 @@
+import logging
+import multiprocessing
+import os
+import time
+from collections import deque
+from collections.abc import Callable
+from dataclasses import dataclass
+from itertools import count
+from multiprocessing.connection import Connection, wait
+from typing import Any
+
+from config.settings import (
+    BATCH_FILE_TIMEOUT_S,
+    BATCH_MAX_RSS_MB,
+    BATCH_MAX_TASKS_PER_WORKER,
+    BATCH_MP_START_METHOD,
+    BATCH_POOL_POLL_S,
+    BATCH_RECYCLE_RSS_MB,
+)
+
+logger = logging.getLogger("pdfforge.batch.pool")
+
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+@dataclass(frozen=True)
+class WorkerLimits:
+    """
+    Limites por arquivo e política de reciclagem dos processos do pool.
+
+    timeout_s e max_rss_mb são tetos rígidos: o processo é encerrado no meio da
+    tarefa e o arquivo é reportado como falha. max_tasks_per_worker e
+    recycle_rss_mb reciclam o processo entre tarefas, sem perder trabalho.
+    None desativa o respectivo limite.
+    """
+
+    timeout_s: float | None = BATCH_FILE_TIMEOUT_S
+    max_rss_mb: float | None = BATCH_MAX_RSS_MB
+    max_tasks_per_worker: int | None = BATCH_MAX_TASKS_PER_WORKER
+    recycle_rss_mb: float | None = BATCH_RECYCLE_RSS_MB
+
+
+@dataclass
+class TaskFailure:
+    """Tarefa que não devolveu resultado: exceção no worker ou limite violado."""
+
+    reason: str
+
+
+def rss_mb(pid: int | str = "self") -> float | None:
+    """RSS atual do processo em MB via /proc (None fora do Linux)."""
+    try:
+        with open(f"/proc/{pid}/statm", encoding="ascii") as fh:
+            resident_pages = int(fh.read().split()[1])
+    except (OSError, ValueError, IndexError):
+        return None
+    return resident_pages * _PAGE_SIZE / (1024 * 1024)
+
+
+def _worker_main(conn: Connection, limits: WorkerLimits) -> None:
+    """Laço do processo filho: recebe (task_id, fn, args) e devolve o resultado."""
+    conn.send(None)  # pronto: o tempo de inicialização não conta para o timeout
+    tasks_done = 0
+    while True:
+        try:
+            item = conn.recv()
+        except EOFError:
+            return
+        if item is None:
+            return
+        task_id, fn, args = item
+        try:
+            payload: Any = fn(*args)
+            ok = True
+        except Exception as exc:
+            payload, ok = f"{type(exc).__name__}: {exc}", False
+        tasks_done += 1
+
+        retire = limits.max_tasks_per_worker is not None and (
+            tasks_done >= limits.max_tasks_per_worker
+        )
+        if limits.recycle_rss_mb is not None:
+            current = rss_mb()
+            retire = retire or (current is not None and current > limits.recycle_rss_mb)
+        conn.send((task_id, ok, payload, retire))
+        if retire:
+            return
+
+
+@dataclass
+class _Worker:
+    wid: int
+    process: Any  # multiprocessing.Process (tipo depende do contexto)
+    conn: Connection
+    task_id: int | None = None
+    started_at: float = 0.0
+    ready: bool = False
+
+
+class WorkerPool:
+    """
+    Pool de processos supervisionado para o lote.
+
+    Diferente do ProcessPoolExecutor, cada processo tem seu próprio canal, então o
+    supervisor sabe qual arquivo cada um está processando e pode encerrar apenas
+    o processo que estourou o tempo ou a memória, substituindo-o por um novo.
+    Processos também são reciclados após N tarefas ou acima de um RSS, o que
+    mantém a vazão estável em acervos com PDFs patológicos.
+    """
+
+    def __init__(
+        self,
+        workers: int,
+        limits: WorkerLimits | None = None,
+        start_method: str = BATCH_MP_START_METHOD,
+    ) -> None:
+        self._size = max(1, workers)
+        self._limits = limits or WorkerLimits()
+        self._context = multiprocessing.get_context(start_method)
+        self._ids = count()
+        self._workers: dict[int, _Worker] = {}
+        self._queue: deque[tuple[int, Callable[..., Any], tuple[Any, ...]]] = deque()
+        self._ready: deque[tuple[int, Any]] = deque()
+        self._closed = False
+
+    def __enter__(self) -> "WorkerPool":
+        return self
+
+    def __exit__(self, *_: object) -> None:
+        self.close()
+
+    @property
+    def pending(self) -> int:
+        """Tarefas submetidas cujo resultado ainda não foi entregue."""
+        busy = sum(1 for w in self._workers.values() if w.task_id is not None)
+        return len(self._queue) + busy + len(self._ready)
+
+    def submit(self, task_id: int, fn: Callable[..., Any], *args: Any) -> None:
+        if self._closed:
+            raise RuntimeError("WorkerPool encerrado")
+        self._queue.append((task_id, fn, args))
+        self._dispatch()
+
+    def next_result(self, timeout: float | None = None) -> tuple[int, Any] | None:
+        """
+        Bloqueia até uma tarefa concluir. Devolve (task_id, resultado) ou
+        (task_id, TaskFailure) se a tarefa falhou ou violou um limite. Com
+        timeout, devolve None se nada concluir dentro do prazo.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not self._ready:
+            if not self._queue and all(w.task_id is None for w in self._workers.values()):
+                raise RuntimeError("Nenhuma tarefa pendente no WorkerPool")
+            if deadline is not None and time.monotonic() >= deadline:
+                return None
+            self._dispatch()
+            busy = [w for w in self._workers.values() if w.task_id is not None or not w.ready]
+            handles: list[Any] = [w.conn for w in busy] + [w.process.sentinel for w in busy]
+            poll = BATCH_POOL_POLL_S
+            if deadline is not None:
+                poll = max(0.0, min(poll, deadline - time.monotonic()))
+            for handle in wait(handles, timeout=poll):
+                worker = next(
+                    (w for w in busy if handle is w.conn or handle == w.process.sentinel), None
+                )
+                if worker is not None and worker.wid in self._workers:
+                    self._receive(worker)
+            self._enforce_limits()
+        return self._ready.popleft()
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        for worker in list(self._workers.values()):
+            self._stop(worker, graceful=worker.task_id is None)
+        self._workers.clear()
+
+    def _spawn(self) -> _Worker:
+        parent_conn, child_conn = self._context.Pipe(duplex=True)
+        process = self._context.Process(
+            target=_worker_main,
+            args=(child_conn, self._limits),
+            daemon=True,
+        )
+        process.start()
+        child_conn.close()
+        worker = _Worker(wid=next(self._ids), process=process, conn=parent_conn)
+        self._workers[worker.wid] = worker
+        logger.debug("Worker %d iniciado (pid=%s)", worker.wid, process.pid)
+        return worker
+
+    def _dispatch(self) -> None:
+        while self._queue:
+            idle = next((w for w in self._workers.values() if w.task_id is None), None)
+            if idle is None:
+                if len(self._workers) >= self._size:
+                    return
+                idle = self._spawn()
+            task_id, fn, args = self._queue.popleft()
+            try:
+                idle.conn.send((task_id, fn, args))
+            except (OSError, ValueError) as exc:
+                self._replace(idle)
+                self._ready.append((task_id, TaskFailure(f"falha ao enviar tarefa: {exc}")))
+                continue
+            idle.task_id = task_id
+            idle.started_at = time.monotonic()
+
+    def _receive(self, worker: _Worker) -> None:
+        try:
+            message = worker.conn.recv()
+        except (EOFError, OSError):
+            worker.process.join(timeout=1.0)
+            code = worker.process.exitcode
+            self._fail(worker, f"worker encerrado inesperadamente (código {code})")
+            return
+        if message is None:
+            worker.ready = True
+            worker.started_at = time.monotonic()
+            return
+        task_id, ok, payload, retire = message
+        worker.task_id = None
+        self._ready.append((task_id, payload if ok else TaskFailure(payload)))
+        if retire:
+            logger.debug("Worker %d reciclado", worker.wid)
+            self._replace(worker, graceful=True)
+
+    def _enforce_limits(self) -> None:
+        now = time.monotonic()
+        limits = self._limits
+        for worker in list(self._workers.values()):
+            if worker.task_id is None or not worker.ready:
+                continue
+            elapsed = now - worker.started_at
+            if limits.timeout_s is not None and elapsed > limits.timeout_s:
+                self._fail(worker, f"tempo limite excedido ({limits.timeout_s:g}s)")
+                continue
+            if limits.max_rss_mb is not None:
+                current = rss_mb(worker.process.pid)
+                if current is not None and current > limits.max_rss_mb:
+                    self._fail(
+                        worker,
+                        f"limite de memória excedido ({current:.0f} MB > "
+                        f"{limits.max_rss_mb:.0f} MB)",
+                    )
+
+    def _fail(self, worker: _Worker, reason: str) -> None:
+        task_id = worker.task_id
+        logger.warning("Worker %d (pid=%s): %s", worker.wid, worker.process.pid, reason)
+        self._replace(worker)
+        if task_id is not None:
+            self._ready.append((task_id, TaskFailure(reason)))
+
+    def _replace(self, worker: _Worker, graceful: bool = False) -> None:
+        self._workers.pop(worker.wid, None)
+        self._stop(worker, graceful=graceful)
+        # o substituto é criado sob demanda pelo próximo _dispatch
+
+    def _stop(self, worker: _Worker, graceful: bool) -> None:
+        if graceful:
+            try:
+                worker.conn.send(None)
+            except (OSError, ValueError):
+                pass
+            worker.process.join(timeout=1.0)
+        if worker.process.is_alive():
+            worker.process.kill()
+            worker.process.join(timeout=5.0)
+        worker.conn.close()
+
+
+# "Não é a força, mas a constância dos bons resultados que conduz os homens à felicidade."
+# — Friedrich Nietzsche
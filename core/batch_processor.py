@@ -1,42 +1,52 @@
 import logging
 import time
-from collections.abc import Callable
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator, Sized
 from dataclasses import dataclass, field
+from itertools import count
 from pathlib import Path
 
 import fitz
 
-from utils.file_utils import ensure_output_path, list_pdfs
+from config.settings import (
+    BATCH_DEDUP_MODE,
+    BATCH_PENDING_PER_WORKER,
+    BATCH_POOL_POLL_S,
+    BATCH_PREFETCH_FILES,
+    BATCH_PREFETCH_MAX_MB,
+    BATCH_SCHEDULE_POLICY,
+)
+from core.batch_journal import BatchJournal
+from core.batch_operations import (
+    OperationSpec,
+    describe_operation,
+    is_cacheable,
+    is_splittable,
+)
+from core.batch_pool import TaskFailure, WorkerLimits, WorkerPool
+from core.batch_report import BatchReport, FileResult
+from core.batch_scheduler import SCHEDULE_POLICIES, order_largest_first, split_ranges
+from core.dedup import DEDUP_MODES, fan_out, find_duplicates
+from core.prefetch import PrefetchedFile, ReadAhead
+from core.result_cache import ResultCache
+from utils.file_utils import ensure_output_path, iter_pdfs, list_pdfs
+from utils.timing import StageClock, activate_clock
 
 logger = logging.getLogger("pdfforge.batch")
 
 
 @dataclass
-class FileResult:
-    path: Path
-    success: bool
-    duration_s: float
-    message: str = ""
-    output_path: Path | None = None
+class _SplitJob:
+    """Documento grande dividido em faixas de páginas processadas em paralelo."""
 
-
-@dataclass
-class BatchReport:
-    total: int
-    succeeded: int
-    failed: int
-    duration_s: float
-    results: list[FileResult] = field(default_factory=list)
-
-    @property
-    def success_rate(self) -> float:
-        return (self.succeeded / self.total * 100) if self.total > 0 else 0.0
-
-    def summary(self) -> str:
-        return (
-            f"Lote concluído: {self.succeeded}/{self.total} arquivos"
-            f" ({self.success_rate:.0f}% sucesso) em {self.duration_s:.1f}s"
-        )
+    idx: int
+    pdf_path: Path
+    output_path: Path
+    ranges: list[tuple[int, int]]
+    parts: list[Path]
+    cache_key: str | None = None
+    results: dict[int, FileResult] = field(default_factory=dict)
+    failure: str = ""
 
 
 class BatchProcessor:
@@ -50,11 +60,79 @@ class BatchProcessor:
             operation=my_operation_fn,
             on_progress=update_ui,
         )
+
+    Para entradas muito grandes, iter_run() entrega cada FileResult assim que
+    conclui, com descoberta preguiçosa de arquivos e memória limitada.
+
+    Com um BatchJournal, cada arquivo concluído é gravado em disco; run(resume=True)
+    pula os arquivos que já foram processados com sucesso em execuções anteriores.
+
+    Com um ResultCache, entradas cujo conteúdo já foi processado pela mesma operação
+    (mesmos parâmetros) são restauradas do cache sem reabrir o PDF.
+
+    Com workers > 1 os arquivos são distribuídos em um pool de processos; nesse
+    modo a operação precisa ser um OperationSpec (operação registrada por nome),
+    pois closures não podem ser enviadas a processos filhos. WorkerLimits define
+    tempo e memória máximos por arquivo e a reciclagem dos processos; informá-lo
+    ativa o pool mesmo com workers=1.
+
+    No modo paralelo, schedule="largest_first" submete as listas de arquivos em
+    ordem decrescente de custo estimado (páginas e tamanho), e documentos grandes
+    de operações divisíveis (register_operation(splittable=True)) são quebrados
+    em faixas de páginas processadas por workers diferentes e concatenadas ao
+    final. schedule="fifo" mantém a ordem de entrada.
+
+    Com mirror_root, as saídas reproduzem sob output_dir a estrutura de pastas
+    relativa a esse diretório (entradas recursivas com nomes repetidos).
+
+    A operação "ocr" sequencial usa um único motor OCR aquecido para o lote todo e
+    agrupa páginas de arquivos consecutivos em lotes cheios de inferência.
+
+    Com dedupe="symlink" ou "copy", listas de entrada passam antes por uma
+    deduplicação por conteúdo (tamanho, hash parcial, hash completo): cada
+    documento é processado uma vez e a saída é replicada para as duplicatas,
+    que aparecem no relatório com duplicate_of. Operações com cacheable=False
+    (split, images), cujas saídas são diretórios, não passam pela deduplicação.
+
+    Nos caminhos sequencial e de OCR agrupado, os próximos prefetch_files
+    arquivos são lidos para a memória em segundo plano (até prefetch_max_mb no
+    total) e abertos com fitz.open(stream=...), o que esconde a latência de
+    armazenamento lento; prefetch_files=0 desativa. No modo paralelo cada worker
+    abre o próprio arquivo, e a leitura já acontece em paralelo.
     """
 
-    def __init__(self, output_dir: Path) -> None:
+    def __init__(
+        self,
+        output_dir: Path,
+        journal: BatchJournal | None = None,
+        cache: ResultCache | None = None,
+        limits: WorkerLimits | None = None,
+        schedule: str = BATCH_SCHEDULE_POLICY,
+        mirror_root: Path | None = None,
+        prefetch_files: int = BATCH_PREFETCH_FILES,
+        prefetch_max_mb: float = BATCH_PREFETCH_MAX_MB,
+        dedupe: str = BATCH_DEDUP_MODE,
+    ) -> None:
+        if schedule not in SCHEDULE_POLICIES:
+            raise ValueError(f"Política de escalonamento inválida: '{schedule}'")
+        if dedupe not in DEDUP_MODES:
+            raise ValueError(f"Modo de deduplicação inválido: '{dedupe}'")
         self._output_dir = output_dir
         self._output_dir.mkdir(parents=True, exist_ok=True)
+        self._journal = journal
+        self._cache = cache
+        self._limits = limits
+        self._schedule = schedule
+        self._mirror_root = mirror_root
+        self._prefetch_files = prefetch_files
+        self._prefetch_max_mb = prefetch_max_mb
+        self._dedupe = dedupe
+
+    def _output_for(self, pdf_path: Path) -> Path:
+        output_dir = self._output_dir
+        if self._mirror_root is not None and pdf_path.is_relative_to(self._mirror_root):
+            output_dir = output_dir / pdf_path.relative_to(self._mirror_root).parent
+        return ensure_output_path(pdf_path, output_dir)
 
     def run(
         self,
@@ -62,6 +140,9 @@ class BatchProcessor:
         operation: Callable[[fitz.Document, Path], str | None],
         on_progress: Callable[[int, int, str], None] | None = None,
         file_list: list[Path] | None = None,
+        workers: int = 1,
+        resume: bool = False,
+        on_result: Callable[[FileResult], None] | None = None,
     ) -> BatchReport:
         """
         Itera sobre PDFs do diretório e aplica a função operation.
@@ -71,51 +152,563 @@ class BatchProcessor:
             operation: função (doc, output_path) → mensagem opcional.
             on_progress: callback (current, total, filename).
             file_list: se fornecido, usa esta lista ao invés do diretório.
+            workers: número de processos; 1 mantém a execução sequencial.
+            resume: pula arquivos já concluídos segundo o diário (exige journal).
+            on_result: callback com cada FileResult assim que conclui (ex.: LiveETA).
+        """
+        files = file_list if file_list is not None else list_pdfs(input_dir)
+        report = BatchReport()
+        slots: list[FileResult | None] = [None] * len(files)
+
+        for idx, result in self._iter_indexed(
+            files, operation, on_progress, workers, None, report, resume
+        ):
+            slots[idx] = result
+            if on_result is not None:
+                on_result(result)
+
+        report.results = [r for r in slots if r is not None]
+        logger.info(report.summary())
+        return report
+
+    def iter_run(
+        self,
+        input_dir: Path,
+        operation: Callable[[fitz.Document, Path], str | None],
+        on_progress: Callable[[int, int, str], None] | None = None,
+        file_list: Iterable[Path | None] | None = None,
+        workers: int = 1,
+        max_pending: int | None = None,
+        report: BatchReport | None = None,
+        resume: bool = False,
+    ) -> Iterator[FileResult]:
+        """
+        Versão em streaming de run(): entrega cada FileResult assim que conclui.
+
+        O diretório é varrido preguiçosamente (os.scandir, sem ordenação) e, no modo
+        paralelo, no máximo max_pending arquivos ficam em voo ao mesmo tempo. Os
+        resultados chegam na ordem de conclusão. Se report for informado, seus
+        agregados são atualizados a cada arquivo sem reter os FileResult.
+
+        Fontes contínuas (ex.: pasta monitorada) podem produzir None em file_list
+        para sinalizar "nenhum arquivo novo por enquanto": o lote aproveita a pausa
+        para coletar resultados em vez de ficar bloqueado na fonte. A fonte deve
+        esperar um pouco antes de produzir None, para não girar em vazio.
         """
-        files = file_list or list_pdfs(input_dir)
-        total = len(files)
-        results: list[FileResult] = []
+        files = file_list if file_list is not None else iter_pdfs(input_dir)
+        report = report if report is not None else BatchReport()
+        for _idx, result in self._iter_indexed(
+            files, operation, on_progress, workers, max_pending, report, resume
+        ):
+            yield result
+        logger.info(report.summary())
+
+    def _iter_indexed(
+        self,
+        files: Iterable[Path | None],
+        operation: Callable[[fitz.Document, Path], str | None],
+        on_progress: Callable[[int, int, str], None] | None,
+        workers: int,
+        max_pending: int | None,
+        report: BatchReport,
+        resume: bool,
+    ) -> Iterator[tuple[int, FileResult]]:
+        journal = self._journal
+        if resume and journal is None:
+            raise ValueError("resume=True exige um BatchJournal")
+
+        # total desconhecido (0) quando a entrada é um iterador preguiçoso
+        total = len(files) if isinstance(files, Sized) else 0
         batch_start = time.monotonic()
+        op_name, op_params = describe_operation(operation)
+        run_id = journal.start_run(op_name, op_params) if journal else 0
+        resumed: deque[tuple[int, FileResult]] = deque()
+        done = 0
 
-        logger.info("Iniciando lote: %d arquivos em %s", total, input_dir)
+        # índice do original → índices das entradas de mesmo conteúdo
+        inputs: list[Path] = []
+        duplicates: dict[int, list[int]] = {}
+        # saídas em diretório (split, images) não são replicadas: cada cópia roda
+        if self._dedupe != "off" and isinstance(files, Sized) and is_cacheable(op_name):
+            inputs = [p for p in files if p is not None]
+            for group in find_duplicates(inputs):
+                duplicates[group.original] = group.duplicates
+        skip = {i for members in duplicates.values() for i in members}
 
-        for idx, pdf_path in enumerate(files):
+        logger.info("Iniciando lote: %d arquivos (workers=%d)", total, workers)
+
+        def _advance(name: str) -> None:
+            nonlocal done
+            done += 1
             if on_progress:
-                on_progress(idx + 1, total, pdf_path.name)
-
-            output_path = ensure_output_path(pdf_path, self._output_dir)
-            result = self._process_one(pdf_path, output_path, operation)
-            results.append(result)
-
-        batch_duration = time.monotonic() - batch_start
-        succeeded = sum(1 for r in results if r.success)
-        report = BatchReport(
-            total=total,
-            succeeded=succeeded,
-            failed=total - succeeded,
-            duration_s=batch_duration,
-            results=results,
+                on_progress(done, total, name)
+
+        def _pending() -> Iterator[tuple[int, Path | None]]:
+            idx = -1
+            for pdf_path in files:
+                if pdf_path is None:  # fonte ociosa
+                    yield idx, None
+                    continue
+                idx += 1
+                if idx in skip:  # replicada quando o original concluir
+                    continue
+                entry = (
+                    journal.find_completed(pdf_path, op_name, op_params)
+                    if resume and journal is not None
+                    else None
+                )
+                if entry is None:
+                    yield idx, pdf_path
+                    continue
+                resumed.append(
+                    (
+                        idx,
+                        FileResult(
+                            path=pdf_path,
+                            success=True,
+                            duration_s=0.0,
+                            message=f"retomado: {entry.message}",
+                            output_path=entry.output_path,
+                            skipped=True,
+                        ),
+                    )
+                )
+
+        def _collect(idx: int, result: FileResult) -> tuple[int, FileResult]:
+            report.add(result, keep=False)
+            report.duration_s = time.monotonic() - batch_start
+            return idx, result
+
+        def _emit(idx: int, result: FileResult, record: bool) -> Iterator[tuple[int, FileResult]]:
+            if record and journal is not None:
+                journal.record(
+                    run_id,
+                    result.path,
+                    op_name,
+                    op_params,
+                    result.success,
+                    result.message,
+                    result.duration_s,
+                    result.output_path,
+                    result.pages,
+                )
+            yield _collect(idx, result)
+            for dup_idx in duplicates.pop(idx, []):
+                duplicate = self._fan_out(inputs[dup_idx], result)
+                _advance(duplicate.path.name)
+                yield from _emit(dup_idx, duplicate, True)
+
+        def _flush_resumed() -> Iterator[tuple[int, FileResult]]:
+            while resumed:
+                idx, result = resumed.popleft()
+                _advance(result.path.name)
+                yield from _emit(idx, result, False)
+
+        # limites explícitos exigem isolamento em processo, mesmo com um único worker
+        pending: Iterable[tuple[int, Path | None]] = _pending()
+        read_ahead = ReadAhead(self._prefetch_files, self._prefetch_max_mb)
+        if (workers > 1 and total != 1) or self._limits is not None:
+            # só listas conhecidas são reordenadas; iteradores preguiçosos seguem em streaming
+            if self._schedule == "largest_first" and isinstance(files, Sized):
+                pending = order_largest_first(pending)
+            # sem leitura antecipada: os workers já abrem seus arquivos em paralelo, e um
+            # leitor único serializaria a E/S e travaria o supervisor à espera dos bytes
+            stream = self._iter_parallel(pending, operation, _advance, workers, max_pending)
+        elif isinstance(operation, OperationSpec) and operation.name == "ocr":
+            from core.ocr_batch import iter_batched_ocr
+
+            stream = iter_batched_ocr(
+                read_ahead.iterate(pending), operation, self._output_for, _advance, self._cache
+            )
+        else:
+            stream = self._iter_sequential(read_ahead.iterate(pending), operation, _advance)
+
+        try:
+            for idx, result in stream:
+                yield from _flush_resumed()
+                yield from _emit(idx, result, True)
+            yield from _flush_resumed()
+        finally:
+            stream.close()
+            read_ahead.close()
+            if journal is not None:
+                journal.finish_run(run_id)
+            if self._cache is not None:
+                self._cache.evict()
+
+    def _iter_sequential(
+        self,
+        files: Iterable[tuple[int, Path | None, PrefetchedFile | None]],
+        operation: Callable[[fitz.Document, Path], str | None],
+        advance: Callable[[str], None],
+    ) -> Iterator[tuple[int, FileResult]]:
+        for idx, pdf_path, prefetched in files:
+            if pdf_path is None:
+                continue
+            advance(pdf_path.name)
+            output_path = self._output_for(pdf_path)
+            data = prefetched.data() if prefetched is not None else None
+            try:
+                result = self._process_one(pdf_path, output_path, operation, self._cache, data=data)
+            finally:
+                if prefetched is not None:
+                    prefetched.release()
+            yield idx, result
+
+    def _iter_parallel(
+        self,
+        files: Iterable[tuple[int, Path | None]],
+        operation: Callable[[fitz.Document, Path], str | None],
+        advance: Callable[[str], None],
+        workers: int,
+        max_pending: int | None,
+    ) -> Iterator[tuple[int, FileResult]]:
+        """
+        Distribui _process_one em um WorkerPool supervisionado com janela de
+        backpressure: um novo arquivo só é submetido quando outro conclui. Arquivos
+        que estouram tempo ou memória viram FileResult com falha e o worker é trocado.
+        """
+        if not isinstance(operation, OperationSpec):
+            raise TypeError(
+                "Modo paralelo exige uma operação registrada (OperationSpec), não uma closure"
+            )
+
+        window = max(1, max_pending or workers * BATCH_PENDING_PER_WORKER)
+        splittable = is_splittable(operation.name)
+        # task_id → (índice do arquivo, caminho, job dividido ou None, parte)
+        tasks: dict[int, tuple[int, Path, _SplitJob | None, int]] = {}
+        task_ids = count()
+        ready: deque[tuple[int, FileResult]] = deque()
+        source = iter(files)
+        exhausted = False
+        idle_source = False  # a fonte já sinalizou pausa: não bloquear só no pool
+
+        with WorkerPool(workers, self._limits) as pool:
+
+            def _submit(
+                idx: int, pdf_path: Path, job: _SplitJob | None, part: int, *args: object
+            ) -> None:
+                task_id = next(task_ids)
+                pool.submit(task_id, *args)
+                tasks[task_id] = (idx, pdf_path, job, part)
+
+            def _fill() -> None:
+                nonlocal exhausted, idle_source
+                while not exhausted and len(tasks) < window:
+                    item = next(source, None)
+                    if item is None:
+                        exhausted = True
+                        return
+                    idx, pdf_path = item
+                    if pdf_path is None:
+                        idle_source = True
+                        return
+                    output_path = self._output_for(pdf_path)
+                    job = (
+                        self._plan_split(idx, pdf_path, output_path, operation, workers)
+                        if splittable
+                        else None
+                    )
+                    if job is None:
+                        _submit(
+                            idx,
+                            pdf_path,
+                            None,
+                            0,
+                            BatchProcessor._process_one,
+                            pdf_path,
+                            output_path,
+                            operation,
+                            self._cache,
+                        )
+                        continue
+                    if isinstance(job, FileResult):  # acerto de cache
+                        ready.append((idx, job))
+                        continue
+                    for part, page_range in enumerate(job.ranges):
+                        _submit(
+                            idx,
+                            pdf_path,
+                            job,
+                            part,
+                            BatchProcessor._process_one,
+                            pdf_path,
+                            job.parts[part],
+                            operation,
+                            None,
+                            page_range,
+                        )
+
+            def _failed(pdf_path: Path, reason: str) -> FileResult:
+                logger.error("Worker falhou em %s: %s", pdf_path.name, reason)
+                return FileResult(path=pdf_path, success=False, duration_s=0.0, message=reason)
+
+            _fill()
+            while tasks or ready or not exhausted:
+                if ready:
+                    idx, result = ready.popleft()
+                    advance(result.path.name)
+                    yield idx, result
+                    _fill()
+                    continue
+                if not tasks:
+                    _fill()  # fonte ociosa: a própria fonte limita a espera
+                    continue
+
+                got = pool.next_result(timeout=BATCH_POOL_POLL_S if idle_source else None)
+                if got is None:
+                    _fill()
+                    continue
+                task_id, outcome = got
+                idx, pdf_path, job, part = tasks.pop(task_id)
+                final: FileResult | None = None
+                if isinstance(outcome, TaskFailure):
+                    outcome = _failed(pdf_path, outcome.reason)
+
+                if job is None:
+                    final = outcome
+                elif part == len(job.parts):  # concatenação
+                    final = outcome
+                else:
+                    job.results[part] = outcome
+                    if not outcome.success and not job.failure:
+                        job.failure = f"parte {part + 1}/{len(job.parts)}: {outcome.message}"
+                    if len(job.results) == len(job.parts):
+                        if job.failure:
+                            self._discard_parts(job.parts)
+                            final = FileResult(
+                                path=pdf_path,
+                                success=False,
+                                duration_s=sum(r.duration_s for r in job.results.values()),
+                                message=job.failure,
+                            )
+                        else:
+                            _submit(
+                                idx,
+                                pdf_path,
+                                job,
+                                len(job.parts),
+                                BatchProcessor._merge_parts,
+                                pdf_path,
+                                job.output_path,
+                                job.parts,
+                                [job.results[i] for i in range(len(job.parts))],
+                                self._cache,
+                                job.cache_key,
+                            )
+
+                if final is not None:
+                    advance(pdf_path.name)
+                    yield idx, final
+                _fill()
+
+    def _fan_out(self, pdf_path: Path, original: FileResult) -> FileResult:
+        """Resultado de uma duplicata: a saída do original replicada (link ou cópia)."""
+        start = time.monotonic()
+        message = f"duplicata de {original.path.name}: {original.message}"
+        output_path = None
+        success = original.success
+        source = original.output_path
+        if success and source is not None and source.is_file():
+            target = self._output_for(pdf_path)
+            try:
+                output_path = target if target == source else fan_out(source, target, self._dedupe)
+            except OSError as exc:
+                logger.error("Falha ao replicar saída para %s: %s", pdf_path.name, exc)
+                success = False
+                message = f"duplicata de {original.path.name}: {exc}"
+        return FileResult(
+            path=pdf_path,
+            success=success,
+            duration_s=time.monotonic() - start,
+            message=message,
+            output_path=output_path,
+            duplicate_of=original.path,
         )
-        logger.info(report.summary())
-        return report
 
-    def _process_one(
+    def _plan_split(
         self,
+        idx: int,
+        pdf_path: Path,
+        output_path: Path,
+        operation: OperationSpec,
+        workers: int,
+    ) -> _SplitJob | FileResult | None:
+        """
+        Decide se o documento vira sub-tarefas por faixa de páginas. Retorna None
+        para processá-lo inteiro, um FileResult se a saída já está no cache ou o
+        _SplitJob com as faixas e os arquivos parciais.
+        """
+        try:
+            with fitz.open(str(pdf_path)) as doc:
+                pages = doc.page_count
+        except Exception:
+            return None  # _process_one reporta o erro de abertura
+        ranges = split_ranges(pages, workers)
+        if len(ranges) < 2:
+            return None
+
+        cache_key = None
+        if self._cache is not None:
+            start = time.monotonic()
+            cache_key = self._cache.make_key(pdf_path, operation.name, operation.params)
+            message = self._cache.lookup(cache_key, output_path)
+            if message is not None:
+                return FileResult(
+                    path=pdf_path,
+                    success=True,
+                    duration_s=time.monotonic() - start,
+                    message=message,
+                    output_path=output_path if output_path.exists() else None,
+                    cached=True,
+                    input_bytes=pdf_path.stat().st_size,
+                )
+            output_path.unlink(missing_ok=True)
+
+        logger.info("%s: %d páginas em %d sub-tarefas", pdf_path.name, pages, len(ranges))
+        parts = [
+            output_path.with_name(f".{output_path.stem}.parte{i:03d}.pdf")
+            for i in range(len(ranges))
+        ]
+        return _SplitJob(idx, pdf_path, output_path, ranges, parts, cache_key)
+
+    @staticmethod
+    def _discard_parts(parts: list[Path]) -> None:
+        for part in parts:
+            part.unlink(missing_ok=True)
+
+    @staticmethod
+    def _merge_parts(
+        pdf_path: Path,
+        output_path: Path,
+        parts: list[Path],
+        part_results: list[FileResult],
+        cache: ResultCache | None = None,
+        cache_key: str | None = None,
+    ) -> FileResult:
+        """Concatena as saídas parciais na ordem das faixas, com metadados e sumário do original."""
+        clock = StageClock()
+        for result in part_results:
+            for name, seconds in result.stages.items():
+                clock.stages[name] = clock.stages.get(name, 0.0) + seconds
+        busy_s = sum(r.duration_s for r in part_results)
+        start = time.monotonic()
+        message = f"{len(parts)} partes: {part_results[0].message}"
+        try:
+            with clock.measure("merge"):
+                merged = fitz.open()
+                for part in parts:
+                    with fitz.open(str(part)) as chunk:
+                        merged.insert_pdf(chunk)
+                with fitz.open(str(pdf_path)) as original:
+                    merged.set_metadata(original.metadata)
+                    toc = original.get_toc(simple=True)
+                if toc:
+                    merged.set_toc(toc)
+            with clock.measure("save"):
+                merged.save(str(output_path), garbage=4, deflate=True)
+            merged.close()
+            if cache is not None and cache_key is not None:
+                with clock.measure("cache"):
+                    cache.store(cache_key, output_path, message)
+        except Exception as exc:
+            logger.error("Falha ao concatenar partes de %s: %s", pdf_path.name, exc)
+            return FileResult(
+                path=pdf_path,
+                success=False,
+                duration_s=busy_s + time.monotonic() - start,
+                message=f"concatenação: {exc}",
+                stages=clock.stages,
+            )
+        finally:
+            BatchProcessor._discard_parts(parts)
+
+        return FileResult(
+            path=pdf_path,
+            success=True,
+            duration_s=busy_s + time.monotonic() - start,
+            message=message,
+            output_path=output_path,
+            stages=clock.stages,
+            pages=sum(r.pages for r in part_results),
+            input_bytes=pdf_path.stat().st_size,
+            output_bytes=output_path.stat().st_size,
+        )
+
+    @staticmethod
+    def _process_one(
         pdf_path: Path,
         output_path: Path,
         operation: Callable[[fitz.Document, Path], str | None],
+        cache: ResultCache | None = None,
+        page_range: tuple[int, int] | None = None,
+        data: bytes | None = None,
     ) -> FileResult:
+        """
+        Processa um arquivo inteiro ou, com page_range, apenas as páginas
+        [início, fim) — sub-tarefa de um documento dividido (sem cache). Com data
+        (conteúdo lido antecipadamente), o documento é aberto da memória.
+        """
         start = time.monotonic()
+        clock = StageClock()
         try:
-            doc = fitz.open(str(pdf_path))
-            message = operation(doc, output_path) or "OK"
-            doc.close()
+            if data is not None:
+                input_bytes = len(data)
+            else:
+                input_bytes = pdf_path.stat().st_size if page_range is None else 0
+            # só operações registradas têm identidade estável para o cache
+            cache_key = None
+            if (
+                cache is not None
+                and isinstance(operation, OperationSpec)
+                and is_cacheable(operation.name)
+            ):
+                with clock.measure("cache"):
+                    cache_key = cache.make_key(
+                        pdf_path, operation.name, operation.params, data=data
+                    )
+                    message = cache.lookup(cache_key, output_path)
+                if message is not None:
+                    restored = output_path if output_path.exists() else None
+                    return FileResult(
+                        path=pdf_path,
+                        success=True,
+                        duration_s=time.monotonic() - start,
+                        message=message,
+                        output_path=restored,
+                        cached=True,
+                        stages=clock.stages,
+                        input_bytes=input_bytes,
+                        output_bytes=restored.stat().st_size if restored else 0,
+                    )
+                # a saída anterior pode ser um hard link para uma entrada do cache
+                output_path.unlink(missing_ok=True)
+
+            with activate_clock(clock):
+                with clock.measure("open"):
+                    if data is not None:
+                        doc = fitz.open(stream=data, filetype="pdf")
+                    else:
+                        doc = fitz.open(str(pdf_path))
+                    if page_range is not None:
+                        doc.select(list(range(*page_range)))
+                pages = doc.page_count
+                with clock.measure("operate"):
+                    message = operation(doc, output_path) or "OK"
+                doc.close()
+            if cache_key is not None and cache is not None:
+                with clock.measure("cache"):
+                    cache.store(cache_key, output_path if output_path.exists() else None, message)
             return FileResult(
                 path=pdf_path,
                 success=True,
                 duration_s=time.monotonic() - start,
                 message=message,
                 output_path=output_path,
+                stages=clock.stages,
+                pages=pages,
+                input_bytes=input_bytes,
+                output_bytes=output_path.stat().st_size if output_path.exists() else 0,
             )
         except Exception as exc:
             logger.error("Falha ao processar %s: %s", pdf_path.name, exc, exc_info=True)
@@ -124,6 +717,7 @@ class BatchProcessor:
                 success=False,
                 duration_s=time.monotonic() - start,
                 message=str(exc),
+                stages=clock.stages,
             )
 
 
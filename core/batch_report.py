@@ -0,0 +1,79 @@
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from core.batch_metrics import BatchMetrics, report_to_json, write_prometheus_textfile
+
+
+@dataclass
+class FileResult:
+    path: Path
+    success: bool
+    duration_s: float
+    message: str = ""
+    output_path: Path | None = None
+    skipped: bool = False  # True quando retomado do diário sem reprocessar
+    cached: bool = False  # True quando a saída veio do cache de resultados
+    duplicate_of: Path | None = None  # entrada de conteúdo idêntico que foi processada
+    stages: dict[str, float] = field(default_factory=dict)  # open/operate/save (s)
+    pages: int = 0
+    input_bytes: int = 0
+    output_bytes: int = 0
+
+    @property
+    def pages_per_s(self) -> float:
+        return self.pages / self.duration_s if self.duration_s > 0 else 0.0
+
+    @property
+    def mb_per_s(self) -> float:
+        return self.input_bytes / (1024 * 1024) / self.duration_s if self.duration_s > 0 else 0.0
+
+
+@dataclass
+class BatchReport:
+    total: int = 0
+    succeeded: int = 0
+    failed: int = 0
+    duplicates: int = 0
+    duration_s: float = 0.0
+    results: list[FileResult] = field(default_factory=list)
+    metrics: BatchMetrics = field(default_factory=BatchMetrics)
+
+    @property
+    def success_rate(self) -> float:
+        return (self.succeeded / self.total * 100) if self.total > 0 else 0.0
+
+    def add(self, result: FileResult, keep: bool = True) -> None:
+        """Acumula um resultado; keep=False atualiza só os agregados (memória constante)."""
+        self.total += 1
+        if result.success:
+            self.succeeded += 1
+        else:
+            self.failed += 1
+        if result.duplicate_of is not None:
+            self.duplicates += 1
+        elif not result.skipped:
+            self.metrics.add(
+                result.duration_s,
+                result.stages,
+                result.pages,
+                result.input_bytes,
+                result.output_bytes,
+            )
+        if keep:
+            self.results.append(result)
+
+    def summary(self) -> str:
+        duplicates = f", {self.duplicates} duplicatas" if self.duplicates else ""
+        return (
+            f"Lote concluído: {self.succeeded}/{self.total} arquivos"
+            f" ({self.success_rate:.0f}% sucesso{duplicates}) em {self.duration_s:.1f}s"
+        )
+
+    def to_json(self) -> str:
+        return report_to_json(self)
+
+    def write_prometheus(self, path: Path, job: str = "pdfforge_batch") -> None:
+        write_prometheus_textfile(self, path, job)
+
+
+# "Os fatos não deixam de existir porque são ignorados." — Aldous Huxley
@@ -0,0 +1,82 @@
+import logging
+import math
+from collections.abc import Iterable
+from dataclasses import dataclass
+from pathlib import Path
+
+import fitz
+
+from config.settings import (
+    BATCH_COST_BYTES_PER_PAGE,
+    BATCH_SPLIT_MIN_CHUNK_PAGES,
+    BATCH_SPLIT_MIN_PAGES,
+)
+
+logger = logging.getLogger("pdfforge.batch.scheduler")
+
+SCHEDULE_POLICIES = ("fifo", "largest_first")
+
+
+@dataclass(frozen=True)
+class FileCost:
+    path: Path
+    size_bytes: int
+    pages: int
+
+    @property
+    def cost(self) -> float:
+        """Custo relativo em "páginas equivalentes": páginas + peso do tamanho em disco."""
+        return self.pages + self.size_bytes / BATCH_COST_BYTES_PER_PAGE
+
+
+def probe_cost(path: Path) -> FileCost:
+    """
+    Estima o custo de um PDF sem processá-lo: tamanho via stat e contagem de
+    páginas via fitz (que lê apenas a tabela xref). Arquivos ilegíveis ficam com
+    0 páginas e são avaliados só pelo tamanho.
+    """
+    try:
+        size = path.stat().st_size
+    except OSError:
+        return FileCost(path, 0, 0)
+    try:
+        with fitz.open(str(path)) as doc:
+            pages = doc.page_count
+    except Exception as exc:
+        logger.debug("Sem contagem de páginas para %s: %s", path.name, exc)
+        pages = 0
+    return FileCost(path, size, pages)
+
+
+def order_largest_first(items: Iterable[tuple[int, Path]]) -> list[tuple[int, Path]]:
+    """
+    Ordena (índice, caminho) por custo decrescente (LPT: longest processing time).
+
+    Com o maior arquivo submetido primeiro, ele deixa de ser o último a terminar
+    com os demais núcleos ociosos. Empates preservam a ordem de entrada.
+    """
+    costed = [(probe_cost(path).cost, idx, path) for idx, path in items]
+    costed.sort(key=lambda item: -item[0])
+    return [(idx, path) for _cost, idx, path in costed]
+
+
+def split_ranges(
+    pages: int,
+    workers: int,
+    min_pages: int = BATCH_SPLIT_MIN_PAGES,
+    min_chunk: int = BATCH_SPLIT_MIN_CHUNK_PAGES,
+) -> list[tuple[int, int]]:
+    """
+    Faixas [início, fim) para dividir um documento em sub-tarefas.
+
+    Documentos abaixo de min_pages (ou sem paralelismo) viram uma única faixa.
+    Acima disso, a faixa tem ceil(páginas / workers) páginas, mas nunca menos
+    que min_chunk, para que o custo de abrir e concatenar as partes não domine.
+    """
+    if workers < 2 or pages < max(min_pages, 2):
+        return [(0, pages)]
+    chunk = max(min_chunk, math.ceil(pages / workers))
+    return [(start, min(start + chunk, pages)) for start in range(0, pages, chunk)]
+
+
+# "Primeiro as coisas grandes, depois as pequenas." — Stephen Covey
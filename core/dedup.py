@@ -0,0 +1,127 @@
+import hashlib
+import logging
+import os
+import shutil
+from collections import defaultdict
+from collections.abc import Callable, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+
+from config.settings import BATCH_DEDUP_PARTIAL_KB, BATCH_DEDUP_WORKERS
+from utils.file_utils import hash_file
+
+logger = logging.getLogger("pdfforge.batch.dedup")
+
+DEDUP_MODES = ("off", "symlink", "copy")
+
+
+@dataclass
+class DuplicateGroup:
+    """Entradas de conteúdo idêntico: original (primeira na ordem do lote) e cópias."""
+
+    original: int  # índice na lista de entrada
+    duplicates: list[int]
+    digest: str
+    size_bytes: int
+
+
+def partial_hash(path: Path, sample_kb: int = BATCH_DEDUP_PARTIAL_KB) -> str:
+    """SHA-256 do início e do fim do arquivo: descarta quase todos os falsos pares."""
+    sample = sample_kb * 1024
+    digest = hashlib.sha256()
+    with path.open("rb") as fh:
+        digest.update(fh.read(sample))
+        size = os.fstat(fh.fileno()).st_size
+        if size > sample:
+            fh.seek(max(sample, size - sample))
+            digest.update(fh.read(sample))
+    return digest.hexdigest()
+
+
+def _refine(
+    groups: list[list[int]],
+    paths: Sequence[Path],
+    key_fn: Callable[[Path], str],
+    pool: ThreadPoolExecutor,
+) -> list[tuple[str, list[int]]]:
+    """Subdivide cada grupo pela chave de key_fn, calculada em paralelo."""
+    flat = [i for group in groups for i in group]
+
+    def _safe(i: int) -> str | None:
+        try:
+            return key_fn(paths[i])
+        except OSError as exc:
+            logger.debug("Deduplicação ignorou %s: %s", paths[i].name, exc)
+            return None
+
+    keys = dict(zip(flat, pool.map(_safe, flat)))
+    refined: list[tuple[str, list[int]]] = []
+    for group in groups:
+        buckets: dict[str, list[int]] = defaultdict(list)
+        for i in group:
+            key = keys[i]
+            if key is not None:
+                buckets[key].append(i)
+        refined.extend((key, members) for key, members in buckets.items() if len(members) > 1)
+    return refined
+
+
+def find_duplicates(
+    paths: Sequence[Path], workers: int = BATCH_DEDUP_WORKERS
+) -> list[DuplicateGroup]:
+    """
+    Agrupa entradas de conteúdo idêntico em três passes: tamanho (stat), hash
+    parcial (início e fim) e hash completo. Cada passe só lê os candidatos que
+    sobreviveram ao anterior, e os hashes rodam em threads (leitura e hashlib
+    liberam o GIL). Os PDFs não são abertos com fitz. O mesmo caminho repetido
+    na lista também conta como duplicata.
+    """
+    by_size: dict[int, list[int]] = defaultdict(list)
+    for i, path in enumerate(paths):
+        try:
+            size = path.stat().st_size
+        except OSError:
+            continue  # o lote reporta o erro ao processar
+        if size > 0:
+            by_size[size].append(i)
+    candidates = [group for group in by_size.values() if len(group) > 1]
+    if not candidates:
+        return []
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        partial = _refine(candidates, paths, partial_hash, pool)
+        full = _refine([members for _key, members in partial], paths, hash_file, pool)
+
+    groups = [
+        DuplicateGroup(members[0], members[1:], digest, paths[members[0]].stat().st_size)
+        for digest, members in full
+    ]
+    groups.sort(key=lambda g: g.original)
+    if groups:
+        logger.info(
+            "Deduplicação: %d entradas repetidas em %d grupos",
+            sum(len(g.duplicates) for g in groups),
+            len(groups),
+        )
+    return groups
+
+
+def fan_out(source: Path, target: Path, mode: str) -> Path:
+    """Replica a saída de um original para uma duplicata por link simbólico ou cópia."""
+    if mode not in DEDUP_MODES or mode == "off":
+        raise ValueError(f"Modo de deduplicação inválido: '{mode}'")
+    target.parent.mkdir(parents=True, exist_ok=True)
+    if target.is_symlink() or target.exists():
+        target.unlink()
+    if mode == "symlink":
+        try:
+            target.symlink_to(os.path.relpath(source.resolve(), target.parent.resolve()))
+            return target
+        except OSError as exc:  # sistema de arquivos sem suporte a links
+            logger.debug("Link simbólico indisponível (%s); copiando", exc)
+    shutil.copy2(source, target)
+    return target
+
+
+# "Coisas iguais a uma mesma coisa são iguais entre si." — Euclides
@@ -4,6 +4,8 @@ from pathlib import Path
 
 import fitz
 
+from utils.timing import stage
+
 logger = logging.getLogger("pdfforge.metadata")
 
 # Chaves suportadas pelo padrão PDF/PyMuPDF
@@ -64,13 +66,18 @@ class PDFMetadata:
             mod_date=raw.get("modDate", ""),
         )
 
+    def apply(self, doc: fitz.Document, metadata: Metadata) -> None:
+        """Aplica metadados ao documento aberto, sem salvar."""
+        doc.set_metadata(metadata.to_fitz_dict())
+
     def write(self, doc: fitz.Document, metadata: Metadata, output_path: Path) -> None:
         """
         Escreve metadados no documento e salva em output_path.
         Não modifica o arquivo original.
         """
-        doc.set_metadata(metadata.to_fitz_dict())
-        doc.save(str(output_path), garbage=4, deflate=True)
+        self.apply(doc, metadata)
+        with stage("save"):
+            doc.save(str(output_path), garbage=4, deflate=True)
         logger.info(
             "Metadados escritos em %s (título: '%s', autor: '%s')",
             output_path.name,
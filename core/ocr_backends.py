@@ -0,0 +1,146 @@
+import logging
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+
+logger = logging.getLogger("pdfforge.ocr.backends")
+
+# Códigos de idioma do EasyOCR (usados em todo o app) → Tesseract
+_TESSERACT_LANGS = {
+    "pt": "por",
+    "en": "eng",
+    "es": "spa",
+    "fr": "fra",
+    "de": "deu",
+    "it": "ita",
+    "nl": "nld",
+    "la": "lat",
+}
+
+
+@dataclass(frozen=True)
+class OCRBackend:
+    """
+    Motor de reconhecimento por trás do OCREngine.
+
+    create(languages, use_gpu) devolve um leitor com a interface do EasyOCR:
+    readtext(imagem, detail=1, paragraph=False) → [(4 vértices, texto, confiança
+    0-1)] e, opcionalmente, readtext_batched. Assim o OCREngine (lotes,
+    escala por página, cache, pool de CPU) não depende do backend.
+    """
+
+    name: str
+    create: Callable[[list[str], bool], Any]
+    supports_gpu: bool = False
+    install_hint: str = ""
+
+
+_BACKENDS: dict[str, OCRBackend] = {}
+
+
+def register_ocr_backend(
+    name: str, supports_gpu: bool = False, install_hint: str = ""
+) -> Callable[[Callable[[list[str], bool], Any]], Callable[[list[str], bool], Any]]:
+    def _decorator(create: Callable[[list[str], bool], Any]) -> Callable[[list[str], bool], Any]:
+        _BACKENDS[name] = OCRBackend(name, create, supports_gpu, install_hint)
+        return create
+
+    return _decorator
+
+
+def available_backends() -> list[str]:
+    return sorted(_BACKENDS)
+
+
+def get_backend(name: str) -> OCRBackend:
+    try:
+        return _BACKENDS[name]
+    except KeyError:
+        raise ValueError(
+            f"Backend de OCR desconhecido: '{name}'. Use: {available_backends()}"
+        ) from None
+
+
+def create_reader(name: str, languages: list[str], use_gpu: bool = False) -> Any:
+    """Leitor do backend; RuntimeError com a instalação sugerida se faltar a biblioteca."""
+    backend = get_backend(name)
+    try:
+        return backend.create(languages, use_gpu and backend.supports_gpu)
+    except ImportError as exc:
+        raise RuntimeError(
+            f"Backend de OCR '{name}' indisponível ({exc}). Execute: {backend.install_hint}"
+        ) from exc
+
+
+@register_ocr_backend("easyocr", supports_gpu=True, install_hint="pip install easyocr")
+def _easyocr_reader(languages: list[str], use_gpu: bool) -> Any:
+    import easyocr
+
+    return easyocr.Reader(languages, gpu=use_gpu)
+
+
+def tesseract_languages(languages: list[str]) -> str:
+    """["pt", "en"] → "por+eng"; códigos já no formato do Tesseract passam direto."""
+    return "+".join(_TESSERACT_LANGS.get(lang, lang) for lang in languages)
+
+
+def tesseract_lines(data: dict[str, list]) -> list[tuple]:
+    """
+    Agrupa as palavras de pytesseract.image_to_data (DICT) por linha, no formato
+    do EasyOCR: caixa unindo as palavras, texto separado por espaços e confiança
+    média (0-1). Segmentos por linha, como os do EasyOCR, mantêm o texto
+    da página e a camada invisível do save_ocr_layer iguais entre backends.
+    """
+    lines: dict[tuple[int, int, int], list[int]] = {}
+    for i, word in enumerate(data["text"]):
+        if not str(word).strip() or float(data["conf"][i]) < 0:
+            continue
+        key = (int(data["block_num"][i]), int(data["par_num"][i]), int(data["line_num"][i]))
+        lines.setdefault(key, []).append(i)
+
+    details = []
+    for words in lines.values():
+        x0 = min(int(data["left"][i]) for i in words)
+        y0 = min(int(data["top"][i]) for i in words)
+        x1 = max(int(data["left"][i]) + int(data["width"][i]) for i in words)
+        y1 = max(int(data["top"][i]) + int(data["height"][i]) for i in words)
+        text = " ".join(str(data["text"][i]).strip() for i in words)
+        conf = sum(float(data["conf"][i]) for i in words) / len(words) / 100
+        details.append(([[x0, y0], [x1, y0], [x1, y1], [x0, y1]], text, conf))
+    return details
+
+
+class _TesseractReader:
+    """Tesseract via pytesseract, com a interface readtext do EasyOCR."""
+
+    def __init__(self, languages: list[str]) -> None:
+        import pytesseract
+
+        self._tesseract = pytesseract
+        self._lang = tesseract_languages(languages)
+        version = pytesseract.get_tesseract_version()  # falha cedo sem o binário
+        logger.info("Tesseract %s carregado (lang=%s)", version, self._lang)
+
+    def readtext(self, image: np.ndarray, detail: int = 1, paragraph: bool = False) -> list:
+        data = self._tesseract.image_to_data(
+            image, lang=self._lang, output_type=self._tesseract.Output.DICT
+        )
+        return tesseract_lines(data)
+
+
+@register_ocr_backend(
+    "tesseract",
+    install_hint="pip install pytesseract && apt install tesseract-ocr tesseract-ocr-por",
+)
+def _tesseract_reader(languages: list[str], use_gpu: bool) -> Any:
+    import pytesseract
+
+    try:
+        return _TesseractReader(languages)
+    except pytesseract.TesseractNotFoundError as exc:  # módulo presente, binário ausente
+        raise ImportError(str(exc)) from exc
+
+
+# "Se a única ferramenta que você tem é um martelo, tudo parece prego." — Abraham Maslow
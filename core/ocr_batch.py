@@ -0,0 +1,328 @@
+import logging
+import time
+from collections import deque
+from collections.abc import Callable, Hashable, Iterable, Iterator
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import fitz
+
+from config.settings import (
+    OCR_AUTO_MIN_QUALITY,
+    OCR_BACKEND,
+    OCR_BATCH_MAX_PAGES,
+    OCR_CPU_WORKERS,
+)
+from core.batch_operations import OperationSpec, ocr_message
+from core.batch_report import FileResult
+from core.ocr_engine import (
+    OCREngine,
+    OCRPageResult,
+    collect_result,
+    get_shared_engine,
+    plan_ocr_regions,
+    select_ocr_pages,
+)
+from core.ocr_regions import OCRUnit, split_unit
+from core.prefetch import PrefetchedFile
+from core.result_cache import ResultCache
+from utils.timing import StageClock, activate_clock
+
+logger = logging.getLogger("pdfforge.ocr.batch")
+
+
+@dataclass
+class OCRJob:
+    """
+    Documento em OCR dentro de um OCRPageBatcher; concluído ao reunir todas as
+    unidades (páginas inteiras ou áreas de imagem do modo "regions").
+    """
+
+    key: Hashable
+    doc: fitz.Document
+    output_path: Path
+    page_count: int
+    pages: list[OCRUnit] = field(default_factory=list)  # unidades enviadas ao OCR
+    results: dict[int, OCRPageResult] = field(default_factory=dict)
+    recognized: int = 0  # unidades já reconhecidas
+    clock: StageClock = field(default_factory=StageClock)
+    busy_s: float = 0.0
+    error: str = ""
+
+    @property
+    def complete(self) -> bool:
+        return bool(self.error) or self.recognized == len(self.pages)
+
+    @property
+    def message(self) -> str:
+        return ocr_message(len(self.results), self.page_count)
+
+
+class OCRPageBatcher:
+    """
+    Agrupa páginas de documentos consecutivos em lotes cheios de inferência.
+
+    Um lote de centenas de PDFs curtos, com um documento por vez, paga um lote
+    de inferência meio vazio no fim de cada arquivo. Aqui as páginas entram em
+    uma fila única e o motor só é chamado com batch_pages páginas (exceto no
+    flush final); cada resultado volta ao documento de origem, que é gravado
+    com a camada de texto quando a última página fica pronta.
+
+    Os documentos ficam abertos até concluírem, e a renderização acontece só no
+    momento da inferência, então a memória é limitada a um lote de imagens. Os
+    documentos concluem na ordem em que foram adicionados. O tempo de cada lote
+    é rateado entre os documentos pelo número de páginas que cada um ocupou.
+
+    Uso típico:
+        batcher = OCRPageBatcher(get_shared_engine())
+        for path in paths:
+            for job in batcher.add(path, fitz.open(path), saida(path)):
+                ...
+        for job in batcher.flush():
+            ...
+    """
+
+    def __init__(self, engine: OCREngine, batch_pages: int = OCR_BATCH_MAX_PAGES) -> None:
+        self._engine = engine
+        self._batch_pages = max(1, batch_pages)
+        self._jobs: deque[OCRJob] = deque()
+        self._queue: deque[tuple[OCRJob, OCRUnit]] = deque()
+
+    @property
+    def pending_pages(self) -> int:
+        return len(self._queue)
+
+    def add(
+        self,
+        key: Hashable,
+        doc: fitz.Document,
+        output_path: Path,
+        clock: StageClock | None = None,
+        pages: list[OCRUnit] | None = None,
+    ) -> list[OCRJob]:
+        """
+        Enfileira as páginas de doc (todas, ou só as unidades de pages: índices
+        ou (índice, área)); devolve os documentos concluídos por isso. Sem
+        páginas a reconhecer, o documento conclui já.
+        """
+        selected: list[OCRUnit] = list(range(doc.page_count)) if pages is None else list(pages)
+        job = OCRJob(key, doc, output_path, doc.page_count, selected, clock=clock or StageClock())
+        self._jobs.append(job)
+        self._queue.extend((job, unit) for unit in selected)
+        while len(self._queue) >= self._batch_pages:
+            self._run_batch()
+        return self._drain()
+
+    def flush(self) -> list[OCRJob]:
+        """Processa as páginas restantes, mesmo em um lote incompleto."""
+        while self._queue:
+            self._run_batch()
+        return self._drain()
+
+    def close(self) -> None:
+        """Fecha os documentos ainda pendentes (interrupção do lote)."""
+        for job in self._jobs:
+            job.doc.close()
+        self._jobs.clear()
+        self._queue.clear()
+
+    def _run_batch(self) -> None:
+        entries = []
+        while self._queue and len(entries) < self._batch_pages:
+            job, unit = self._queue.popleft()
+            if not job.error:  # páginas de um documento que já falhou são descartadas
+                entries.append((job, *split_unit(unit)))
+        if not entries:
+            return
+
+        clock = StageClock()
+        start = time.perf_counter()
+        with activate_clock(clock):
+            try:
+                results: list[OCRPageResult | None] = list(self._recognize(entries))
+            except Exception as exc:
+                results = self._retry_per_job(entries, exc)
+        share = 1.0 / len(entries)
+        elapsed = time.perf_counter() - start
+        for (job, page_num, _clip), result in zip(entries, results):
+            if result is not None:
+                collect_result(job.results, page_num, result)
+                job.recognized += 1
+        for job, *_ in entries:
+            job.busy_s += elapsed * share
+            for name, seconds in clock.stages.items():
+                job.clock.stages[name] = job.clock.stages.get(name, 0.0) + seconds * share
+
+    def _recognize(self, entries: list[tuple[OCRJob, int, fitz.Rect | None]]) -> list:
+        return self._engine.recognize_pages(
+            [job.doc[p] for job, p, _clip in entries],
+            [clip for *_, clip in entries],
+        )
+
+    def _retry_per_job(
+        self, entries: list[tuple[OCRJob, int, fitz.Rect | None]], exc: Exception
+    ) -> list[OCRPageResult | None]:
+        """
+        Um lote misto que falha é repetido documento a documento, para que uma
+        página problemática não derrube os outros arquivos do lote; só os
+        documentos que voltam a falhar ficam com erro (None nas suas posições).
+        """
+        positions: dict[int, list[int]] = {}
+        for i, (job, *_) in enumerate(entries):
+            positions.setdefault(id(job), []).append(i)
+        results: list[OCRPageResult | None] = [None] * len(entries)
+        if len(positions) == 1:
+            logger.error("Falha no lote de OCR: %s", exc)
+            entries[0][0].error = str(exc)
+            return results
+        logger.warning("Falha no lote de OCR (%s); repetindo por documento", exc)
+        for indices in positions.values():
+            job = entries[indices[0]][0]
+            try:
+                retried = self._recognize([entries[i] for i in indices])
+            except Exception as job_exc:
+                logger.error("Falha no OCR de %s: %s", job.output_path.name, job_exc)
+                job.error = str(job_exc)
+                continue
+            for i, result in zip(indices, retried):
+                results[i] = result
+        return results
+
+    def _drain(self) -> list[OCRJob]:
+        done = []
+        while self._jobs and self._jobs[0].complete:
+            job = self._jobs.popleft()
+            if not job.error:
+                start = time.perf_counter()
+                try:
+                    with activate_clock(job.clock):
+                        self._engine.save_ocr_layer(job.doc, job.results, job.output_path)
+                except Exception as exc:
+                    logger.error("Falha ao gravar OCR de %s: %s", job.output_path.name, exc)
+                    job.error = str(exc)
+                job.busy_s += time.perf_counter() - start
+            job.doc.close()
+            done.append(job)
+        return done
+
+
+def iter_batched_ocr(
+    files: Iterable[tuple[int, Path | None, PrefetchedFile | None]],
+    operation: OperationSpec,
+    output_for: Callable[[Path], Path],
+    advance: Callable[[str], None],
+    cache: ResultCache | None = None,
+) -> Iterator[tuple[int, FileResult]]:
+    """
+    Caminho sequencial do BatchProcessor para a operação "ocr": um único motor
+    aquecido para o lote inteiro e páginas de arquivos consecutivos agrupadas
+    pelo OCRPageBatcher. Entrega (índice, FileResult) na ordem de conclusão;
+    um None da fonte (ociosa) esvazia o lote incompleto. No fim, o motor
+    encerra seus processos de OCR em CPU.
+    """
+    params = operation.params
+    engine = get_shared_engine(
+        params.get("languages"),
+        params.get("use_gpu", True),
+        params.get("cpu_workers", OCR_CPU_WORKERS),
+        params.get("backend", OCR_BACKEND),
+    )
+    batcher = OCRPageBatcher(engine, engine.batch_pages)
+    # índice → (caminho, chave do cache, bytes de entrada, segundos antes do batcher)
+    inflight: dict[Hashable, tuple[Path, str | None, int, float]] = {}
+
+    def _finish(job: OCRJob) -> tuple[int, FileResult]:
+        idx: int = job.key  # type: ignore[assignment]
+        pdf_path, cache_key, input_bytes, setup_s = inflight.pop(idx)
+        output_path = job.output_path
+        if not job.error and cache is not None and cache_key is not None:
+            with job.clock.measure("cache"):
+                cache.store(cache_key, output_path, job.message)
+        advance(pdf_path.name)
+        return idx, FileResult(
+            path=pdf_path,
+            success=not job.error,
+            duration_s=setup_s + job.busy_s,
+            message=job.error or job.message,
+            output_path=None if job.error else output_path,
+            stages=job.clock.stages,
+            pages=job.page_count,
+            input_bytes=input_bytes,
+            output_bytes=0 if job.error else output_path.stat().st_size,
+        )
+
+    try:
+        for idx, pdf_path, prefetched in files:
+            if pdf_path is None:
+                # fonte ociosa (pasta monitorada): o lote incompleto não espera mais arquivos
+                for job in batcher.flush():
+                    yield _finish(job)
+                continue
+            output_path = output_for(pdf_path)
+            data = prefetched.data() if prefetched is not None else None
+            if prefetched is not None:
+                prefetched.release()
+            start = time.monotonic()
+            clock = StageClock()
+            doc: fitz.Document | None = None
+            cache_key: str | None = None
+            message: str | None = None
+            input_bytes = 0
+            try:
+                input_bytes = len(data) if data is not None else pdf_path.stat().st_size
+                if cache is not None:
+                    with clock.measure("cache"):
+                        cache_key = cache.make_key(pdf_path, operation.name, params, data=data)
+                        message = cache.lookup(cache_key, output_path)
+                    if message is None:
+                        output_path.unlink(missing_ok=True)
+                if message is None:
+                    with clock.measure("open"):
+                        if data is not None:
+                            doc = fitz.open(stream=data, filetype="pdf")
+                        else:
+                            doc = fitz.open(str(pdf_path))
+            except Exception as exc:
+                logger.error("Falha ao abrir %s: %s", pdf_path.name, exc)
+                message = str(exc)
+            del data
+
+            if doc is None:  # acerto de cache ou falha ao abrir
+                cached = cache_key is not None and message is not None and output_path.exists()
+                advance(pdf_path.name)
+                yield (
+                    idx,
+                    FileResult(
+                        path=pdf_path,
+                        success=cached,
+                        duration_s=time.monotonic() - start,
+                        message=message or "",
+                        output_path=output_path if cached else None,
+                        cached=cached,
+                        stages=clock.stages,
+                        input_bytes=input_bytes,
+                        output_bytes=output_path.stat().st_size if cached else 0,
+                    ),
+                )
+                continue
+            pages: list[OCRUnit] | None = None
+            mode = params.get("mode", "all")
+            min_quality = params.get("min_quality", OCR_AUTO_MIN_QUALITY)
+            if mode == "auto":
+                with activate_clock(clock):
+                    pages = list(select_ocr_pages(doc, min_quality=min_quality))
+            elif mode == "regions":
+                with activate_clock(clock):
+                    pages = plan_ocr_regions(doc, min_quality=min_quality)
+            inflight[idx] = (pdf_path, cache_key, input_bytes, time.monotonic() - start)
+            for job in batcher.add(idx, doc, output_path, clock, pages):
+                yield _finish(job)
+        for job in batcher.flush():
+            yield _finish(job)
+    finally:
+        batcher.close()
+        engine.trim_cache()
+        engine.close()  # processos de OCR em CPU não sobrevivem ao lote
+
+
+# "Muitas mãos tornam leve o trabalho." — John Heywood
@@ -0,0 +1,141 @@
+import hashlib
+import logging
+import os
+import struct
+import zlib
+from collections.abc import Sequence
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import fitz
+
+from config.settings import OCR_CACHE_DIR, OCR_CACHE_MAX_MB
+
+if TYPE_CHECKING:
+    from core.ocr_engine import PixelBuffer
+
+logger = logging.getLogger("pdfforge.ocr.cache")
+
+_MAGIC = b"PFOC"
+_VERSION = 1
+_HEADER = struct.Struct("<4sBI")  # magic, versão, número de itens
+_ITEM = struct.Struct("<9fI")  # 4 vértices (x, y), confiança, bytes do texto
+
+
+def encode_details(details: Sequence[tuple]) -> bytes:
+    """Serializa [(caixa, texto, confiança)] em binário compacto (float32 + UTF-8, zlib)."""
+    parts = [_HEADER.pack(_MAGIC, _VERSION, len(details))]
+    for bbox, text, conf in details:
+        raw = str(text).encode("utf-8")
+        coords = [float(c) for point in bbox for c in point]
+        parts.append(_ITEM.pack(*coords, float(conf), len(raw)))
+        parts.append(raw)
+    return zlib.compress(b"".join(parts), 1)
+
+
+def decode_details(blob: bytes) -> list[tuple]:
+    data = zlib.decompress(blob)
+    magic, version, count = _HEADER.unpack_from(data)
+    if magic != _MAGIC or version != _VERSION:
+        raise ValueError("Formato de cache de OCR desconhecido")
+    offset = _HEADER.size
+    details = []
+    for _ in range(count):
+        *coords, conf, size = _ITEM.unpack_from(data, offset)
+        offset += _ITEM.size
+        text = data[offset : offset + size].decode("utf-8")
+        offset += size
+        bbox = [[coords[i], coords[i + 1]] for i in range(0, 8, 2)]
+        details.append((bbox, text, conf))
+    return details
+
+
+class OCRPageCache:
+    """
+    Cache em disco do OCR por página, endereçado pelo conteúdo rasterizado.
+
+    A chave é o hash BLAKE2 dos pixels da página já rasterizada para o OCR, mais
+    formato, resolução, backend e idiomas: reprocessar o mesmo documento, uma cópia salva
+    de novo ou a mesma página em outro PDF acerta o cache, e só a inferência é
+    evitada (a rasterização é necessária para calcular a chave). Cada entrada é
+    um arquivo com as caixas e textos em formato binário (encode_details). O
+    tamanho total é limitado por max_mb com despejo LRU pelo mtime, como no
+    ResultCache; o diretório só é criado na primeira gravação.
+    """
+
+    def __init__(self, root: Path = OCR_CACHE_DIR, max_mb: float = OCR_CACHE_MAX_MB) -> None:
+        self._root = root
+        self._max_bytes = int(max_mb * 1024 * 1024)
+
+    @property
+    def root(self) -> Path:
+        return self._root
+
+    def make_key(
+        self,
+        pix: "fitz.Pixmap | PixelBuffer",
+        languages: Sequence[str],
+        backend: str = "easyocr",
+    ) -> str:
+        digest = hashlib.blake2b(digest_size=20)
+        digest.update(f"{backend}:{pix.width}x{pix.height}x{pix.n}@{pix.xres}".encode())
+        digest.update(("\0" + ",".join(languages) + "\0").encode())
+        digest.update(pix.samples_mv)
+        return digest.hexdigest()
+
+    def _entry_path(self, key: str) -> Path:
+        return self._root / key[:2] / f"{key}.ocr"
+
+    def get(self, key: str) -> list[tuple] | None:
+        """Caixas e textos da página, ou None se ausente ou ilegível."""
+        path = self._entry_path(key)
+        try:
+            details = decode_details(path.read_bytes())
+            os.utime(path)  # marca como usado recentemente
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, struct.error, zlib.error) as exc:
+            logger.debug("Entrada de cache de OCR descartada %s: %s", key[:12], exc)
+            path.unlink(missing_ok=True)
+            return None
+        return details
+
+    def put(self, key: str, details: Sequence[tuple]) -> None:
+        path = self._entry_path(key)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(f".{os.getpid()}.tmp")
+            tmp.write_bytes(encode_details(details))
+            os.replace(tmp, path)
+        except OSError as exc:
+            logger.warning("Falha ao gravar cache de OCR %s: %s", key[:12], exc)
+
+    def size_bytes(self) -> int:
+        return sum(p.stat().st_size for p in self._root.glob("*/*.ocr"))
+
+    def evict(self) -> int:
+        """Remove as páginas menos usadas até caber no orçamento. Retorna quantas removeu."""
+        entries = []
+        total = 0
+        for path in self._root.glob("*/*.ocr"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+            total += stat.st_size
+
+        removed = 0
+        for _used_at, size, path in sorted(entries):
+            if total <= self._max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+            removed += 1
+
+        if removed:
+            logger.info("Cache de OCR: %d páginas despejadas (LRU)", removed)
+        return removed
+
+
+# "Não há nada novo debaixo do sol." — Eclesiastes
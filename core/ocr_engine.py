@@ -1,20 +1,121 @@
+import atexit
 import logging
-from collections.abc import Callable
+import math
+import queue
+import threading
+from collections.abc import Callable, Iterator
+from contextlib import closing
 from dataclasses import dataclass, field
+from functools import partial
 from pathlib import Path
 
 import fitz
+import numpy as np
 
-from config.settings import OCR_BATCH_MAX_PAGES, OCR_IMAGE_SCALE
+from config.settings import (
+    OCR_ADAPTIVE_SCALE,
+    OCR_AUTO_MIN_QUALITY,
+    OCR_BACKEND,
+    OCR_BATCH_MAX_PAGES,
+    OCR_CACHE_ENABLED,
+    OCR_CPU_WORKERS,
+    OCR_IMAGE_SCALE,
+    OCR_PAD_MAX_WASTE,
+    OCR_PAGE_MAX_MEGAPIXELS,
+    OCR_RECOGNIZER_BATCH,
+    OCR_RENDER_AHEAD_PAGES,
+    OCR_RENDER_GRAY,
+    OCR_SCALE_MAX,
+    OCR_SCALE_MIN,
+    OCR_SCALE_MIN_COMPONENTS,
+    OCR_SCALE_PROBE,
+    OCR_SCALE_PROBE_MAX_MEGAPIXELS,
+    OCR_TARGET_XHEIGHT_PX,
+    OCR_TEXT_MIN_CHARS,
+)
+from core.ocr_backends import create_reader, get_backend
+from core.ocr_cache import OCRPageCache
+from core.ocr_layer import insert_text_layer
+from core.ocr_pool import OCRProcessPool, cpu_ocr_workers
+from core.ocr_regions import OCRUnit, image_regions, split_unit
 from utils.gpu_utils import GPUMonitor
+from utils.timing import StageClock, activate_clock, add_stages, stage
+
+try:
+    import cv2
+
+    CV2_AVAILABLE = True
+except ImportError:
+    CV2_AVAILABLE = False
 
 logger = logging.getLogger("pdfforge.ocr")
 
+OCR_MODES = ("all", "auto", "regions")
+
+_RENDER_DONE = object()  # fim da fila de páginas rasterizadas
+_RENDER_POLL_S = 0.1
+_SCALE_STEP = 0.25  # escalas em múltiplos de 18 dpi
+
+# Pontuação comum em texto corrido; conta como caractere legível
+_TEXT_PUNCTUATION = frozenset(".,;:!?()[]{}\"'-–—/\\%$&@#*+=<>ºª°§€£_|~^`´¨…“”‘’«»•")
+
+
+@dataclass(frozen=True)
+class PixelBuffer:
+    """
+    Cópia de um fitz.Pixmap em memória própria, com os atributos que o OCR lê
+    (formato, dpi, origem do recorte). Não referencia nada do MuPDF, então uma
+    thread pode usá-la enquanto outra renderiza; pixmap_view, pixmap_scale e
+    OCRPageCache.make_key a aceitam no lugar do pixmap.
+    """
+
+    samples_mv: memoryview
+    width: int
+    height: int
+    n: int
+    stride: int
+    xres: int
+    x: int = 0
+    y: int = 0
+
+    @classmethod
+    def from_pixmap(cls, pix: fitz.Pixmap) -> "PixelBuffer":
+        samples = memoryview(bytearray(pix.samples_mv))  # a única cópia dos pixels
+        return cls(samples, pix.width, pix.height, pix.n, pix.stride, pix.xres, pix.x, pix.y)
+
+
+# Imagem de uma unidade de OCR: o pixmap, ou a cópia dele vinda da thread de render
+OCRImage = fitz.Pixmap | PixelBuffer
+
 
 @dataclass
 class OCRPageResult:
     text: str
     details: list[tuple] = field(default_factory=list)
+    scale: float = OCR_IMAGE_SCALE  # escala da rasterização: as caixas estão nesses pixels
+
+    @classmethod
+    def from_details(cls, details: list[tuple], scale: float = OCR_IMAGE_SCALE) -> "OCRPageResult":
+        text = "\n".join(item[1] for item in details)
+        return cls(text=text, details=list(details), scale=scale)
+
+    def shifted(self, dx: float, dy: float) -> "OCRPageResult":
+        """Caixas deslocadas (dx, dy) pixels: de um recorte para a página inteira."""
+        if not dx and not dy:
+            return self
+        details = [
+            ([[x + dx, y + dy] for x, y in bbox], text, conf) for bbox, text, conf in self.details
+        ]
+        return OCRPageResult(self.text, details, self.scale)
+
+    def merged(self, other: "OCRPageResult") -> "OCRPageResult":
+        """Soma outro recorte da mesma página, com as caixas dele levadas a self.scale."""
+        factor = self.scale / other.scale
+        details = self.details + [
+            ([[x * factor, y * factor] for x, y in bbox], text, conf)
+            for bbox, text, conf in other.details
+        ]
+        return OCRPageResult.from_details(details, self.scale)
 
     def strip(self) -> str:
         return self.text.strip()
@@ -23,50 +124,301 @@ class OCRPageResult:
         return self.text
 
 
+def text_quality(text: str) -> float:
+    """
+    Fração dos caracteres visíveis que são letras, dígitos ou pontuação comum.
+    Camadas de texto quebradas (fonte sem ToUnicode, OCR antigo ruim) aparecem
+    como U+FFFD, símbolos da área privada ou glifos soltos e puxam a nota para baixo.
+    """
+    visible = [ch for ch in text if not ch.isspace()]
+    if not visible:
+        return 0.0
+    legible = sum(1 for ch in visible if ch.isalnum() or ch in _TEXT_PUNCTUATION)
+    return legible / len(visible)
+
+
+def needs_ocr(page: fitz.Page, min_quality: float = OCR_AUTO_MIN_QUALITY) -> bool:
+    """
+    Classificador rápido, no mesmo critério de PDFReader._inspect_page: página
+    com menos de OCR_TEXT_MIN_CHARS caracteres é tratada como imagem e precisa
+    de OCR. Página com texto só precisa se a camada existente for ilegível
+    (text_quality abaixo de min_quality; 0 desativa essa verificação).
+    """
+    text = page.get_text().strip()
+    if len(text) < OCR_TEXT_MIN_CHARS:
+        return True
+    return text_quality(text) < min_quality
+
+
+def select_ocr_pages(
+    doc: fitz.Document,
+    page_indices: list[int] | None = None,
+    min_quality: float = OCR_AUTO_MIN_QUALITY,
+) -> list[int]:
+    """Índices (na ordem recebida) das páginas que precisam de OCR."""
+    indices = page_indices if page_indices is not None else range(doc.page_count)
+    with stage("classify"):
+        return [i for i in indices if needs_ocr(doc[i], min_quality)]
+
+
+def plan_ocr_regions(
+    doc: fitz.Document,
+    page_indices: list[int] | None = None,
+    min_quality: float = OCR_AUTO_MIN_QUALITY,
+) -> list[OCRUnit]:
+    """
+    Unidades do modo "regions": a página inteira se ela precisa de OCR
+    (needs_ocr) e, nas páginas com texto legível, (índice, área) para cada
+    imagem de image_regions, como um carimbo ou uma tabela colada num
+    formulário. Páginas com texto e sem imagens ficam de fora.
+    """
+    indices = page_indices if page_indices is not None else range(doc.page_count)
+    units: list[OCRUnit] = []
+    full = 0
+    with stage("classify"):
+        for idx in indices:
+            page = doc[idx]
+            if needs_ocr(page, min_quality):
+                units.append(idx)
+                full += 1
+            else:
+                units.extend((idx, rect) for rect in image_regions(page))
+    logger.info(
+        "OCR por regiões: %d páginas inteiras e %d áreas de imagem",
+        full,
+        len(units) - full,
+    )
+    return units
+
+
+def text_height_px(gray: np.ndarray) -> float | None:
+    """
+    Altura mediana, em pixels, dos componentes conexos com cara de caractere
+    (binarização de Otsu, vizinhança 8). Como a maioria das letras de texto
+    corrido não tem haste, a mediana fica na altura-x. None com menos de
+    OCR_SCALE_MIN_COMPONENTS componentes (página em branco, foto) ou sem OpenCV.
+    """
+    if not CV2_AVAILABLE:
+        return None
+    _, binary = cv2.threshold(
+        np.ascontiguousarray(gray), 0, 255, cv2.THRESH_BINARY_INV | cv2.THRESH_OTSU
+    )
+    _count, _labels, stats, _centroids = cv2.connectedComponentsWithStats(binary, connectivity=8)
+    heights = stats[1:, cv2.CC_STAT_HEIGHT]
+    widths = stats[1:, cv2.CC_STAT_WIDTH]
+    text_like = (
+        (heights >= 2)
+        & (stats[1:, cv2.CC_STAT_AREA] >= 3)
+        & (heights <= gray.shape[0] // 3)  # figuras e molduras
+        & (widths <= heights * 10)  # fios e sublinhados
+        & (heights <= widths * 10)
+    )
+    heights = heights[text_like]
+    if heights.size < OCR_SCALE_MIN_COMPONENTS:
+        return None
+    return float(np.median(heights))
+
+
+def choose_scale(xheight_pt: float | None, width_pt: float, height_pt: float) -> float:
+    """
+    Escala que leva a altura-x medida (em pontos) a OCR_TARGET_XHEIGHT_PX, entre
+    OCR_SCALE_MIN e OCR_SCALE_MAX, em passos de 0.25: páginas parecidas caem na
+    mesma escala, no mesmo formato de lote e na mesma chave de cache. Sem medida,
+    OCR_IMAGE_SCALE. O resultado nunca passa de OCR_PAGE_MAX_MEGAPIXELS na página.
+    """
+    if xheight_pt is None:
+        scale = OCR_IMAGE_SCALE
+    else:
+        scale = min(OCR_SCALE_MAX, max(OCR_SCALE_MIN, OCR_TARGET_XHEIGHT_PX / xheight_pt))
+        scale = round(scale / _SCALE_STEP) * _SCALE_STEP
+    budget = math.sqrt(OCR_PAGE_MAX_MEGAPIXELS * 1e6 / max(1.0, width_pt * height_pt))
+    if scale > budget:
+        scale = max(_SCALE_STEP, math.floor(budget / _SCALE_STEP) * _SCALE_STEP)
+    return scale
+
+
+def page_scale(page: fitz.Page, clip: fitz.Rect | None = None) -> float:
+    """
+    Pré-passada barata: render em cinza a OCR_SCALE_PROBE (menos em páginas
+    acima de OCR_SCALE_PROBE_MAX_MEGAPIXELS), text_height_px e choose_scale.
+    Com clip, mede e dimensiona só essa área da página.
+    """
+    rect = page.rect if clip is None else fitz.Rect(clip)
+    area = max(1.0, rect.width * rect.height)
+    probe_scale = min(OCR_SCALE_PROBE, math.sqrt(OCR_SCALE_PROBE_MAX_MEGAPIXELS * 1e6 / area))
+    with stage("scale"):
+        probe = page.get_pixmap(
+            dpi=max(1, round(72 * probe_scale)), colorspace=fitz.csGRAY, alpha=False, clip=clip
+        )
+        height_px = text_height_px(pixmap_view(probe))
+    xheight_pt = None if height_px is None else height_px * 72 / probe.xres
+    scale = choose_scale(xheight_pt, rect.width, rect.height)
+    logger.debug("Página %d: altura-x %s pt, escala %.2f", page.number, xheight_pt, scale)
+    return scale
+
+
+def pixmap_scale(pix: OCRImage) -> float:
+    """Escala em que o pixmap foi rasterizado (OCREngine._render grava o dpi nele)."""
+    return pix.xres / 72
+
+
 class OCREngine:
     """
-    Motor OCR baseado em EasyOCR com suporte a CUDA.
+    Motor OCR com backend plugável (core/ocr_backends.py): EasyOCR, com suporte
+    a CUDA, ou Tesseract, mais leve em CPU. Todos devolvem OCRPageResult.
 
     Carregamento do modelo é lazy (primeira chamada a recognize()).
     Fallback automático para CPU se CUDA indisponível ou VRAM insuficiente.
+    Com cache (OCRPageCache), páginas já reconhecidas antes não voltam ao modelo.
+    Com adaptive_scale, cada página é rasterizada na escala de page_scale, que
+    fica registrada no OCRPageResult para save_ocr_layer. Sem CUDA e com
+    cpu_workers > 1 (0 = automático), o reconhecimento vai para um
+    OCRProcessPool; close() encerra os processos.
     """
 
     def __init__(
         self,
         languages: list[str] | None = None,
         use_gpu: bool = True,
+        cache: OCRPageCache | None = None,
+        adaptive_scale: bool = OCR_ADAPTIVE_SCALE,
+        cpu_workers: int = OCR_CPU_WORKERS,
+        backend: str = OCR_BACKEND,
     ) -> None:
         self._languages = languages or ["pt", "en"]
+        self._backend = get_backend(backend)
         self._gpu_monitor = GPUMonitor()
-        self._use_gpu = use_gpu and self._gpu_monitor.cuda_available
+        self._use_gpu = use_gpu and self._backend.supports_gpu and self._gpu_monitor.cuda_available
         self._reader = None  # lazy init
+        self._pad_buffer: np.ndarray | None = None  # reaproveitado entre lotes
+        self._cache = cache
+        self._adaptive_scale = adaptive_scale
+        self._cache_stored = 0  # gravações desde o último despejo
+        self._cpu_workers = 1 if self._use_gpu else cpu_ocr_workers(cpu_workers)
+        self._cpu_pool: OCRProcessPool | None = None  # lazy init
         logger.info(
-            "OCREngine configurado: langs=%s gpu=%s",
+            "OCREngine configurado: backend=%s langs=%s gpu=%s processos_cpu=%d",
+            self._backend.name,
             self._languages,
             self._use_gpu,
+            self._cpu_workers,
         )
 
+    @property
+    def batch_pages(self) -> int:
+        """Páginas por chamada de reconhecimento: OCR_BATCH_MAX_PAGES por processo."""
+        return OCR_BATCH_MAX_PAGES * self._cpu_workers
+
+    def _get_cpu_pool(self) -> OCRProcessPool | None:
+        if self._cpu_pool is None and not self._use_gpu and self._cpu_workers > 1:
+            factory = partial(create_reader, self._backend.name)
+            self._cpu_pool = OCRProcessPool(self._languages, self._cpu_workers, factory)
+        return self._cpu_pool
+
+    def close(self) -> None:
+        """Encerra os processos do OCR em CPU, se houver."""
+        if self._cpu_pool is not None:
+            self._cpu_pool.close()
+            self._cpu_pool = None
+
     def _get_reader(self):
         if self._reader is None:
-            try:
-                import easyocr
-
+            if self._use_gpu:
                 stats = self._gpu_monitor.get_stats()
-                if self._use_gpu and stats.vram_free_mb < 1500:
+                if stats.vram_free_mb < 1500:
                     logger.warning(
                         "VRAM livre insuficiente (%.0f MB) — forçando CPU",
                         stats.vram_free_mb,
                     )
                     self._use_gpu = False
-                self._reader = easyocr.Reader(
-                    self._languages,
-                    gpu=self._use_gpu,
-                )
-                logger.info("EasyOCR carregado (gpu=%s)", self._use_gpu)
-            except ImportError:
-                raise RuntimeError("EasyOCR não instalado. Execute: pip install easyocr")
+            self._reader = create_reader(self._backend.name, self._languages, self._use_gpu)
+            logger.info("%s carregado (gpu=%s)", self._backend.name, self._use_gpu)
         return self._reader
 
+    def _render(self, page: fitz.Page, clip: fitz.Rect | None = None) -> fitz.Pixmap:
+        """
+        Rasteriza a página, ou só a área clip. O pixmap de um recorte guarda a
+        origem (pix.x, pix.y) em pixels da página inteira na mesma escala.
+        """
+        scale = page_scale(page, clip) if self._adaptive_scale else OCR_IMAGE_SCALE
+        colorspace = fitz.csGRAY if OCR_RENDER_GRAY else fitz.csRGB
+        with stage("render"):
+            # por dpi, e não por matriz, para a escala ficar gravada no pixmap
+            return page.get_pixmap(
+                dpi=round(72 * scale), colorspace=colorspace, alpha=False, clip=clip
+            )
+
+    def _render_unit(self, doc: fitz.Document, unit: OCRUnit) -> tuple[int, fitz.Pixmap]:
+        page_num, clip = split_unit(unit)
+        if clip is None:
+            return page_num, self._render(doc[page_num])
+        return page_num, self._render(doc[page_num], clip)
+
+    def _recognize_batch(
+        self, images: list[np.ndarray], page_numbers: list[int], scales: list[float]
+    ) -> list[OCRPageResult]:
+        """
+        Uma passada do detector e do reconhecedor para todas as imagens via
+        readtext_batched. O EasyOCR exige imagens do mesmo formato no lote: as
+        menores são completadas com branco à direita e embaixo (pad_images), o que
+        mantém as caixas detectadas nas coordenadas originais de cada página.
+        Para o preenchimento não anular a economia dos recortes do modo
+        "regions", as imagens são antes separadas por tamanho (shape_groups):
+        um carimbo não é completado até o formato de uma página inteira.
+        Com o pool de CPU, cada imagem vai inteira para um dos processos.
+        """
+        pool = self._get_cpu_pool()
+        reader = self._get_reader() if pool is None else None
+        batched = getattr(reader, "readtext_batched", None)
+        with stage("recognize"):
+            if pool is not None:
+                detailed_pages = pool.recognize(images)
+            elif batched is None or len(images) == 1:
+                detailed_pages = [
+                    reader.readtext(img, detail=1, paragraph=False)  # type: ignore[union-attr]
+                    for img in images
+                ]
+            else:
+                detailed_pages = [[]] * len(images)
+                for group in shape_groups(images):
+                    found = self._readtext_padded(reader, [images[i] for i in group])
+                    for i, detailed in zip(group, found):
+                        detailed_pages[i] = detailed
+        results = []
+        for page_number, scale, detailed in zip(page_numbers, scales, detailed_pages):
+            result = OCRPageResult.from_details(detailed, scale)
+            logger.debug("Página %d: %d chars extraídos via OCR", page_number, len(result.text))
+            results.append(result)
+        return results
+
+    def _readtext_padded(self, reader, images: list[np.ndarray]) -> list:
+        """Um grupo de shape_groups: readtext se for uma imagem, senão um lote completado."""
+        if len(images) == 1:
+            return [reader.readtext(images[0], detail=1, paragraph=False)]
+        padded = pad_images(images, out=self._pad_buffer)
+        if padded[0] is not images[0]:  # houve preenchimento: guarda o buffer
+            self._pad_buffer = padded[0].base
+        return reader.readtext_batched(
+            padded, detail=1, paragraph=False, batch_size=OCR_RECOGNIZER_BATCH
+        )
+
+    def _lookup(self, pix: OCRImage) -> tuple[str | None, OCRPageResult | None]:
+        """(chave, resultado em cache ou None); sem cache, (None, None)."""
+        if self._cache is None:
+            return None, None
+        with stage("cache"):
+            key = self._cache.make_key(pix, self._languages, self._backend.name)
+            details = self._cache.get(key)
+        if details is None:
+            return key, None
+        return key, OCRPageResult.from_details(details, pixmap_scale(pix))
+
+    def trim_cache(self) -> None:
+        """Aplica o limite de tamanho do cache se houve gravações desde a última vez."""
+        if self._cache is not None and self._cache_stored:
+            self._cache.evict()
+            self._cache_stored = 0
+
     def recognize_page(
         self,
         page: fitz.Page,
@@ -76,46 +428,203 @@ class OCREngine:
         Executa OCR em uma página do PDF.
         Retorna OCRPageResult com texto e bounding boxes detalhados.
         """
-        mat = fitz.Matrix(OCR_IMAGE_SCALE, OCR_IMAGE_SCALE)
-        pix = page.get_pixmap(matrix=mat, alpha=False)
-        img_bytes = pix.tobytes("png")
-
+        pix = self._render(page)
         if on_progress:
             on_progress(f"Processando página {page.number + 1}...")
+        return self._recognize_batch([pixmap_view(pix)], [page.number], [pixmap_scale(pix)])[0]
+
+    def recognize_pages(
+        self, pages: list[fitz.Page], clips: list[fitz.Rect | None] | None = None
+    ) -> list[OCRPageResult]:
+        """
+        Executa OCR em um lote de páginas, que podem vir de documentos diferentes,
+        com uma única inferência em lote. O cache da GPU é liberado uma vez por
+        lote, não por página. Páginas presentes no cache de OCR não vão ao modelo.
+        Com clips, cada página é reconhecida só na área indicada (None = inteira),
+        com as caixas já nas coordenadas da página inteira.
+        """
+        results: list[OCRPageResult | None] = []
+        misses: list[tuple[int, fitz.Pixmap, str | None]] = []
+        pixmaps = []
+        for page, clip in zip(pages, clips or [None] * len(pages)):
+            pix = self._render(page) if clip is None else self._render(page, clip)
+            pixmaps.append(pix)
+            key, hit = self._lookup(pix)
+            if hit is None:
+                misses.append((len(results), pix, key))
+            results.append(hit)
+        if misses:
+            recognized = self._recognize_pixmaps(
+                [pix for _slot, pix, _key in misses],
+                [pages[slot].number for slot, _pix, _key in misses],
+                [key for _slot, _pix, key in misses],
+            )
+            for (slot, _pix, _key), result in zip(misses, recognized):
+                results[slot] = result
+        return [
+            result.shifted(pix.x, pix.y)  # type: ignore[union-attr]
+            for result, pix in zip(results, pixmaps)
+        ]
+
+    def _recognize_pixmaps(
+        self,
+        pixmaps: list[OCRImage],
+        page_numbers: list[int],
+        cache_keys: list[str | None] | None = None,
+    ) -> list[OCRPageResult]:
+        # os pixmaps ficam referenciados até o fim: as matrizes são views dos buffers
+        images = [pixmap_view(pix) for pix in pixmaps]
+        results = self._recognize_batch(images, page_numbers, [pixmap_scale(p) for p in pixmaps])
+        del images
+        self._gpu_monitor.clear_cache()
+        if self._cache is not None and cache_keys:
+            with stage("cache"):
+                for key, result in zip(cache_keys, results):
+                    if key is not None:
+                        self._cache.put(key, result.details)
+                        self._cache_stored += 1
+        return results
 
-        reader = self._get_reader()
-        detailed = reader.readtext(img_bytes, detail=1, paragraph=False)
-        text = "\n".join(item[1] for item in detailed)
-        logger.debug("Página %d: %d chars extraídos via OCR", page.number, len(text))
-        return OCRPageResult(text=text, details=detailed)
+    def _render_ahead(
+        self, doc: fitz.Document, indices: list[OCRUnit], depth: int
+    ) -> Iterator[tuple[int, OCRImage]]:
+        """
+        Rasteriza as páginas (ou as áreas das unidades (índice, área)) em uma
+        thread produtora, até depth à frente do consumo, numa fila limitada. A
+        inferência (torch) libera o GIL, então o MuPDF renderiza a próxima
+        página enquanto o motor reconhece a atual.
+
+        O PyMuPDF não é thread-safe: só a produtora chama o MuPDF enquanto o
+        gerador está ativo. Ela entrega PixelBuffer (pixels copiados para
+        memória própria, dpi e origem do recorte), nunca o pixmap, e o
+        consumidor não pode tocar em doc, páginas ou pixmaps até o gerador
+        terminar. O tempo de render é medido em um relógio próprio (StageClock
+        não é thread-safe) e somado ao relógio ativo no fim. Com depth <= 0 tudo
+        roda na thread do chamador, que recebe os próprios pixmaps.
+        """
+        if depth <= 0 or len(indices) <= 1:
+            for unit in indices:
+                yield self._render_unit(doc, unit)
+            return
+
+        ready: queue.Queue = queue.Queue(maxsize=depth)
+        stop = threading.Event()
+        clock = StageClock()
+
+        def _put(item: object) -> bool:
+            while not stop.is_set():
+                try:
+                    ready.put(item, timeout=_RENDER_POLL_S)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def _produce() -> None:
+            try:
+                with activate_clock(clock):
+                    for unit in indices:
+                        page_num, pix = self._render_unit(doc, unit)
+                        buffer = PixelBuffer.from_pixmap(pix)
+                        del pix
+                        if not _put((page_num, buffer)):
+                            return
+            except Exception as exc:
+                _put(exc)
+                return
+            _put(_RENDER_DONE)
+
+        producer = threading.Thread(target=_produce, name="pdfforge-ocr-render", daemon=True)
+        producer.start()
+        try:
+            while True:
+                item = ready.get()
+                if item is _RENDER_DONE:
+                    return
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            stop.set()
+            producer.join()
+            add_stages(clock.stages)
 
     def recognize_document(
         self,
         doc: fitz.Document,
         page_indices: list[int] | None = None,
         on_progress: Callable[[int, int, str], None] | None = None,
+        batch_pages: int = OCR_BATCH_MAX_PAGES,
+        mode: str = "all",
+        min_quality: float = OCR_AUTO_MIN_QUALITY,
+        render_ahead: int = OCR_RENDER_AHEAD_PAGES,
     ) -> dict[int, OCRPageResult]:
         """
-        Executa OCR nas páginas indicadas (ou em todas se None).
-        Respeita o limite de páginas simultâneas para RTX 3050.
+        Executa OCR nas páginas indicadas (ou em todas se None), batch_pages
+        páginas por inferência. O padrão respeita o limite de VRAM da RTX 3050.
+        No OCR em CPU com vários processos, são batch_pages por processo.
+        As páginas são rasterizadas até render_ahead à frente, em paralelo com o
+        reconhecimento (_render_ahead; 0 rasteriza em sequência). Com cache, só as
+        páginas ausentes dele formam os lotes de inferência.
+
+        mode="auto" reconhece só as páginas que precisam (select_ocr_pages): as
+        que não têm camada de texto e as que têm uma camada ilegível, abaixo de
+        min_quality. As demais ficam como estão e não entram no resultado.
+
+        mode="regions" faz o mesmo, mas nas páginas com texto legível reconhece
+        as áreas das imagens (plan_ocr_regions), rasterizadas só no recorte: um
+        carimbo ou tabela escaneada colada num formulário. A camada de texto
+        nativa não é tocada; as caixas de todos os recortes de uma página voltam
+        às coordenadas dela, num único OCRPageResult.
 
         Retorna {page_num: OCRPageResult}.
         """
-        indices = page_indices if page_indices is not None else list(range(len(doc)))
+        if mode not in OCR_MODES:
+            raise ValueError(f"Modo de OCR inválido: '{mode}'. Use: {list(OCR_MODES)}")
+        pages = page_indices if page_indices is not None else list(range(len(doc)))
+        indices: list[OCRUnit] = list(pages)
+        if mode == "regions":
+            indices = plan_ocr_regions(doc, pages, min_quality)
+        elif mode == "auto":
+            selected = select_ocr_pages(doc, pages, min_quality)
+            logger.info(
+                "OCR automático: %d de %d páginas precisam de OCR",
+                len(selected),
+                len(pages),
+            )
+            indices = list(selected)
         results: dict[int, OCRPageResult] = {}
 
         total = len(indices)
-        for batch_start in range(0, total, OCR_BATCH_MAX_PAGES):
-            batch = indices[batch_start : batch_start + OCR_BATCH_MAX_PAGES]
-            for idx, page_num in enumerate(batch):
-                global_idx = batch_start + idx
+        step = max(1, batch_pages) * self._cpu_workers
+        done = 0
+        hits = 0
+        batch: list[tuple[int, OCRImage, str | None]] = []
+        page_count = len(doc)  # depois daqui, só a thread produtora acessa doc
+        with closing(self._render_ahead(doc, indices, render_ahead)) as rendered:
+            for page_num, pix in rendered:
+                key, hit = self._lookup(pix)
+                if hit is not None:
+                    collect_result(results, page_num, hit.shifted(pix.x, pix.y))
+                    hits += 1
+                else:
+                    batch.append((page_num, pix, key))
+                if not batch or (len(batch) < step and done + hits + len(batch) < total):
+                    continue
+                page_nums = [num for num, _pix, _key in batch]
+                done += len(batch)
                 if on_progress:
-                    on_progress(global_idx + 1, total, f"OCR página {page_num + 1}/{len(doc)}")
-
-                page = doc[page_num]
-                results[page_num] = self.recognize_page(page)
-                self._gpu_monitor.clear_cache()
+                    on_progress(done + hits, total, f"OCR página {page_nums[-1] + 1}/{page_count}")
+                recognized = self._recognize_pixmaps(
+                    [pix for _num, pix, _key in batch], page_nums, [key for *_, key in batch]
+                )
+                for (num, img, _key), result in zip(batch, recognized):
+                    collect_result(results, num, result.shifted(img.x, img.y))
+                batch = []
 
+        if hits:
+            logger.info("Cache de OCR: %d de %d páginas reaproveitadas", hits, total)
+        self.trim_cache()
         logger.info("OCR concluído: %d páginas processadas", len(results))
         return results
 
@@ -128,27 +637,136 @@ class OCREngine:
         """
         Insere texto OCR como camada invisível posicionada sobre as coordenadas
         reais de cada palavra detectada. Permite busca e seleção de texto em
-        PDFs escaneados com posicionamento preciso.
+        PDFs escaneados com posicionamento preciso. As caixas voltam a pontos
+        pela escala em que cada página foi rasterizada. Cada página recebe um
+        único content stream em modo de renderização 3 (insert_text_layer).
         """
-        scale = OCR_IMAGE_SCALE
-
-        for page_num, page_result in ocr_results.items():
-            page = doc[page_num]
-            for bbox, text, _conf in page_result.details:
-                x0 = min(p[0] for p in bbox) / scale
-                y0 = min(p[1] for p in bbox) / scale
-                y1 = max(p[1] for p in bbox) / scale
-                fontsize = max(1.0, (y1 - y0) * 0.8)
-                page.insert_text(
-                    fitz.Point(x0, y1),
-                    text,
-                    fontsize=fontsize,
-                    color=(1, 1, 1),
-                    overlay=True,
-                )
+        with stage("layer"):
+            for page_num, page_result in ocr_results.items():
+                insert_text_layer(doc[page_num], page_result.details, page_result.scale)
 
-        doc.save(str(output_path), garbage=4, deflate=True)
+        with stage("save"):
+            doc.save(str(output_path), garbage=4, deflate=True)
         logger.info("Camada OCR salva em: %s", output_path.name)
 
 
+def collect_result(results: dict[int, OCRPageResult], page_num: int, result: OCRPageResult) -> None:
+    """Guarda result em results[page_num], somando aos recortes já reconhecidos da página."""
+    current = results.get(page_num)
+    results[page_num] = result if current is None else current.merged(result)
+
+
+def pixmap_view(pix: OCRImage) -> np.ndarray:
+    """
+    Matriz NumPy sobre o buffer do pixmap, sem cópia: (altura, largura) em tons
+    de cinza ou (altura, largura, canais). Só é válida enquanto pix existir, pois
+    o PyMuPDF libera a memória junto com o pixmap.
+    """
+    rows = np.frombuffer(pix.samples_mv, dtype=np.uint8).reshape(pix.height, pix.stride)
+    if pix.stride != pix.width * pix.n:
+        rows = rows[:, : pix.width * pix.n]
+    if pix.n == 1:
+        return rows
+    return rows.reshape(pix.height, pix.width, pix.n)
+
+
+def _batch_shape(images: list[np.ndarray]) -> tuple[int, ...]:
+    height = max(img.shape[0] for img in images)
+    width = max(img.shape[1] for img in images)
+    return (len(images), height, width, *images[0].shape[2:])
+
+
+def shape_groups(images: list[np.ndarray], max_waste: float = OCR_PAD_MAX_WASTE) -> list[list[int]]:
+    """
+    Índices de images em grupos de tamanho parecido, das maiores às menores: uma
+    imagem só entra no grupo se, completada ao formato dele, ao menos
+    1 - max_waste dos pixels forem dela. Páginas inteiras e recortes pequenos
+    caem em grupos diferentes.
+    """
+    order = sorted(range(len(images)), key=lambda i: -images[i].shape[0] * images[i].shape[1])
+    groups: list[list[int]] = []
+    height = width = 0
+    for i in order:
+        h, w = images[i].shape[:2]
+        if groups and h * w >= (1 - max_waste) * max(height, h) * max(width, w):
+            groups[-1].append(i)
+            height, width = max(height, h), max(width, w)
+        else:
+            groups.append([i])
+            height, width = h, w
+    return groups
+
+
+def pad_images(
+    images: list[np.ndarray], fill: int = 255, out: np.ndarray | None = None
+) -> list[np.ndarray]:
+    """
+    Completa as imagens com fill à direita e embaixo até o maior formato do lote.
+    Se todas já têm o mesmo formato, devolve as próprias matrizes. Caso contrário
+    escreve em out (n, altura, largura[, canais]) quando o formato confere, ou em
+    um buffer novo, e devolve as fatias dele: o chamador pode guardar o buffer
+    (fatia.base) e reaproveitá-lo no próximo lote do mesmo formato.
+    """
+    shape = _batch_shape(images)
+    if all(img.shape == shape[1:] for img in images):
+        return list(images)
+    buffer = out if out is not None and out.shape == shape else np.empty(shape, np.uint8)
+    padded = []
+    for slot, img in zip(buffer, images):
+        slot[: img.shape[0], : img.shape[1]] = img
+        slot[img.shape[0] :, :] = fill
+        slot[: img.shape[0], img.shape[1] :] = fill
+        padded.append(slot)
+    return padded
+
+
+_SHARED_ENGINES: dict[tuple[tuple[str, ...], bool, int, str], OCREngine] = {}
+_SHARED_LOCK = threading.Lock()
+
+
+def get_shared_engine(
+    languages: list[str] | None = None,
+    use_gpu: bool = True,
+    cpu_workers: int = OCR_CPU_WORKERS,
+    backend: str = OCR_BACKEND,
+) -> OCREngine:
+    """
+    Motor OCR único no processo para cada combinação de idiomas, GPU, processos
+    de CPU e backend.
+
+    O modelo do EasyOCR leva segundos para carregar; com o motor compartilhado ele
+    é carregado uma vez e reaproveitado por todos os arquivos do lote (e por todas
+    as tarefas de um mesmo worker do pool). Usa o cache de OCR em disco se
+    OCR_CACHE_ENABLED. Os processos de OCR em CPU do motor são encerrados por
+    close() ao fim de cada lote (e recriados no próximo uso); close_shared_engines
+    descarta todos os motores, no fim de um comando ou na saída do processo.
+    """
+    key = (tuple(languages or ["pt", "en"]), use_gpu, cpu_workers, backend)
+    with _SHARED_LOCK:
+        engine = _SHARED_ENGINES.get(key)
+        if engine is None:
+            cache = OCRPageCache() if OCR_CACHE_ENABLED else None
+            engine = OCREngine(
+                languages=list(key[0]),
+                use_gpu=use_gpu,
+                cache=cache,
+                cpu_workers=cpu_workers,
+                backend=backend,
+            )
+            _SHARED_ENGINES[key] = engine
+        return engine
+
+
+def close_shared_engines() -> None:
+    """Encerra os processos de OCR dos motores compartilhados e os descarta."""
+    with _SHARED_LOCK:
+        engines = list(_SHARED_ENGINES.values())
+        _SHARED_ENGINES.clear()
+    for engine in engines:
+        engine.close()
+
+
+atexit.register(close_shared_engines)
+
+
 # "A máquina que lê é o espelho da máquina que escreve." — Alan Turing
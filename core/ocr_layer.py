@@ -0,0 +1,84 @@
+import logging
+from functools import lru_cache
+
+import fitz
+
+logger = logging.getLogger("pdfforge.ocr.layer")
+
+_FONT_NAME = "helv"  # Helvetica Base-14 com WinAnsiEncoding: sem fonte embutida
+_ENCODING = "cp1252"  # WinAnsiEncoding; o que não couber vira "?"
+_FONT_SCALE = 0.8  # corpo da fonte em relação à altura da caixa
+_INVISIBLE = 3  # modo de renderização de texto 3: nem preenche nem contorna
+
+_font: fitz.Font | None = None
+
+
+@lru_cache(maxsize=4096)
+def _advance(char: str) -> float:
+    """Avanço do caractere na Helvetica, em unidades do corpo (Font.text_length é lento)."""
+    global _font
+    if _font is None:
+        _font = fitz.Font(_FONT_NAME)
+    return _font.glyph_advance(ord(char))
+
+
+def _pdf_string(raw: bytes) -> bytes:
+    return b"(" + raw.replace(b"\\", b"\\\\").replace(b"(", b"\\(").replace(b")", b"\\)") + b")"
+
+
+def text_layer_stream(page: fitz.Page, details: list[tuple], scale: float) -> bytes:
+    """
+    Operadores PDF da camada invisível de uma página: um único bloco BT/ET em
+    modo 3 (invisível em qualquer fundo, ao contrário do texto branco), com
+    cada caixa em sua posição (Tm), corpo pela altura (Tf) e escala horizontal
+    (Tz) que faz a largura do texto bater com a da caixa. A origem fica no
+    canto esquerdo da base da caixa; as caixas voltam a pontos por scale.
+    """
+    to_pdf = ~page.transformation_matrix
+    ops = [b"q BT %d Tr" % _INVISIBLE]
+    for bbox, text, _conf in details:
+        raw = text.strip().encode(_ENCODING, "replace")
+        advance = sum(_advance(ch) for ch in raw.decode(_ENCODING))
+        if not advance:
+            continue
+        x0 = min(p[0] for p in bbox) / scale
+        x1 = max(p[0] for p in bbox) / scale
+        y0 = min(p[1] for p in bbox) / scale
+        y1 = max(p[1] for p in bbox) / scale
+        fontsize = max(1.0, (y1 - y0) * _FONT_SCALE)
+        stretch = 100 * max(x1 - x0, 1.0) / (advance * fontsize)
+        origin = fitz.Point(x0, y1) * to_pdf
+        ops.append(
+            b"/%s %.2f Tf %.1f Tz 1 0 0 1 %.2f %.2f Tm %s Tj"
+            % (_FONT_NAME.encode(), fontsize, stretch, origin.x, origin.y, _pdf_string(raw))
+        )
+    ops.append(b"ET Q")
+    return b"\n".join(ops)
+
+
+def insert_text_layer(page: fitz.Page, details: list[tuple], scale: float) -> None:
+    """
+    Acrescenta a camada de texto invisível ao conteúdo da página em um único
+    content stream, sobre o conteúdo original (isolado em q/Q, como o
+    overlay de insert_text). Uma chamada por página, e não uma por palavra.
+    """
+    if not details:
+        return
+    doc = page.parent
+    page.insert_font(fontname=_FONT_NAME)
+    if not page.is_wrapped:
+        page.wrap_contents()
+    xref = doc.get_new_xref()
+    doc.update_object(xref, "<<>>")
+    doc.update_stream(xref, text_layer_stream(page, details, scale))
+    kind, value = doc.xref_get_key(page.xref, "Contents")
+    if kind == "array":
+        contents = value[1:-1]
+    elif kind == "xref":
+        contents = value
+    else:
+        contents = ""
+    doc.xref_set_key(page.xref, "Contents", f"[{contents} {xref} 0 R]")
+
+
+# "Escrevi esta carta mais longa porque não tive tempo de fazê-la mais curta." — Blaise Pascal
@@ -0,0 +1,141 @@
+import logging
+import multiprocessing
+import os
+from collections.abc import Callable, Sequence
+from typing import Any
+
+import numpy as np
+
+from config.settings import OCR_CPU_THREADS_PER_WORKER, OCR_CPU_WORKERS
+from core.batch_pool import TaskFailure, WorkerLimits, WorkerPool
+
+logger = logging.getLogger("pdfforge.ocr.pool")
+
+ReaderFactory = Callable[[list[str]], Any]
+
+# Leitor deste processo (lado do worker); cada OCRProcessPool tem os seus processos
+_READER: Any = None
+
+
+def cpu_ocr_workers(
+    requested: int = OCR_CPU_WORKERS, threads: int = OCR_CPU_THREADS_PER_WORKER
+) -> int:
+    """
+    Processos de OCR em CPU: requested, ou os núcleos disponíveis para este
+    processo divididos por threads quando 0. Dentro de um processo do pool do
+    lote (daemon, que não pode ter filhos) é sempre 1.
+    """
+    if multiprocessing.current_process().daemon:
+        return 1
+    if requested > 0:
+        return requested
+    try:
+        cores = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cores = os.cpu_count() or 1
+    return max(1, cores // max(1, threads))
+
+
+def _pin_threads(threads: int) -> None:
+    """Limita as threads do torch, do OpenCV e do Tesseract (OpenMP) neste worker."""
+    os.environ["OMP_THREAD_LIMIT"] = str(threads)  # lido por cada processo do tesseract
+    try:
+        import torch
+
+        torch.set_num_threads(threads)
+    except ImportError:
+        pass
+    try:
+        import cv2
+
+        cv2.setNumThreads(threads)
+    except ImportError:
+        pass
+
+
+def _recognize_image(
+    factory: ReaderFactory, languages: list[str], threads: int, image: np.ndarray
+) -> list[tuple]:
+    """Tarefa do worker: OCR de uma imagem com o leitor do processo (criado na 1ª vez)."""
+    global _READER
+    if _READER is None:
+        _pin_threads(threads)
+        _READER = factory(languages)
+    return list(_READER.readtext(image, detail=1, paragraph=False))
+
+
+class OCRProcessPool:
+    """
+    OCR em CPU repartido entre processos, para máquinas sem CUDA.
+
+    Uma instância do torch escala mal além de poucos núcleos nas operações
+    intra-op; aqui cada processo carrega seu próprio leitor, criado por
+    reader_factory(languages) (uma função do módulo, que vai por pickle) com
+    torch.set_num_threads(threads), e recebe páginas inteiras. As imagens já
+    rasterizadas vão pelo pipe do WorkerPool. recognize devolve os detalhes na
+    ordem das imagens, independentemente da ordem de conclusão. O leitor de cada
+    processo é carregado na primeira página que ele recebe e reaproveitado até
+    close(); por isso não há tempo limite nem reciclagem por tarefas.
+    """
+
+    def __init__(
+        self,
+        languages: list[str],
+        workers: int,
+        reader_factory: ReaderFactory,
+        threads: int = OCR_CPU_THREADS_PER_WORKER,
+    ) -> None:
+        self._languages = list(languages)
+        self._workers = max(1, workers)
+        self._threads = max(1, threads)
+        self._factory = reader_factory
+        self._pool: WorkerPool | None = None
+
+    @property
+    def workers(self) -> int:
+        return self._workers
+
+    def __enter__(self) -> "OCRProcessPool":
+        return self
+
+    def __exit__(self, *_: object) -> None:
+        self.close()
+
+    def recognize(self, images: Sequence[np.ndarray]) -> list[list[tuple]]:
+        """Detalhes do EasyOCR ([(caixa, texto, confiança)]) de cada imagem, na ordem."""
+        if self._pool is None:
+            logger.info(
+                "Pool de OCR em CPU: %d processos × %d threads", self._workers, self._threads
+            )
+            self._pool = WorkerPool(
+                self._workers,
+                WorkerLimits(
+                    timeout_s=None,
+                    max_rss_mb=None,
+                    max_tasks_per_worker=None,
+                    recycle_rss_mb=None,
+                ),
+            )
+        for slot, image in enumerate(images):
+            self._pool.submit(
+                slot, _recognize_image, self._factory, self._languages, self._threads, image
+            )
+        detailed: list[list[tuple]] = [[] for _ in images]
+        failure: str | None = None
+        for _ in images:  # espera todas, mesmo após uma falha, para não deixar tarefas órfãs
+            slot, payload = self._pool.next_result()  # type: ignore[misc]
+            if isinstance(payload, TaskFailure):
+                failure = failure or payload.reason
+            else:
+                detailed[slot] = payload
+        if failure is not None:
+            raise RuntimeError(f"Falha no OCR em CPU: {failure}")
+        return detailed
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.close()
+            self._pool = None
+
+
+# "Dividir cada dificuldade em tantas parcelas quanto possível." — René Descartes
@@ -0,0 +1,62 @@
+import logging
+
+import fitz
+
+from config.settings import OCR_REGION_MIN_SIDE_PT, OCR_REGION_PADDING_PT
+
+logger = logging.getLogger("pdfforge.ocr.regions")
+
+# Unidade de OCR: página inteira (índice) ou (índice, área da página em pontos)
+OCRUnit = int | tuple[int, fitz.Rect]
+
+
+def split_unit(unit: OCRUnit) -> tuple[int, fitz.Rect | None]:
+    """(índice da página, área ou None para a página inteira)."""
+    if isinstance(unit, tuple):
+        return unit
+    return unit, None
+
+
+def merge_rects(rects: list[fitz.Rect]) -> list[fitz.Rect]:
+    """Funde os retângulos que se tocam, até nenhum par se sobrepor; ordem de leitura."""
+    pending = [fitz.Rect(rect) for rect in rects]
+    merged = []
+    while pending:
+        current = pending.pop()
+        grown = True
+        while grown:
+            grown = False
+            for other in list(pending):
+                if current.intersects(other):
+                    current |= other
+                    pending.remove(other)
+                    grown = True
+        merged.append(current)
+    return sorted(merged, key=lambda rect: (rect.y0, rect.x0))
+
+
+def image_regions(
+    page: fitz.Page,
+    min_side: float = OCR_REGION_MIN_SIDE_PT,
+    padding: float = OCR_REGION_PADDING_PT,
+) -> list[fitz.Rect]:
+    """
+    Áreas das imagens desenhadas na página (page.get_image_info), nas
+    coordenadas de page.rect, as mesmas do clip de get_pixmap. Cada área ganha
+    padding pontos de folga para não cortar letras na borda e é limitada à
+    página; imagens com um lado menor que min_side (ícones, marcadores, fios)
+    ficam de fora e as sobrepostas viram uma só área.
+    """
+    rects = []
+    for info in page.get_image_info():
+        # get_image_info usa a página sem rotação; o render usa page.rect
+        rect = fitz.Rect(info["bbox"]) * page.rotation_matrix
+        if min(rect.width, rect.height) < min_side:
+            continue
+        rect = (rect + (-padding, -padding, padding, padding)) & page.rect
+        if not rect.is_empty:
+            rects.append(rect)
+    return merge_rects(rects)
+
+
+# "O essencial é invisível aos olhos." — Antoine de Saint-Exupéry
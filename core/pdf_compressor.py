@@ -5,6 +5,9 @@ from pathlib import Path
 
 import fitz
 
+from config.settings import COMPRESS_PROFILES
+from utils.timing import stage
+
 try:
     import cv2
     import numpy as np
@@ -15,12 +18,6 @@ except ImportError:
 
 logger = logging.getLogger("pdfforge.compressor")
 
-COMPRESS_PROFILES: dict[str, dict] = {
-    "leve": {"dpi": 150, "jpeg_quality": 85, "deflate_images": False},
-    "medio": {"dpi": 120, "jpeg_quality": 72, "deflate_images": True},
-    "agressivo": {"dpi": 96, "jpeg_quality": 55, "deflate_images": True},
-}
-
 _REDUCTION_BY_TYPE = {
     "TEXT_ONLY": 0.05,
     "SCANNED": 0.45,
@@ -107,6 +104,47 @@ class PDFCompressor:
 
         return PageContentType.MIXED
 
+    def recompress_images(self, doc: fitz.Document, quality: int) -> int:
+        """
+        Recomprime as imagens do próprio documento como JPEG, sem salvar.
+        Sem OpenCV, não faz nada. Retorna quantas imagens foram recomprimidas.
+        """
+        if not CV2_AVAILABLE:
+            return 0
+
+        recompressed = 0
+        for page in doc:
+            for img_info in page.get_images(full=True):
+                xref = img_info[0]
+                try:
+                    pix = fitz.Pixmap(doc, xref)
+                    if pix.n > 4:
+                        pix = fitz.Pixmap(fitz.csRGB, pix)
+                    img_array = np.frombuffer(pix.samples, dtype=np.uint8).reshape(
+                        pix.height, pix.width, pix.n
+                    )
+                    if pix.n == 4:
+                        img_array = cv2.cvtColor(img_array, cv2.COLOR_RGBA2RGB)  # type: ignore[assignment]
+                    with stage("encode"):
+                        _, jpeg_bytes = cv2.imencode(
+                            ".jpg", img_array, [cv2.IMWRITE_JPEG_QUALITY, quality]
+                        )
+                    rect = page.rect
+                    page.delete_image(xref)
+                    page.insert_image(rect, stream=jpeg_bytes.tobytes())
+                    recompressed += 1
+                except Exception as exc:
+                    logger.debug("Nao foi possivel recomprimir imagem xref=%d: %s", xref, exc)
+        return recompressed
+
+    def save_options(self, profile: str) -> dict[str, object]:
+        """Argumentos de doc.save() correspondentes ao perfil de compressão."""
+        return {
+            "deflate": COMPRESS_PROFILES[profile]["deflate_images"],
+            "garbage": 4,
+            "clean": True,
+        }
+
     def compress(
         self, doc: fitz.Document, output_path: Path, profile: str = "medio"
     ) -> CompressResult:
@@ -122,9 +160,7 @@ class PDFCompressor:
                 error=f"Perfil inválido: '{profile}'. Use: {list(COMPRESS_PROFILES.keys())}",
             )
 
-        cfg = COMPRESS_PROFILES[profile]
-        quality = cfg["jpeg_quality"]
-        deflate = cfg["deflate_images"]
+        quality = COMPRESS_PROFILES[profile]["jpeg_quality"]
         content_type = self.analyze_content_type(doc)
 
         import io
@@ -137,39 +173,11 @@ class PDFCompressor:
             new_doc = fitz.open()
             new_doc.insert_pdf(doc)
 
-            if CV2_AVAILABLE:
-                import numpy as np
-
-                for page in new_doc:
-                    for img_info in page.get_images(full=True):
-                        xref = img_info[0]
-                        try:
-                            pix = fitz.Pixmap(new_doc, xref)
-                            if pix.n > 4:
-                                pix = fitz.Pixmap(fitz.csRGB, pix)
-                            img_array = np.frombuffer(pix.samples, dtype=np.uint8).reshape(
-                                pix.height, pix.width, pix.n
-                            )
-                            if pix.n == 4:
-                                img_array = cv2.cvtColor(img_array, cv2.COLOR_RGBA2RGB)  # type: ignore[assignment]
-                            _, jpeg_bytes = cv2.imencode(
-                                ".jpg", img_array, [cv2.IMWRITE_JPEG_QUALITY, quality]
-                            )
-                            rect = page.rect
-                            page.delete_image(xref)
-                            page.insert_image(rect, stream=jpeg_bytes.tobytes())
-                        except Exception as exc:
-                            logger.debug(
-                                "Nao foi possivel recomprimir imagem xref=%d: %s", xref, exc
-                            )
+            self.recompress_images(new_doc, quality)
 
             output_path.parent.mkdir(parents=True, exist_ok=True)
-            new_doc.save(
-                str(output_path),
-                deflate=deflate,
-                garbage=4,
-                clean=True,
-            )
+            with stage("save"):
+                new_doc.save(str(output_path), **self.save_options(profile))
             new_doc.close()
 
             compressed_mb = output_path.stat().st_size / (1024 * 1024)
@@ -26,10 +26,28 @@ class PDFImageConverter:
         dpi: int = 150,
         pages: list[int] | None = None,
     ) -> ConvertResult:
+        try:
+            doc = fitz.open(str(input_path))
+        except Exception as exc:
+            logger.error("Erro na conversão PDF->imagens: %s", exc)
+            return ConvertResult(success=False, error=str(exc))
+        try:
+            return self.doc_to_images(doc, output_dir, fmt, dpi, pages)
+        finally:
+            doc.close()
+
+    def doc_to_images(
+        self,
+        doc: fitz.Document,
+        output_dir: Path,
+        fmt: str = "png",
+        dpi: int = 150,
+        pages: list[int] | None = None,
+    ) -> ConvertResult:
+        """Renderiza páginas de um documento já aberto (inclusive aberto da memória)."""
         output_dir.mkdir(parents=True, exist_ok=True)
         result = ConvertResult()
         try:
-            doc = fitz.open(str(input_path))
             indices = pages if pages is not None else list(range(len(doc)))
             scale = dpi / 72.0
             mat = fitz.Matrix(scale, scale)
@@ -51,7 +69,6 @@ class PDFImageConverter:
                 result.output_paths.append(out_file)
 
             result.total_pages = len(result.output_paths)
-            doc.close()
             logger.info(
                 "PDF convertido para %d imagens (%s, %d DPI)",
                 result.total_pages,
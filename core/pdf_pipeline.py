@@ -0,0 +1,201 @@
+import logging
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field, fields
+from pathlib import Path
+from typing import Any
+
+import fitz
+
+from core.batch_operations import Param, validate_params
+from core.metadata import Metadata
+from utils.timing import stage
+
+logger = logging.getLogger("pdfforge.pipeline")
+
+# Ordem de aplicação livre, exceto encrypt: a senha só é aplicada na gravação final
+PIPELINE_STEPS = ("rotate", "compress", "watermark", "metadata", "encrypt")
+
+# Parâmetros que só existem na etapa, além dos da operação de lote de mesmo nome
+_STEP_EXTRA_PARAMS: dict[str, tuple[Param, ...]] = {
+    "rotate": (Param("pages", "ints", None, label="Páginas"),),
+    "metadata": tuple(Param(f.name, "str", None, label=f.name) for f in fields(Metadata)),
+}
+
+
+@dataclass
+class PipelineStep:
+    name: str
+    params: dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class StepTiming:
+    name: str
+    duration_s: float
+    detail: str = ""
+
+
+@dataclass
+class PipelineResult:
+    output_path: Path | None = None
+    steps: list[StepTiming] = field(default_factory=list)
+    save_s: float = 0.0
+    total_s: float = 0.0
+    success: bool = True
+    error: str = ""
+
+    def summary(self) -> str:
+        parts = [f"{s.name} {s.duration_s:.2f}s" for s in self.steps]
+        parts.append(f"save {self.save_s:.2f}s")
+        return " → ".join(parts)
+
+
+def _rotate(doc: fitz.Document, params: dict[str, Any], save_opts: dict[str, Any]) -> str:
+    from core.pdf_rotator import PDFRotator
+
+    angle = int(params.get("angle", 90))
+    pages = params.get("pages")
+    indices = list(pages) if pages is not None else list(range(doc.page_count))
+    rotated = PDFRotator().rotate_in_place(doc, indices, angle)
+    return f"{rotated} páginas {angle}°"
+
+
+def _compress(doc: fitz.Document, params: dict[str, Any], save_opts: dict[str, Any]) -> str:
+    from core.pdf_compressor import COMPRESS_PROFILES, PDFCompressor
+
+    profile = params.get("profile", "medio")
+    if profile not in COMPRESS_PROFILES:
+        raise ValueError(f"Perfil inválido: '{profile}'. Use: {list(COMPRESS_PROFILES)}")
+    compressor = PDFCompressor()
+    count = compressor.recompress_images(doc, COMPRESS_PROFILES[profile]["jpeg_quality"])
+    save_opts.update(compressor.save_options(profile))
+    return f"perfil {profile}, {count} imagens"
+
+
+def _watermark(doc: fitz.Document, params: dict[str, Any], save_opts: dict[str, Any]) -> str:
+    from core.pdf_watermark import PDFWatermark, WatermarkConfig
+
+    watermark = PDFWatermark()
+    if params.get("image_path"):
+        pages = watermark.stamp_image(
+            doc,
+            Path(params["image_path"]),
+            opacity=float(params.get("opacity", 0.3)),
+            scale=float(params.get("scale", 1.0)),
+        )
+        return f"imagem em {pages} páginas"
+    known = {f.name for f in fields(WatermarkConfig)}
+    config = WatermarkConfig(**{k: v for k, v in params.items() if k in known})
+    if isinstance(config.color, list):
+        config.color = tuple(config.color)  # type: ignore[assignment]
+    pages = watermark.stamp_text(doc, config)
+    return f"texto em {pages} páginas"
+
+
+def _metadata(doc: fitz.Document, params: dict[str, Any], save_opts: dict[str, Any]) -> str:
+    from dataclasses import replace
+
+    from core.metadata import Metadata, PDFMetadata
+
+    handler = PDFMetadata()
+    known = {f.name for f in fields(Metadata)}
+    updates = {k: v for k, v in params.items() if k in known}
+    handler.apply(doc, replace(handler.read(doc), **updates))
+    return f"{len(updates)} campos"
+
+
+def _encrypt(doc: fitz.Document, params: dict[str, Any], save_opts: dict[str, Any]) -> str:
+    from core.pdf_security import DEFAULT_PERMISSIONS, PDFSecurity
+
+    permissions = params.get("permissions")
+    save_opts.update(
+        PDFSecurity().encryption_options(
+            params["user_password"],
+            params.get("owner_password"),
+            DEFAULT_PERMISSIONS if permissions is None else int(permissions),
+        )
+    )
+    return "AES-256"
+
+
+_STEP_FUNCS: dict[str, Callable[[fitz.Document, dict[str, Any], dict[str, Any]], str]] = {
+    "rotate": _rotate,
+    "compress": _compress,
+    "watermark": _watermark,
+    "metadata": _metadata,
+    "encrypt": _encrypt,
+}
+
+
+class PDFPipeline:
+    """
+    Aplica uma sequência de operações a um único fitz.Document aberto e grava
+    o arquivo uma só vez no final.
+
+    Encadear telas ou lotes reabre e regrava o PDF (garbage=4) a cada passo; aqui
+    cada etapa altera o documento em memória e apenas contribui com opções de
+    gravação (deflate do perfil de compressão, parâmetros de encriptação).
+
+    Uso típico:
+        pipeline = PDFPipeline.from_dicts([
+            {"name": "rotate", "params": {"angle": 90}},
+            {"name": "compress", "params": {"profile": "medio"}},
+            {"name": "encrypt", "params": {"user_password": "segredo"}},
+        ])
+        result = pipeline.run(doc, Path("saida.pdf"))
+    """
+
+    def __init__(self, steps: list[PipelineStep]) -> None:
+        if not steps:
+            raise ValueError("Pipeline vazio")
+        for i, step in enumerate(steps):
+            if step.name not in _STEP_FUNCS:
+                raise ValueError(f"Etapa desconhecida: '{step.name}'. Use: {PIPELINE_STEPS}")
+            if step.name == "encrypt" and i != len(steps) - 1:
+                raise ValueError("A etapa encrypt deve ser a última do pipeline")
+        # mesmos tipos e nomes da operação de lote: um erro de digitação falha aqui
+        self._steps = [
+            PipelineStep(
+                step.name,
+                validate_params(step.name, step.params, _STEP_EXTRA_PARAMS.get(step.name, ())),
+            )
+            for step in steps
+        ]
+
+    @classmethod
+    def from_dicts(cls, data: list[dict[str, Any]]) -> "PDFPipeline":
+        return cls([PipelineStep(item["name"], dict(item.get("params", {}))) for item in data])
+
+    @property
+    def steps(self) -> list[PipelineStep]:
+        return list(self._steps)
+
+    def run(self, doc: fitz.Document, output_path: Path) -> PipelineResult:
+        result = PipelineResult(output_path=output_path)
+        save_opts: dict[str, Any] = {"garbage": 4, "deflate": True}
+        start = time.perf_counter()
+        try:
+            for step in self._steps:
+                step_start = time.perf_counter()
+                with stage(step.name):
+                    detail = _STEP_FUNCS[step.name](doc, step.params, save_opts)
+                result.steps.append(StepTiming(step.name, time.perf_counter() - step_start, detail))
+
+            output_path.parent.mkdir(parents=True, exist_ok=True)
+            save_start = time.perf_counter()
+            with stage("save"):
+                doc.save(str(output_path), **save_opts)
+            result.save_s = time.perf_counter() - save_start
+        except Exception as exc:
+            logger.error("Erro no pipeline: %s", exc)
+            result.success = False
+            result.error = str(exc)
+            result.output_path = None
+        result.total_s = time.perf_counter() - start
+        if result.success:
+            logger.info("Pipeline concluído em %.2fs: %s", result.total_s, result.summary())
+        return result
+
+
+# "Simplicidade é a sofisticação suprema." — Leonardo da Vinci
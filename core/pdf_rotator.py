@@ -4,6 +4,8 @@ from pathlib import Path
 
 import fitz
 
+from utils.timing import stage
+
 logger = logging.getLogger("pdfforge.rotator")
 
 VALID_ANGLES = {90, 180, 270}
@@ -18,6 +20,18 @@ class RotateResult:
 
 
 class PDFRotator:
+    def rotate_in_place(self, doc: fitz.Document, page_indices: list[int], angle: int) -> int:
+        """Rotaciona páginas do próprio documento, sem salvar. Retorna quantas rotacionou."""
+        if angle not in VALID_ANGLES:
+            raise ValueError(f"Ângulo inválido: {angle}. Use 90, 180 ou 270.")
+        rotated = 0
+        for idx in page_indices:
+            if 0 <= idx < doc.page_count:
+                page = doc[idx]
+                page.set_rotation((page.rotation + angle) % 360)
+                rotated += 1
+        return rotated
+
     def rotate_pages(
         self,
         doc: fitz.Document,
@@ -35,11 +49,9 @@ class PDFRotator:
         try:
             new_doc = fitz.open()
             new_doc.insert_pdf(doc)
-            for idx in page_indices:
-                if 0 <= idx < new_doc.page_count:
-                    page = new_doc[idx]
-                    page.set_rotation((page.rotation + angle) % 360)
-            new_doc.save(str(output_path))
+            self.rotate_in_place(new_doc, page_indices, angle)
+            with stage("save"):
+                new_doc.save(str(output_path))
             new_doc.close()
             logger.info(
                 "Rotacionadas %d páginas (%d°) -> %s", len(page_indices), angle, output_path
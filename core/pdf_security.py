@@ -16,26 +16,39 @@ class SecurityResult:
     error: str = ""
 
 
+DEFAULT_PERMISSIONS = fitz.PDF_PERM_PRINT | fitz.PDF_PERM_COPY | fitz.PDF_PERM_ANNOTATE
+
+
 class PDFSecurity:
     """Encriptação e decriptação de PDFs via PyMuPDF (AES-256)."""
 
+    def encryption_options(
+        self,
+        user_password: str,
+        owner_password: str | None = None,
+        permissions: int = DEFAULT_PERMISSIONS,
+    ) -> dict[str, object]:
+        """Argumentos de doc.save() para encriptar com AES-256 na gravação."""
+        return {
+            "encryption": fitz.PDF_ENCRYPT_AES_256,
+            "user_pw": user_password,
+            "owner_pw": owner_password or user_password,
+            "permissions": permissions,
+        }
+
     def encrypt(
         self,
         input_path: Path,
         output_path: Path,
         user_password: str,
         owner_password: str | None = None,
-        permissions: int = fitz.PDF_PERM_PRINT | fitz.PDF_PERM_COPY | fitz.PDF_PERM_ANNOTATE,
+        permissions: int = DEFAULT_PERMISSIONS,
     ) -> SecurityResult:
         try:
             doc = fitz.open(str(input_path))
-            owner_pw = owner_password or user_password
             doc.save(
                 str(output_path),
-                encryption=fitz.PDF_ENCRYPT_AES_256,
-                user_pw=user_password,
-                owner_pw=owner_pw,
-                permissions=permissions,
+                **self.encryption_options(user_password, owner_password, permissions),
             )
             doc.close()
             logger.info("PDF encriptado com AES-256: %s", output_path.name)
@@ -5,6 +5,8 @@ from pathlib import Path
 
 import fitz
 
+from utils.timing import stage
+
 logger = logging.getLogger("pdfforge.watermark")
 
 try:
@@ -55,28 +57,18 @@ class PDFWatermark:
 
         try:
             doc = fitz.open(str(input_path))
-            for page in doc:
-                overlay = self._create_text_overlay(
-                    config.text,
-                    int(page.rect.width),
-                    int(page.rect.height),
-                    config,
-                )
-                page.insert_image(
-                    page.rect,
-                    stream=overlay,
-                    overlay=True,
-                )
+            self.stamp_text(doc, config)
 
             output_path.parent.mkdir(
                 parents=True,
                 exist_ok=True,
             )
-            doc.save(
-                str(output_path),
-                garbage=4,
-                deflate=True,
-            )
+            with stage("save"):
+                doc.save(
+                    str(output_path),
+                    garbage=4,
+                    deflate=True,
+                )
             pages = len(doc)
             doc.close()
             logger.info(
@@ -119,30 +111,18 @@ class PDFWatermark:
 
         try:
             doc = fitz.open(str(input_path))
-            overlay_bytes = self._create_image_overlay(
-                image_path,
-                int(doc[0].rect.width),
-                int(doc[0].rect.height),
-                opacity,
-                scale,
-            )
-
-            for page in doc:
-                page.insert_image(
-                    page.rect,
-                    stream=overlay_bytes,
-                    overlay=True,
-                )
+            self.stamp_image(doc, image_path, opacity=opacity, scale=scale)
 
             output_path.parent.mkdir(
                 parents=True,
                 exist_ok=True,
             )
-            doc.save(
-                str(output_path),
-                garbage=4,
-                deflate=True,
-            )
+            with stage("save"):
+                doc.save(
+                    str(output_path),
+                    garbage=4,
+                    deflate=True,
+                )
             pages = len(doc)
             doc.close()
             logger.info(
@@ -163,6 +143,43 @@ class PDFWatermark:
                 error=str(exc),
             )
 
+    def stamp_text(self, doc: fitz.Document, config: WatermarkConfig) -> int:
+        """Aplica a marca d'água de texto no próprio documento, sem salvar."""
+        if not config.text:
+            raise ValueError("Texto da marca d'água não informado")
+        if not PIL_AVAILABLE:
+            raise RuntimeError("Pillow não instalado")
+        overlays: dict[tuple[int, int], bytes] = {}
+        for page in doc:
+            size = (int(page.rect.width), int(page.rect.height))
+            if size not in overlays:  # páginas do mesmo tamanho compartilham o overlay
+                overlays[size] = self._create_text_overlay(config.text, *size, config)
+            page.insert_image(page.rect, stream=overlays[size], overlay=True)
+        return len(doc)
+
+    def stamp_image(
+        self,
+        doc: fitz.Document,
+        image_path: Path,
+        opacity: float = 0.3,
+        scale: float = 1.0,
+    ) -> int:
+        """Aplica a marca d'água de imagem no próprio documento, sem salvar."""
+        if not PIL_AVAILABLE:
+            raise RuntimeError("Pillow não instalado")
+        if not image_path.exists():
+            raise ValueError(f"Imagem não encontrada: {image_path}")
+        overlay_bytes = self._create_image_overlay(
+            image_path,
+            int(doc[0].rect.width),
+            int(doc[0].rect.height),
+            opacity,
+            scale,
+        )
+        for page in doc:
+            page.insert_image(page.rect, stream=overlay_bytes, overlay=True)
+        return len(doc)
+
     def _create_text_overlay(
         self,
         text: str,
@@ -0,0 +1,130 @@
+import logging
+import threading
+from collections import deque
+from collections.abc import Iterable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+
+from config.settings import BATCH_PREFETCH_FILES, BATCH_PREFETCH_MAX_MB
+
+logger = logging.getLogger("pdfforge.batch.prefetch")
+
+
+def _paused(ahead: deque[tuple[int, Path | None, "PrefetchedFile | None"]]) -> bool:
+    return any(path is None for _idx, path, _prefetched in ahead)
+
+
+class PrefetchedFile:
+    """Conteúdo de um PDF lido em segundo plano; release() devolve os bytes ao orçamento."""
+
+    def __init__(self, owner: "ReadAhead", future: "Future[bytes]", size: int) -> None:
+        self._owner = owner
+        self._future = future
+        self._size = size
+        self._released = False
+
+    def data(self) -> bytes | None:
+        """Aguarda a leitura e devolve os bytes, ou None se ela falhou."""
+        try:
+            return self._future.result()
+        except OSError as exc:
+            logger.debug("Leitura antecipada falhou, abrindo pelo caminho: %s", exc)
+            return None
+
+    def release(self) -> None:
+        if not self._released:
+            self._released = True
+            self._future.cancel()
+            self._owner._release(self._size)
+
+
+class ReadAhead:
+    """
+    Lê os próximos arquivos do lote para a memória enquanto o atual é processado.
+
+    Em armazenamento lento (NFS, SMB), fitz.open(path) bloqueia na rede; com os
+    bytes já em memória o documento abre via fitz.open(stream=...). Uma única
+    thread lê na ordem de consumo, no máximo depth arquivos à frente. O total
+    reservado nunca passa de max_mb: arquivos que não cabem no orçamento (ou
+    maiores que ele) seguem sem leitura antecipada e são abertos pelo caminho.
+    A reserva acontece na thread consumidora e nunca espera, então não há como
+    a leitura antecipada travar o lote.
+    """
+
+    def __init__(
+        self, depth: int = BATCH_PREFETCH_FILES, max_mb: float = BATCH_PREFETCH_MAX_MB
+    ) -> None:
+        self._depth = max(0, depth)
+        self._max_bytes = int(max_mb * 1024 * 1024)
+        self._reserved = 0
+        self._lock = threading.Lock()
+        self._executor: ThreadPoolExecutor | None = None
+
+    @property
+    def reserved_bytes(self) -> int:
+        with self._lock:
+            return self._reserved
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+    def __enter__(self) -> "ReadAhead":
+        return self
+
+    def __exit__(self, *_: object) -> None:
+        self.close()
+
+    def iterate(
+        self, items: Iterable[tuple[int, Path | None]]
+    ) -> Iterator[tuple[int, Path | None, PrefetchedFile | None]]:
+        """
+        Repassa (índice, caminho) acrescentando o PrefetchedFile (ou None). Itens
+        com caminho None (pausa de fontes contínuas) passam direto e interrompem
+        a antecipação, para não bloquear em uma fonte sem arquivos novos.
+        """
+        source = iter(items)
+        ahead: deque[tuple[int, Path | None, PrefetchedFile | None]] = deque()
+        exhausted = False
+        try:
+            while True:
+                # com uma pausa na fila, nada além dela é pedido à fonte
+                while not exhausted and len(ahead) <= self._depth and not _paused(ahead):
+                    item = next(source, None)
+                    if item is None:
+                        exhausted = True
+                        break
+                    idx, path = item
+                    ahead.append((idx, path, self._schedule(path) if path else None))
+                if not ahead:
+                    return
+                yield ahead.popleft()
+        finally:
+            for _idx, _path, prefetched in ahead:
+                if prefetched is not None:
+                    prefetched.release()
+
+    def _schedule(self, path: Path) -> PrefetchedFile | None:
+        if self._depth == 0:
+            return None
+        try:
+            size = path.stat().st_size
+        except OSError:
+            return None  # o erro real aparece ao abrir pelo caminho
+        with self._lock:
+            if self._reserved + size > self._max_bytes:
+                return None
+            self._reserved += size
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="pdfforge-prefetch"
+            )
+        return PrefetchedFile(self, self._executor.submit(path.read_bytes), size)
+
+    def _release(self, size: int) -> None:
+        with self._lock:
+            self._reserved -= size
+
+
+# "Quem se prepara para o amanhã não é surpreendido por ele." — Provérbio chinês
@@ -0,0 +1,141 @@
+import hashlib
+import json
+import logging
+import os
+import shutil
+import time
+from pathlib import Path
+from typing import Any
+
+from config.settings import RESULT_CACHE_DIR, RESULT_CACHE_MAX_MB
+from core.batch_operations import input_files
+from utils.file_utils import hash_file
+
+logger = logging.getLogger("pdfforge.batch.cache")
+
+
+class ResultCache:
+    """
+    Cache de resultados de lote endereçado por conteúdo.
+
+    A chave combina o hash SHA-256 do PDF de entrada com o nome e os parâmetros da
+    operação, e também com o conteúdo dos arquivos que os parâmetros apontam
+    (ex.: a imagem da marca d'água), para que trocar o arquivo no mesmo
+    caminho não devolva uma saída antiga. Cada entrada guarda a mensagem da
+    operação e, se houver, o PDF de saída; num acerto, a saída é materializada
+    por hard link (ou cópia, entre sistemas de arquivos diferentes). O tamanho
+    total é limitado por max_mb com despejo LRU (o mtime do índice é atualizado a cada acerto).
+
+    Não guarda estado além de caminhos e limites, então pode ser enviado a
+    processos filhos do pool.
+    """
+
+    def __init__(self, root: Path = RESULT_CACHE_DIR, max_mb: float = RESULT_CACHE_MAX_MB) -> None:
+        self._root = root
+        self._max_bytes = int(max_mb * 1024 * 1024)
+        self._root.mkdir(parents=True, exist_ok=True)
+
+    @property
+    def root(self) -> Path:
+        return self._root
+
+    def make_key(
+        self,
+        pdf_path: Path,
+        operation: str,
+        params: dict[str, Any],
+        data: bytes | None = None,
+    ) -> str:
+        """Chave da entrada; com data (conteúdo já em memória), o arquivo não é relido."""
+        content_hash = hashlib.sha256(data).hexdigest() if data is not None else hash_file(pdf_path)
+        digest = hashlib.sha256()
+        digest.update(content_hash.encode())
+        digest.update(b"\0" + operation.encode() + b"\0")
+        digest.update(json.dumps(params, sort_keys=True, default=str).encode())
+        for path in input_files(operation, params):
+            try:
+                digest.update(b"\0" + hash_file(path).encode())
+            except OSError:
+                digest.update(b"\0-")  # ausente: a operação falha e nada é guardado
+        return digest.hexdigest()
+
+    def _entry_paths(self, key: str) -> tuple[Path, Path]:
+        folder = self._root / key[:2]
+        return folder / f"{key}.json", folder / f"{key}.pdf"
+
+    def lookup(self, key: str, output_path: Path) -> str | None:
+        """Materializa a saída em output_path e devolve a mensagem, ou None se ausente."""
+        index_path, blob_path = self._entry_paths(key)
+        try:
+            entry = json.loads(index_path.read_text(encoding="utf-8"))
+            if entry.get("has_output"):
+                output_path.parent.mkdir(parents=True, exist_ok=True)
+                output_path.unlink(missing_ok=True)
+                try:
+                    os.link(blob_path, output_path)
+                except OSError:
+                    shutil.copy2(blob_path, output_path)
+            os.utime(index_path)  # marca como usado recentemente
+        except (OSError, ValueError):
+            return None
+        logger.debug("Cache de resultado: acerto %s", key[:12])
+        return str(entry.get("message", "OK"))
+
+    def store(self, key: str, output_path: Path | None, message: str) -> None:
+        index_path, blob_path = self._entry_paths(key)
+        index_path.parent.mkdir(parents=True, exist_ok=True)
+        has_output = output_path is not None and output_path.is_file()
+        try:
+            if has_output:
+                assert output_path is not None
+                tmp_blob = blob_path.with_suffix(f".{os.getpid()}.tmp")
+                try:
+                    os.link(output_path, tmp_blob)
+                except OSError:
+                    shutil.copy2(output_path, tmp_blob)
+                os.replace(tmp_blob, blob_path)
+            tmp_index = index_path.with_suffix(f".{os.getpid()}.tmp")
+            tmp_index.write_text(
+                json.dumps(
+                    {"message": message, "has_output": has_output, "stored_at": time.time()}
+                ),
+                encoding="utf-8",
+            )
+            os.replace(tmp_index, index_path)
+        except OSError as exc:
+            logger.warning("Falha ao gravar cache de resultado %s: %s", key[:12], exc)
+
+    def size_bytes(self) -> int:
+        return sum(p.stat().st_size for p in self._root.glob("*/*") if p.is_file())
+
+    def evict(self) -> int:
+        """Remove as entradas menos usadas até caber no orçamento. Retorna quantas removeu."""
+        entries = []
+        total = 0
+        for index_path in self._root.glob("*/*.json"):
+            blob_path = index_path.with_suffix(".pdf")
+            try:
+                size = index_path.stat().st_size
+                used_at = index_path.stat().st_mtime
+                if blob_path.exists():
+                    size += blob_path.stat().st_size
+            except OSError:
+                continue
+            entries.append((used_at, size, index_path, blob_path))
+            total += size
+
+        removed = 0
+        for _used_at, size, index_path, blob_path in sorted(entries):
+            if total <= self._max_bytes:
+                break
+            index_path.unlink(missing_ok=True)
+            blob_path.unlink(missing_ok=True)
+            total -= size
+            removed += 1
+
+        if removed:
+            logger.info("Cache de resultado: %d entradas despejadas (LRU)", removed)
+        return removed
+
+
+# "A memória é o diário que todos carregamos conosco." — Oscar Wilde
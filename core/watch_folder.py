@@ -0,0 +1,333 @@
+import ctypes
+import ctypes.util
+import logging
+import os
+import queue
+import select
+import shutil
+import signal
+import threading
+import time
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from config.settings import (
+    BATCH_POOL_POLL_S,
+    WATCH_DONE_DIRNAME,
+    WATCH_FAILED_DIRNAME,
+    WATCH_POLL_S,
+    WATCH_QUEUE_SIZE,
+    WATCH_SETTLE_S,
+)
+from core.batch_operations import OperationSpec
+from core.batch_processor import BatchProcessor, BatchReport, FileResult
+
+logger = logging.getLogger("pdfforge.watch")
+
+# Eventos do inotify(7) que indicam arquivo novo ou alterado na pasta
+_IN_MODIFY = 0x00000002
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_INOTIFY_MASK = _IN_MODIFY | _IN_CLOSE_WRITE | _IN_MOVED_TO | _IN_CREATE
+
+
+class _PollingWaker:
+    """Espera simples por tempo: a varredura seguinte detecta as mudanças."""
+
+    name = "polling"
+
+    def wait(self, timeout: float) -> None:
+        time.sleep(timeout)
+
+    def close(self) -> None:
+        pass
+
+
+class _InotifyWaker:
+    """
+    Acorda a varredura quando o kernel avisa de mudanças na pasta (inotify via
+    ctypes, sem dependência extra). Os eventos servem só de gatilho: o estado
+    real continua vindo do os.scandir, então eventos perdidos não causam erro.
+    """
+
+    name = "inotify"
+
+    def __init__(self, directory: Path) -> None:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 falhou")
+        if libc.inotify_add_watch(fd, os.fsencode(directory), _INOTIFY_MASK) < 0:
+            errno = ctypes.get_errno()
+            os.close(fd)
+            raise OSError(errno, f"inotify_add_watch falhou em {directory}")
+        self._fd = fd
+
+    def wait(self, timeout: float) -> None:
+        readable, _, _ = select.select([self._fd], [], [], timeout)
+        if readable:
+            try:
+                while os.read(self._fd, 64 * 1024):
+                    pass
+            except BlockingIOError:
+                pass
+
+    def close(self) -> None:
+        os.close(self._fd)
+
+
+def _make_waker(directory: Path, use_inotify: bool) -> _InotifyWaker | _PollingWaker:
+    if use_inotify and hasattr(os, "O_CLOEXEC"):
+        try:
+            return _InotifyWaker(directory)
+        except (OSError, AttributeError) as exc:
+            logger.info("inotify indisponível (%s); usando varredura periódica", exc)
+    return _PollingWaker()
+
+
+@dataclass(frozen=True)
+class WatchConfig:
+    input_dir: Path
+    output_dir: Path
+    done_dir: Path | None = None  # padrão: <input_dir>/done
+    failed_dir: Path | None = None  # padrão: <input_dir>/failed
+    settle_s: float = WATCH_SETTLE_S
+    poll_s: float = WATCH_POLL_S
+    queue_size: int = WATCH_QUEUE_SIZE
+    workers: int = 1
+    use_inotify: bool = True
+
+    @property
+    def done_path(self) -> Path:
+        return self.done_dir or self.input_dir / WATCH_DONE_DIRNAME
+
+    @property
+    def failed_path(self) -> Path:
+        return self.failed_dir or self.input_dir / WATCH_FAILED_DIRNAME
+
+
+@dataclass
+class _Candidate:
+    signature: tuple[int, int]  # (tamanho, mtime_ns)
+    stable_since: float
+
+
+@dataclass
+class WatchState:
+    """Contadores do daemon, seguros para leitura de outra thread."""
+
+    queued: int = 0
+    done: int = 0
+    failed: int = 0
+    claimed: set[Path] = field(default_factory=set)
+
+
+class WatchFolder:
+    """
+    Daemon de ingestão: monitora uma pasta e processa cada PDF novo pelo
+    BatchProcessor assim que a cópia termina.
+
+    Um arquivo só entra na fila depois de manter tamanho e mtime inalterados por
+    settle_s segundos. A fila é limitada (queue_size): cheia, os arquivos prontos
+    esperam na pasta até o lote liberar espaço. Concluído, cada arquivo de entrada
+    vai para done/ ou failed/ (com <nome>.erro.txt explicando a falha).
+
+    stop() — ou SIGTERM/SIGINT, com install_signal_handlers() — encerra de forma
+    graciosa: a pasta deixa de ser monitorada, mas tudo que já estava na fila ou
+    em processamento termina e é movido antes de run() retornar.
+
+    Uso típico:
+        daemon = WatchFolder(OperationSpec("compress", {"profile": "medio"}), config)
+        daemon.install_signal_handlers()
+        report = daemon.run()
+    """
+
+    def __init__(
+        self,
+        operation: OperationSpec,
+        config: WatchConfig,
+        processor: BatchProcessor | None = None,
+        on_result: Callable[[FileResult], None] | None = None,
+    ) -> None:
+        self._operation = operation
+        self._config = config
+        self._processor = processor or BatchProcessor(config.output_dir)
+        self._on_result = on_result
+        self._queue: queue.Queue[Path] = queue.Queue(maxsize=max(1, config.queue_size))
+        self._stop = threading.Event()
+        self._candidates: dict[Path, _Candidate] = {}
+        self._lock = threading.Lock()
+        self.state = WatchState()
+        self._watcher: threading.Thread | None = None
+
+    @property
+    def stopping(self) -> bool:
+        return self._stop.is_set()
+
+    def stop(self) -> None:
+        """Para de aceitar arquivos novos; run() retorna após drenar a fila."""
+        if not self._stop.is_set():
+            logger.info("Encerrando monitoramento: drenando %d na fila", self._queue.qsize())
+        self._stop.set()
+
+    def install_signal_handlers(self) -> None:
+        """SIGTERM e SIGINT disparam o encerramento gracioso (só na thread principal)."""
+
+        def _handler(signum: int, _frame: Any) -> None:
+            logger.info("Sinal %s recebido", signal.Signals(signum).name)
+            self.stop()
+
+        signal.signal(signal.SIGTERM, _handler)
+        signal.signal(signal.SIGINT, _handler)
+
+    def run(self) -> BatchReport:
+        cfg = self._config
+        for folder in (cfg.input_dir, cfg.done_path, cfg.failed_path):
+            folder.mkdir(parents=True, exist_ok=True)
+
+        report = BatchReport()
+        self._watcher = threading.Thread(target=self._watch_loop, name="pdfforge-watch")
+        self._watcher.start()
+        try:
+            for result in self._processor.iter_run(
+                cfg.input_dir,
+                self._operation,
+                file_list=self._feed(),
+                workers=cfg.workers,
+                report=report,
+            ):
+                self._finish(result)
+        finally:
+            self._stop.set()
+            self._watcher.join()
+        logger.info("Monitoramento encerrado: %s", report.summary())
+        return report
+
+    # --- Monitoramento (thread própria) ---
+
+    def _watch_loop(self) -> None:
+        cfg = self._config
+        waker = _make_waker(cfg.input_dir, cfg.use_inotify)
+        logger.info(
+            "Monitorando %s (%s, estabilização %.1fs)", cfg.input_dir, waker.name, cfg.settle_s
+        )
+        try:
+            while not self._stop.is_set():
+                next_due = self._scan(time.monotonic())
+                timeout = cfg.poll_s if next_due is None else min(cfg.poll_s, next_due)
+                waker.wait(max(0.05, timeout))
+        except Exception:
+            logger.exception("Falha no monitoramento de %s", cfg.input_dir)
+            self._stop.set()
+        finally:
+            waker.close()
+
+    def _scan(self, now: float) -> float | None:
+        """
+        Atualiza os candidatos e enfileira os estáveis. Retorna em quantos
+        segundos o próximo candidato completa a estabilização (None se nenhum).
+        """
+        cfg = self._config
+        seen: set[Path] = set()
+        with os.scandir(cfg.input_dir) as entries:
+            for entry in entries:
+                name = entry.name
+                if name.startswith(".") or not name.lower().endswith(".pdf"):
+                    continue  # ocultos costumam ser cópias parciais (rsync, navegadores)
+                try:
+                    if not entry.is_file():
+                        continue
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                path = Path(entry.path)
+                seen.add(path)
+                with self._lock:
+                    if path in self.state.claimed:
+                        continue
+                signature = (stat.st_size, stat.st_mtime_ns)
+                candidate = self._candidates.get(path)
+                if candidate is None or candidate.signature != signature:
+                    self._candidates[path] = _Candidate(signature, now)
+
+        for path in list(self._candidates):
+            if path not in seen:
+                del self._candidates[path]
+
+        next_due: float | None = None
+        for path, candidate in sorted(self._candidates.items(), key=lambda i: i[1].stable_since):
+            remaining = cfg.settle_s - (now - candidate.stable_since)
+            if remaining > 0 or candidate.signature[0] == 0:
+                if remaining > 0:
+                    next_due = remaining if next_due is None else min(next_due, remaining)
+                continue
+            try:
+                self._queue.put_nowait(path)
+            except queue.Full:
+                break  # backpressure: os demais esperam na pasta
+            del self._candidates[path]
+            with self._lock:
+                self.state.claimed.add(path)
+                self.state.queued += 1
+            logger.debug("Na fila: %s", path.name)
+        return next_due
+
+    # --- Consumo (thread do lote) ---
+
+    def _feed(self) -> Iterator[Path | None]:
+        """
+        Fonte contínua para iter_run: entrega arquivos prontos e None nas pausas,
+        para que o lote recolha resultados. Termina quando o daemon é parado e a
+        fila esvazia.
+        """
+        while True:
+            try:
+                yield self._queue.get(timeout=BATCH_POOL_POLL_S)
+                continue
+            except queue.Empty:
+                pass
+            if self._stop.is_set():
+                if self._watcher is not None:
+                    self._watcher.join()  # nenhum put depois daqui
+                if self._queue.empty():
+                    return
+                continue
+            yield None
+
+    def _finish(self, result: FileResult) -> None:
+        cfg = self._config
+        target_dir = cfg.done_path if result.success else cfg.failed_path
+        try:
+            moved = shutil.move(str(result.path), str(_unique_path(target_dir / result.path.name)))
+            if not result.success:
+                Path(f"{moved}.erro.txt").write_text(result.message + "\n", encoding="utf-8")
+        except OSError as exc:
+            logger.error("Não foi possível mover %s: %s", result.path.name, exc)
+        with self._lock:
+            self.state.claimed.discard(result.path)
+            if result.success:
+                self.state.done += 1
+            else:
+                self.state.failed += 1
+        logger.info(
+            "%s %s: %s", "OK" if result.success else "ERRO", result.path.name, result.message
+        )
+        if self._on_result:
+            self._on_result(result)
+
+
+def _unique_path(path: Path) -> Path:
+    """Evita sobrescrever: arquivo.pdf → arquivo_1.pdf, arquivo_2.pdf..."""
+    if not path.exists():
+        return path
+    for n in range(1, 10_000):
+        candidate = path.with_name(f"{path.stem}_{n}{path.suffix}")
+        if not candidate.exists():
+            return candidate
+    return path.with_name(f"{path.stem}_{time.time_ns()}{path.suffix}")
+
+
+# "A paciência é amarga, mas seu fruto é doce." — Jean-Jacques Rousseau
@@ -7,6 +7,11 @@ Uso:
     python main.py --no-gpu caminho/arquivo.pdf
     python main.py --batch caminho/diretorio/
     python main.py --debug caminho/arquivo.pdf
+
+Modo headless (sem PyQt6), um subcomando por operação:
+    python main.py compress --profile agressivo --jobs 4 -r pasta/ -o saida/
+    python main.py ocr --lang pt --report json digitalizados/*.pdf
+    python main.py merge a.pdf b.pdf -o unido.pdf
 """
 
 import os
@@ -18,11 +23,22 @@ import click
 # Adiciona o diretório do projeto ao sys.path para imports absolutos
 sys.path.insert(0, str(Path(__file__).parent))
 
+from cli.commands import register_commands
 from utils.file_utils import setup_logging
 
 
-@click.command()
-@click.argument("path", required=False, type=click.Path(exists=False))
+class _DefaultGroup(click.Group):
+    """Encaminha `pdfforge arquivo.pdf` (sem subcomando) para a GUI, como antes."""
+
+    def resolve_command(
+        self, ctx: click.Context, args: list[str]
+    ) -> tuple[str | None, click.Command | None, list[str]]:
+        if args and args[0] not in self.commands:
+            args = ["gui", *args]
+        return super().resolve_command(ctx, args)
+
+
+@click.group(cls=_DefaultGroup, invoke_without_command=True)
 @click.option("--no-gpu", is_flag=True, default=False, help="Desabilita aceleração GPU/CUDA.")
 @click.option("--debug", is_flag=True, default=False, help="Habilita logs de debug.")
 @click.option(
@@ -31,17 +47,33 @@ from utils.file_utils import setup_logging
     default=False,
     help="Modo lote: PATH deve ser um diretório de PDFs.",
 )
-def main(path: str | None, no_gpu: bool, debug: bool, batch: bool) -> None:
-    """PDForge — Manipulação avançada de PDFs via GUI."""
+@click.pass_context
+def main(ctx: click.Context, no_gpu: bool, debug: bool, batch: bool) -> None:
+    """PDForge — Manipulação avançada de PDFs via GUI ou linha de comando."""
     debug = debug or os.environ.get("PDFFORGE_DEBUG", "").lower() in ("1", "true", "yes")
     logger = setup_logging(debug=debug)
     logger.info("PDForge iniciando (gpu=%s, debug=%s, batch=%s)", not no_gpu, debug, batch)
+    ctx.obj = {"use_gpu": not no_gpu, "debug": debug, "batch": batch}
+
+    if ctx.invoked_subcommand is None:
+        _launch(None, ctx.obj)
 
-    if batch:
-        _run_batch_cli(path, no_gpu, logger)
-        return
 
-    _run_gui(path, use_gpu=not no_gpu)
+@main.command("gui", hidden=True)
+@click.argument("path", required=False, type=click.Path(exists=False))
+@click.pass_obj
+def gui_command(obj: dict, path: str | None) -> None:
+    _launch(path, obj)
+
+
+register_commands(main)
+
+
+def _launch(path: str | None, obj: dict) -> None:
+    if obj["batch"]:
+        _run_batch_cli(path, not obj["use_gpu"])
+        return
+    _run_gui(path, use_gpu=obj["use_gpu"])
 
 
 def _run_gui(path: str | None, use_gpu: bool) -> None:
@@ -68,7 +100,7 @@ def _run_gui(path: str | None, use_gpu: bool) -> None:
     sys.exit(app.exec())
 
 
-def _run_batch_cli(path: str | None, no_gpu: bool, logger) -> None:
+def _run_batch_cli(path: str | None, no_gpu: bool) -> None:
     """Modo lote sem TUI — imprime relatório no terminal."""
     if not path:
         click.echo("Erro: forneça um diretório para o modo --batch.", err=True)
@@ -81,27 +113,19 @@ def _run_batch_cli(path: str | None, no_gpu: bool, logger) -> None:
 
     output_dir = input_dir.parent / "data_output"
 
+    from cli.common import emit_report
+    from core.batch_operations import OperationSpec
     from core.batch_processor import BatchProcessor
-    from core.metadata import PDFMetadata
 
     processor = BatchProcessor(output_dir)
 
-    def extract_op(doc, output_path: Path) -> str:
-        meta = PDFMetadata().read(doc)
-        return f"título='{meta.title[:40]}'"
-
     def on_progress(current: int, total: int, filename: str) -> None:
         click.echo(f"  [{current}/{total}] {filename}")
 
     click.echo(f"Processando PDFs em: {input_dir}")
-    report = processor.run(input_dir, extract_op, on_progress)
-    click.echo(f"\n{report.summary()}")
-
-    for result in report.results:
-        status = "OK  " if result.success else "ERRO"
-        click.echo(
-            f"  {status} | {result.path.name:<40} | {result.duration_s:.2f}s | {result.message}"
-        )
+    report = processor.run(input_dir, OperationSpec("metadata"), on_progress)
+    click.echo()
+    emit_report(report, "text")
 
 
 # "A mente que se abre a uma nova ideia jamais voltará ao seu tamanho original."
@@ -0,0 +1,221 @@
+"""
+Compara os backends de OCR (páginas/s e acurácia de caracteres) no mesmo conjunto de páginas.
+
+Uso:
+    python scripts/bench_ocr_backends.py                        # todos os backends instalados
+    python scripts/bench_ocr_backends.py --backend tesseract --gpu
+    python scripts/bench_ocr_backends.py --copies 4 --cpu-workers 4
+
+O conjunto de amostras vem junto com o script e é gerado de forma determinística
+(semente fixa), com o texto de referência de cada página: corpo de contrato em
+11 pt, nota de rodapé em 8 pt, títulos grandes, tabela de valores e uma página
+"digitalizada" com desfoque, ruído e leve inclinação. Cada página vira uma
+imagem a 150 dpi inserida no PDF, como em um escaneamento, então o resultado não
+depende de arquivos locais nem da camada de texto.
+
+Acurácia = 1 - distância de edição / caracteres da referência, com espaços
+normalizados, por amostra e no total. O carregamento do modelo e uma página de
+aquecimento ficam fora da medição; o cache de OCR fica desligado. Backends sem
+a biblioteca instalada são listados como indisponíveis.
+"""
+
+import argparse
+import logging
+import sys
+import time
+from pathlib import Path
+
+import fitz
+import numpy as np
+from PIL import Image, ImageFilter
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from config.settings import OCR_BATCH_MAX_PAGES  # noqa: E402
+from core.ocr_backends import available_backends  # noqa: E402
+from core.ocr_engine import OCREngine  # noqa: E402
+
+logger = logging.getLogger("pdfforge.scripts.bench_ocr_backends")
+
+_SEED = 20240501
+_SAMPLES: dict[str, tuple[float, list[str]]] = {
+    "contrato 11 pt": (
+        11,
+        [
+            "CONTRATO DE PRESTAÇÃO DE SERVIÇOS",
+            "As partes acima qualificadas celebram o presente instrumento,",
+            "que se regerá pelas cláusulas e condições seguintes.",
+            "Cláusula primeira: o objeto deste contrato é a digitalização",
+            "de documentos do acervo, com entrega mensal em PDF pesquisável.",
+        ],
+    ),
+    "rodapé 8 pt": (
+        8,
+        [
+            "Nota 1: valores reajustados anualmente pelo IPCA acumulado no período.",
+            "Nota 2: a rescisão antecipada implica multa de 10% sobre o saldo.",
+            "Documento assinado eletronicamente conforme MP nº 2.200-2/2001.",
+        ],
+    ),
+    "títulos 24 pt": (
+        24,
+        ["RELATÓRIO ANUAL", "Exercício de 2023", "Diretoria Financeira"],
+    ),
+    "tabela 10 pt": (
+        10,
+        [
+            "Item    Quantidade    Valor unitário    Total",
+            "Digitalização    1.200    R$ 0,45    R$ 540,00",
+            "Indexação    1.200    R$ 0,30    R$ 360,00",
+            "Armazenamento    12    R$ 89,90    R$ 1.078,80",
+        ],
+    ),
+}
+_NOISY = "digitalizado 11 pt"
+
+
+def _render_sample(fontsize: float, lines: list[str]) -> Image.Image:
+    source = fitz.open()
+    page = source.new_page()
+    for i, line in enumerate(lines):
+        page.insert_text((60, 90 + i * fontsize * 1.8), line, fontsize=fontsize)
+    pix = page.get_pixmap(dpi=150, colorspace=fitz.csGRAY, alpha=False)
+    image = Image.frombytes("L", (pix.width, pix.height), pix.samples)
+    source.close()
+    return image
+
+
+def _degrade(image: Image.Image, rng: np.random.Generator) -> Image.Image:
+    """Simula um escaneamento ruim: leve inclinação, desfoque e ruído."""
+    image = image.rotate(0.8, fillcolor=255, resample=Image.Resampling.BILINEAR)
+    image = image.filter(ImageFilter.GaussianBlur(0.7))
+    noisy = np.asarray(image, dtype=np.float32) + rng.normal(0, 18, (image.height, image.width))
+    return Image.fromarray(np.clip(noisy, 0, 255).astype(np.uint8))
+
+
+def build_sample_set(copies: int = 1) -> tuple[fitz.Document, list[tuple[str, str]]]:
+    """PDF com as amostras (copies vezes) e [(nome, texto de referência)] por página."""
+    rng = np.random.default_rng(_SEED)
+    samples = dict(_SAMPLES)
+    samples[_NOISY] = _SAMPLES["contrato 11 pt"]
+    doc = fitz.open()
+    truth = []
+    for _ in range(copies):
+        for name, (fontsize, lines) in samples.items():
+            image = _render_sample(fontsize, lines)
+            if name == _NOISY:
+                image = _degrade(image, rng)
+            page = doc.new_page()
+            page.insert_image(
+                page.rect,
+                pixmap=fitz.Pixmap(fitz.csGRAY, image.width, image.height, image.tobytes(), False),
+            )
+            truth.append((name, "\n".join(lines)))
+    return doc, truth
+
+
+def _normalize(text: str) -> str:
+    return " ".join(text.split())
+
+
+def edit_distance(a: str, b: str) -> int:
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb)))
+        previous = current
+    return previous[-1]
+
+
+def char_accuracy(reference: str, hypothesis: str) -> float:
+    reference, hypothesis = _normalize(reference), _normalize(hypothesis)
+    if not reference:
+        return 1.0 if not hypothesis else 0.0
+    return max(0.0, 1 - edit_distance(reference, hypothesis) / len(reference))
+
+
+def bench_backend(
+    name: str,
+    doc: fitz.Document,
+    truth: list[tuple[str, str]],
+    args: argparse.Namespace,
+) -> dict | None:
+    engine = OCREngine(
+        languages=args.lang or ["pt", "en"],
+        use_gpu=args.gpu,
+        backend=name,
+        cpu_workers=args.cpu_workers,
+    )
+    try:
+        try:
+            engine.recognize_document(
+                doc, page_indices=list(range(min(doc.page_count, engine.batch_pages)))
+            )
+        except RuntimeError as exc:
+            logger.info("%-10s indisponível: %s", name, exc)
+            return None
+        best = float("inf")
+        results = {}
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            results = engine.recognize_document(doc, batch_pages=OCR_BATCH_MAX_PAGES)
+            best = min(best, time.perf_counter() - start)
+    finally:
+        engine.close()
+
+    by_sample: dict[str, list[float]] = {}
+    for page_num, (sample, reference) in enumerate(truth):
+        by_sample.setdefault(sample, []).append(char_accuracy(reference, results[page_num].text))
+    return {
+        "pages_s": doc.page_count / best,
+        "accuracy": {sample: sum(v) / len(v) for sample, v in by_sample.items()},
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--backend", action="append", help="Backend (repita); padrão: todos.")
+    parser.add_argument("--copies", type=int, default=2, help="Cópias do conjunto de amostras.")
+    parser.add_argument("--repeat", type=int, default=2, help="Repetições (vale a melhor).")
+    parser.add_argument("--lang", action="append", help="Idioma do OCR (repita para vários).")
+    parser.add_argument("--gpu", action="store_true", help="Usa CUDA nos backends que suportam.")
+    parser.add_argument("--cpu-workers", type=int, default=1, help="Processos de OCR em CPU.")
+    args = parser.parse_args()
+
+    doc, truth = build_sample_set(args.copies)
+    samples = list(dict.fromkeys(name for name, _ in truth))
+    reports = {}
+    for name in args.backend or available_backends():
+        report = bench_backend(name, doc, truth, args)
+        if report is not None:
+            reports[name] = report
+    doc.close()
+    if not reports:
+        logger.info("Nenhum backend de OCR disponível.")
+        return
+
+    logger.info("%d páginas (%d amostras × %d)", len(truth), len(samples), args.copies)
+    logger.info("%-30s" + "  %10s" * len(reports), "", *reports)
+    logger.info(
+        "%-30s" + "  %10.2f" * len(reports), "páginas/s", *(r["pages_s"] for r in reports.values())
+    )
+    for sample in samples:
+        logger.info(
+            "%-30s" + "  %9.1f%%" * len(reports),
+            f"acurácia {sample}",
+            *(100 * r["accuracy"][sample] for r in reports.values()),
+        )
+    logger.info(
+        "%-30s" + "  %9.1f%%" * len(reports),
+        "acurácia média",
+        *(100 * sum(r["accuracy"].values()) / len(samples) for r in reports.values()),
+    )
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    main()
+
+
+# "Não se gerencia o que não se mede." — William Edwards Deming
@@ -0,0 +1,214 @@
+"""
+Mede a vazão do OCR (páginas/s) para diferentes tamanhos de lote de inferência.
+
+Uso:
+    python scripts/bench_ocr_batch.py                  # CPU, lotes 1, 2, 4 e 8
+    python scripts/bench_ocr_batch.py --pages 32 --gpu --sizes 1,2,4
+    python scripts/bench_ocr_batch.py --raster         # só a entrega da imagem ao motor
+    python scripts/bench_ocr_batch.py --pipeline --pages 120   # render em paralelo ou não
+    python scripts/bench_ocr_batch.py --pipeline --simulate 40 # sem modelo: 40 ms/página
+    python scripts/bench_ocr_batch.py --cpu-workers 4 --pages 32  # 1 processo × 4 processos
+
+As páginas são sintéticas (texto rasterizado como imagem, como em um PDF
+escaneado), então o resultado não depende de arquivos locais. O carregamento do
+modelo e uma página de aquecimento ficam fora da medição. Com --raster, compara
+por página a entrega antiga (PNG codificado e decodificado de volta) com a view
+NumPy em cinza do pixmap, em OCR_IMAGE_SCALE, sem carregar o modelo. Com
+--pipeline, compara a rasterização em sequência com a rasterização à frente em
+outra thread (OCR_RENDER_AHEAD_PAGES). --simulate troca o EasyOCR por um
+reconhecedor que só espera N ms por página, liberando o GIL como a inferência
+do torch, para medir a sobreposição em máquinas sem o modelo. --cpu-workers N
+compara, sem GPU, o motor em um processo com o pool de N processos de OCR
+(OCR_CPU_THREADS_PER_WORKER threads cada); a carga dos modelos fica de fora.
+"""
+
+import argparse
+import io
+import logging
+import sys
+import time
+from pathlib import Path
+
+import fitz
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from config.settings import (  # noqa: E402
+    OCR_BATCH_MAX_PAGES,
+    OCR_CPU_THREADS_PER_WORKER,
+    OCR_IMAGE_SCALE,
+    OCR_RENDER_AHEAD_PAGES,
+)
+from core.ocr_engine import OCREngine, pixmap_view  # noqa: E402
+
+logger = logging.getLogger("pdfforge.scripts.bench_ocr")
+
+_LINES = (
+    "CONTRATO DE PRESTAÇÃO DE SERVIÇOS Nº {n}",
+    "As partes acima qualificadas celebram o presente instrumento,",
+    "que se regerá pelas cláusulas e condições seguintes.",
+    "Cláusula primeira: o objeto deste contrato é a digitalização",
+    "de documentos do acervo, com entrega mensal em PDF pesquisável.",
+    "Valor total: R$ 12.345,67 — pagamento em 30 dias.",
+)
+
+
+def build_scanned_pdf(pages: int) -> fitz.Document:
+    """PDF em memória com páginas A4 que contêm apenas uma imagem do texto."""
+    source = fitz.open()
+    scanned = fitz.open()
+    for n in range(pages):
+        page = source.new_page()
+        for i, line in enumerate(_LINES):
+            page.insert_text((60, 90 + i * 28), line.format(n=n + 1), fontsize=13)
+        pix = page.get_pixmap(dpi=150)
+        target = scanned.new_page(width=page.rect.width, height=page.rect.height)
+        target.insert_image(target.rect, pixmap=pix)
+    source.close()
+    return scanned
+
+
+class _SimulatedReader:
+    """Espera ms por página no lugar da inferência, sem reter o GIL."""
+
+    def __init__(self, ms: float) -> None:
+        self._seconds = ms / 1000
+
+    def readtext(self, image, detail=1, paragraph=False):
+        time.sleep(self._seconds)
+        return []
+
+    def readtext_batched(self, images, detail=1, paragraph=False, batch_size=1):
+        time.sleep(self._seconds * len(images))
+        return [[] for _ in images]
+
+
+def bench(
+    engine: OCREngine,
+    doc: fitz.Document,
+    batch_pages: int,
+    repeat: int,
+    render_ahead: int = OCR_RENDER_AHEAD_PAGES,
+) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        engine.recognize_document(doc, batch_pages=batch_pages, render_ahead=render_ahead)
+        best = min(best, time.perf_counter() - start)
+    return doc.page_count / best
+
+
+def bench_pipeline(engine: OCREngine, doc: fitz.Document, repeat: int) -> None:
+    sequential = bench(engine, doc, OCR_BATCH_MAX_PAGES, repeat, render_ahead=0)
+    overlapped = bench(engine, doc, OCR_BATCH_MAX_PAGES, repeat)
+    logger.info("Render × reconhecimento, lote de %d páginas:", OCR_BATCH_MAX_PAGES)
+    logger.info("%22s  %8.2f páginas/s", "em sequência", sequential)
+    logger.info("%22s  %8.2f páginas/s", f"{OCR_RENDER_AHEAD_PAGES} páginas à frente", overlapped)
+    logger.info("%22s  %8.2fx", "ganho", overlapped / sequential)
+
+
+def bench_cpu_pool(doc: fitz.Document, languages: list[str], workers: int, repeat: int) -> None:
+    rates = {}
+    for count in (1, workers):
+        engine = OCREngine(languages=languages, use_gpu=False, cpu_workers=count)
+        try:
+            engine.recognize_document(doc, page_indices=list(range(count)))  # carrega os modelos
+            rates[count] = bench(engine, doc, OCR_BATCH_MAX_PAGES, repeat)
+        finally:
+            engine.close()
+    logger.info("OCR em CPU, %d threads por processo:", OCR_CPU_THREADS_PER_WORKER)
+    for count, rate in rates.items():
+        logger.info("%3d processos  %8.2f páginas/s  %6.2fx", count, rate, rate / rates[1])
+
+
+def _png_roundtrip(page: fitz.Page) -> np.ndarray:
+    """Caminho anterior: PNG RGB codificado pelo MuPDF e decodificado pelo motor."""
+    png = page.get_pixmap(matrix=fitz.Matrix(OCR_IMAGE_SCALE, OCR_IMAGE_SCALE)).tobytes("png")
+    try:
+        import cv2
+
+        return cv2.imdecode(np.frombuffer(png, np.uint8), cv2.IMREAD_COLOR)
+    except ImportError:
+        from PIL import Image
+
+        return np.asarray(Image.open(io.BytesIO(png)))
+
+
+def bench_raster(engine: OCREngine, doc: fitz.Document, repeat: int) -> None:
+    def _view(page: fitz.Page) -> int:
+        pix = engine._render(page)
+        return int(pixmap_view(pix)[0, 0])
+
+    timings = {}
+    for name, handoff in (("PNG", _png_roundtrip), ("view cinza", _view)):
+        best = float("inf")
+        for _ in range(repeat):
+            start = time.perf_counter()
+            for page in doc:
+                handoff(page)
+            best = min(best, time.perf_counter() - start)
+        timings[name] = best * 1000 / doc.page_count
+    logger.info("Entrega da página ao motor (escala %.1f):", OCR_IMAGE_SCALE)
+    for name, ms in timings.items():
+        logger.info("%12s  %7.2f ms/página", name, ms)
+    logger.info("%12s  %7.1fx", "ganho", timings["PNG"] / timings["view cinza"])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--pages", type=int, default=16, help="Páginas sintéticas.")
+    parser.add_argument(
+        "--sizes", default="1,2,4,8", help="Tamanhos de lote separados por vírgula."
+    )
+    parser.add_argument("--repeat", type=int, default=2, help="Repetições (vale a melhor).")
+    parser.add_argument("--lang", action="append", help="Idioma do OCR (repita para vários).")
+    parser.add_argument("--gpu", action="store_true", help="Usa CUDA se disponível.")
+    parser.add_argument("--raster", action="store_true", help="Mede só a rasterização.")
+    parser.add_argument(
+        "--pipeline", action="store_true", help="Compara render em sequência e à frente."
+    )
+    parser.add_argument(
+        "--simulate", type=float, metavar="MS", help="Reconhecedor simulado (ms por página)."
+    )
+    parser.add_argument(
+        "--cpu-workers", type=int, metavar="N", help="Compara 1 e N processos de OCR em CPU."
+    )
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(",")]
+    doc = build_scanned_pdf(args.pages)
+    if args.cpu_workers:
+        bench_cpu_pool(doc, args.lang or ["pt", "en"], args.cpu_workers, args.repeat)
+        doc.close()
+        return
+    engine = OCREngine(languages=args.lang or ["pt", "en"], use_gpu=args.gpu)
+    if args.raster:
+        bench_raster(engine, doc, args.repeat)
+        doc.close()
+        return
+    if args.simulate is not None:
+        engine._reader = _SimulatedReader(args.simulate)
+    engine.recognize_page(doc[0])  # carrega o modelo e aquece
+
+    if args.pipeline:
+        logger.info("%d páginas escaneadas", doc.page_count)
+        bench_pipeline(engine, doc, args.repeat)
+        doc.close()
+        return
+    logger.info("%d páginas, %s", doc.page_count, "GPU" if args.gpu else "CPU")
+    logger.info("%6s  %10s  %8s", "lote", "páginas/s", "ganho")
+    baseline = None
+    for size in sizes:
+        rate = bench(engine, doc, size, args.repeat)
+        baseline = baseline or rate
+        logger.info("%6d  %10.2f  %7.2fx", size, rate, rate / baseline)
+    doc.close()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    main()
+
+
+# "Medir é saber." — Lord Kelvin
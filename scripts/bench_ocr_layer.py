@@ -0,0 +1,143 @@
+"""
+Compara a gravação da camada de texto do OCR: insert_text por palavra × insert_text_layer.
+
+Uso:
+    python scripts/bench_ocr_layer.py                  # 200 páginas, ~500 palavras cada
+    python scripts/bench_ocr_layer.py --pages 20 --lines 20
+
+O documento simula um escaneamento (uma imagem por página), e as caixas do OCR
+são sintéticas e determinísticas (semente fixa), a OCR_IMAGE_SCALE, como as
+devolvidas pelo motor. O método antigo é o de save_ocr_layer até aqui:
+page.insert_text por palavra, em branco e com overlay. O novo é
+core/ocr_layer.insert_text_layer: um content stream por página, em modo de
+renderização 3, com Tz ajustando a largura à caixa. Mede o tempo de escrita da
+camada, o do doc.save(garbage=4, deflate=True) e o tamanho do arquivo, e confere
+se as palavras extraídas da saída batem com as inseridas.
+"""
+
+import argparse
+import io
+import logging
+import random
+import sys
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+import fitz
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from config.settings import OCR_IMAGE_SCALE  # noqa: E402
+from core.ocr_layer import insert_text_layer  # noqa: E402
+
+logger = logging.getLogger("pdfforge.scripts.bench_ocr_layer")
+
+_SEED = 20240917
+_WORDS = (
+    "contrato prestação serviços cláusula objeto digitalização documentos acervo "
+    "entrega mensal pesquisável valores reajustados anualmente IPCA rescisão multa "
+    "saldo R$ 1.078,80 nº 2.200-2/2001 (anexo) §3º"
+).split()
+
+
+def build_scan(pages: int) -> fitz.Document:
+    doc = fitz.open()
+    pix = fitz.Pixmap(fitz.csGRAY, fitz.IRect(0, 0, 1240, 1754), False)  # A4 a 150 dpi
+    pix.clear_with(235)
+    for _ in range(pages):
+        page = doc.new_page()
+        page.insert_image(page.rect, pixmap=pix)
+    return doc
+
+
+def synthetic_details(lines: int, rng: random.Random, scale: float) -> list[tuple]:
+    """Palavras em linhas de corpo 11 pt, caixas em pixels a scale."""
+    details = []
+    for line in range(lines):
+        y0 = 60 + line * 14.0
+        x = 40.0
+        while True:
+            word = rng.choice(_WORDS)
+            width = len(word) * 5.6
+            if x + width > 555:
+                break
+            box = [[x, y0], [x + width, y0], [x + width, y0 + 11], [x, y0 + 11]]
+            details.append(([[px * scale, py * scale] for px, py in box], word, 0.9))
+            x += width + 4
+    return details
+
+
+def legacy_layer(page: fitz.Page, details: list[tuple], scale: float) -> None:
+    """Camada como era gravada antes: um insert_text branco por palavra."""
+    for bbox, text, _conf in details:
+        x0 = min(p[0] for p in bbox) / scale
+        y0 = min(p[1] for p in bbox) / scale
+        y1 = max(p[1] for p in bbox) / scale
+        page.insert_text(
+            fitz.Point(x0, y1),
+            text,
+            fontsize=max(1.0, (y1 - y0) * 0.8),
+            color=(1, 1, 1),
+            overlay=True,
+        )
+
+
+def bench(
+    writer: Callable[[fitz.Page, list[tuple], float], None],
+    pages: list[list[tuple]],
+    scale: float,
+) -> dict:
+    doc = build_scan(len(pages))
+    start = time.perf_counter()
+    for page, details in zip(doc, pages):
+        writer(page, details, scale)
+    write_s = time.perf_counter() - start
+    buffer = io.BytesIO()
+    start = time.perf_counter()
+    doc.save(buffer, garbage=4, deflate=True)
+    save_s = time.perf_counter() - start
+    doc.close()
+    with fitz.open(stream=buffer.getvalue(), filetype="pdf") as out:
+        extracted = sum(len(page.get_text("words")) for page in out)
+    return {
+        "write_s": write_s,
+        "save_s": save_s,
+        "size_kb": len(buffer.getvalue()) / 1024,
+        "words": extracted,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--pages", type=int, default=200, help="Páginas do escaneamento.")
+    parser.add_argument("--lines", type=int, default=50, help="Linhas de texto por página.")
+    args = parser.parse_args()
+
+    rng = random.Random(_SEED)
+    pages = [synthetic_details(args.lines, rng, OCR_IMAGE_SCALE) for _ in range(args.pages)]
+    words = sum(len(details) for details in pages)
+    reports = {
+        "insert_text por palavra": bench(legacy_layer, pages, OCR_IMAGE_SCALE),
+        "insert_text_layer": bench(insert_text_layer, pages, OCR_IMAGE_SCALE),
+    }
+
+    logger.info("%d páginas, %d palavras", args.pages, words)
+    logger.info("%-26s  %10s  %10s  %10s  %10s", "", "escrita s", "save s", "KB", "palavras")
+    for name, r in reports.items():
+        logger.info(
+            "%-26s  %10.2f  %10.2f  %10.0f  %10d",
+            name,
+            r["write_s"],
+            r["save_s"],
+            r["size_kb"],
+            r["words"],
+        )
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    main()
+
+
+# "O tempo é o mais sábio de todos os conselheiros." — Péricles
@@ -0,0 +1,199 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import fitz
+import pytest
+from click.testing import CliRunner
+
+import main as entry
+from cli.common import collect_pdfs, parse_pages, parse_ranges
+
+ROOT = Path(__file__).resolve().parents[2]
+
+
+def _make_pdf(path: Path, pages: int) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    doc = fitz.open()
+    for i in range(pages):
+        doc.new_page().insert_text((50, 100), f"Pagina {i + 1}", fontsize=12)
+    doc.save(str(path))
+    doc.close()
+    return path
+
+
+@pytest.fixture()
+def tree(tmp_path):
+    _make_pdf(tmp_path / "in" / "a.pdf", 3)
+    _make_pdf(tmp_path / "in" / "b.pdf", 4)
+    _make_pdf(tmp_path / "in" / "sub" / "a.pdf", 2)
+    return tmp_path
+
+
+def _invoke(*args: str):
+    return CliRunner().invoke(entry.main, list(args), catch_exceptions=False)
+
+
+def test_parse_pages_and_ranges():
+    assert parse_pages("1-3,5") == [0, 1, 2, 4]
+    assert parse_ranges("1-2,4-6") == [(0, 1), (3, 5)]
+
+
+def test_collect_pdfs_recursive(tree):
+    flat = collect_pdfs([str(tree / "in")], recursive=False)
+    deep = collect_pdfs([str(tree / "in"), str(tree / "in" / "a.pdf")], recursive=True)
+    assert [p.name for p in flat] == ["a.pdf", "b.pdf"]
+    assert len(deep) == 3
+
+
+def test_rotate_recursive_json_report(tree):
+    out = tree / "out"
+    result = _invoke(
+        "rotate", "--angle", "180", "-r", "--report", "json", "-o", str(out), str(tree / "in")
+    )
+    assert result.exit_code == 0
+    report = json.loads(result.stdout)
+    assert report["succeeded"] == 3
+    assert (out / "sub" / "a_edited.pdf").exists()
+    doc = fitz.open(str(out / "b_edited.pdf"))
+    assert doc[0].rotation == 180
+    doc.close()
+
+
+def test_split_ranges(tree):
+    out = tree / "out"
+    result = _invoke("split", "--ranges", "1-2,3-4", "-o", str(out), str(tree / "in" / "b.pdf"))
+    assert result.exit_code == 0
+    parts = sorted((out / "b").glob("*.pdf"))
+    assert len(parts) == 2
+
+
+def test_organize_and_merge(tree):
+    out = tree / "out"
+    result = _invoke("organize", "--order", "3,1", "-o", str(out), str(tree / "in" / "a.pdf"))
+    assert result.exit_code == 0
+    doc = fitz.open(str(out / "a_edited.pdf"))
+    assert doc.page_count == 2
+    assert doc[0].get_text().strip() == "Pagina 3"
+    doc.close()
+
+    merged = tree / "merged.pdf"
+    result = _invoke("merge", "-o", str(merged), str(tree / "in" / "a.pdf"), str(tree / "in"))
+    assert result.exit_code == 0
+    doc = fitz.open(str(merged))
+    assert doc.page_count == 7
+    doc.close()
+
+
+def test_merge_only_accepts_recursive_and_report(tree):
+    merged = tree / "merged.pdf"
+    result = _invoke("merge", "-r", "--report", "json", "-o", str(merged), str(tree / "in"))
+    assert result.exit_code == 0
+    assert json.loads(result.stdout)["succeeded"] == 1
+    for option in ("--jobs", "--dedupe", "--estimate"):
+        result = CliRunner().invoke(entry.main, ["merge", option, "-o", str(merged), str(tree)])
+        assert result.exit_code == 2, option
+        assert "No such option" in result.output
+
+
+def test_failures_set_exit_code(tree):
+    broken = tree / "in" / "quebrado.pdf"
+    broken.write_bytes(b"nao e pdf")
+    result = _invoke("compress", "-o", str(tree / "out"), str(broken))
+    assert result.exit_code == 1
+
+
+def test_ocr_closes_shared_engines_even_on_failure(tree, monkeypatch):
+    import core.ocr_engine
+
+    closed = []
+    monkeypatch.setattr(core.ocr_engine, "close_shared_engines", lambda: closed.append(True))
+    monkeypatch.setattr("cli.commands.run_operation", lambda *a: sys.exit(1))
+    result = _invoke("ocr", "-o", str(tree / "out"), str(tree / "in" / "a.pdf"))
+    assert result.exit_code == 1
+    assert closed == [True]
+
+
+def test_watermark_requires_text_or_image(tree):
+    result = CliRunner().invoke(entry.main, ["watermark", str(tree / "in" / "a.pdf")])
+    assert result.exit_code == 2
+
+
+def test_pdf_argument_still_opens_gui(tree, monkeypatch):
+    calls = []
+    monkeypatch.setattr(entry, "_run_gui", lambda path, use_gpu: calls.append((path, use_gpu)))
+    result = _invoke("--no-gpu", str(tree / "in" / "a.pdf"))
+    assert result.exit_code == 0
+    assert calls == [(str(tree / "in" / "a.pdf"), False)]
+
+
+def test_cli_does_not_import_heavy_modules(tree):
+    code = (
+        "import sys\n"
+        "from click.testing import CliRunner\n"
+        "import main\n"
+        f"r = CliRunner().invoke(main.main, ['rotate', '-o', {str(tree / 'o')!r}, "
+        f"{str(tree / 'in' / 'a.pdf')!r}])\n"
+        "assert r.exit_code == 0, r.output\n"
+        "heavy = ('PyQt6', 'torch', 'cv2', 'easyocr', 'core.ocr_engine', 'utils.gpu_utils')\n"
+        "print(','.join(m for m in heavy if m in sys.modules))\n"
+    )
+    proc = subprocess.run(
+        [sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True
+    )
+    assert proc.stdout.strip() == ""
+
+
+def test_watch_rejects_invalid_operation(tree):
+    result = CliRunner().invoke(entry.main, ["watch", str(tree / "in"), "--operation", "xyz"])
+    assert result.exit_code == 2
+    result = CliRunner().invoke(entry.main, ["watch", str(tree / "in"), "--params", "{nao json"])
+    assert result.exit_code == 2
+    result = CliRunner().invoke(
+        entry.main, ["watch", str(tree / "in"), "--operation", "rotate", "--params", '{"x": 1}']
+    )
+    assert result.exit_code == 2
+    assert "desconhecido" in result.output
+
+
+def test_replace_pairs(tree):
+    out = tree / "out_replace"
+    result = _invoke(
+        "replace", "--pair", "Pagina=Folha", "-o", str(out), str(tree / "in" / "a.pdf")
+    )
+    assert result.exit_code == 0
+    doc = fitz.open(str(next(out.glob("*.pdf"))))
+    assert "Folha" in doc[1].get_text()
+    doc.close()
+    result = CliRunner().invoke(entry.main, ["replace", "--pair", "sem-igual", str(tree / "in")])
+    assert result.exit_code == 2
+
+
+def test_dedupe_option_reports_duplicates(tree):
+    (tree / "in" / "c.pdf").write_bytes((tree / "in" / "a.pdf").read_bytes())
+    out = tree / "out_dedupe"
+    result = _invoke(
+        "rotate", "--dedupe", "copy", "--report", "json", "-o", str(out), str(tree / "in")
+    )
+    assert result.exit_code == 0
+    report = json.loads(result.stdout)
+    assert report["duplicates"] == 1
+    (duplicate,) = [r for r in report["results"] if r["duplicate_of"]]
+    assert Path(duplicate["path"]).name == "c.pdf"
+    assert (out / "c_edited.pdf").read_bytes() == (out / "a_edited.pdf").read_bytes()
+
+
+def test_estimate_option_prints_prediction(tree, monkeypatch):
+    import core.batch_journal
+
+    monkeypatch.setattr(core.batch_journal, "DEFAULT_JOURNAL_PATH", tree / "journal.sqlite3")
+    args = ("rotate", "--estimate", "-o", str(tree / "out_eta"), str(tree / "in"))
+    first = _invoke(*args)
+    assert first.exit_code == 0
+    assert "2 arquivos, 7 páginas" in first.stderr
+    assert "sem histórico" in first.stderr
+
+    second = _invoke(*args)
+    assert "estimativa" in second.stderr
+    assert "restam" in second.stderr
@@ -0,0 +1,117 @@
+import sqlite3
+
+import fitz
+
+from core.batch_estimator import (
+    BatchEstimate,
+    BatchEstimator,
+    FileProbe,
+    LiveETA,
+    format_duration,
+    quick_content_type,
+)
+from core.batch_journal import BatchJournal
+from core.batch_operations import OperationSpec
+from core.batch_processor import BatchProcessor, FileResult
+
+
+def _make_pdf(path, pages=2):
+    doc = fitz.open()
+    for i in range(pages):
+        doc.new_page().insert_text((50, 100), f"Texto da pagina {i + 1} do documento.")
+    doc.save(str(path))
+    doc.close()
+    return path
+
+
+def _make_scan(path):
+    doc = fitz.open()
+    page = doc.new_page()
+    pix = fitz.Pixmap(fitz.csRGB, fitz.IRect(0, 0, 20, 20), False)
+    pix.clear_with(200)
+    page.insert_image(page.rect, pixmap=pix)
+    doc.save(str(path))
+    doc.close()
+    return path
+
+
+def test_quick_content_type(tmp_path):
+    with fitz.open(str(_make_pdf(tmp_path / "texto.pdf"))) as doc:
+        assert quick_content_type(doc) == "TEXT_ONLY"
+    with fitz.open(str(_make_scan(tmp_path / "scan.pdf"))) as doc:
+        assert quick_content_type(doc) == "SCANNED"
+
+
+def test_format_duration():
+    assert format_duration(42) == "42s"
+    assert format_duration(12 * 60) == "12min"
+    assert format_duration(3900) == "1h05"
+
+
+def test_estimate_without_history(tmp_path):
+    paths = [_make_pdf(tmp_path / f"d{i}.pdf", pages=3) for i in range(2)]
+    estimate = BatchEstimator().estimate(paths, "rotate")
+    assert estimate.pages == 6
+    assert estimate.pages_by_type == {"TEXT_ONLY": 6}
+    assert estimate.eta_s is None
+    assert estimate.confidence == "nenhuma"
+    assert "sem histórico" in estimate.summary()
+
+
+def test_estimate_uses_journal_history(tmp_path):
+    paths = [_make_pdf(tmp_path / f"d{i}.pdf", pages=4) for i in range(6)]
+    with BatchJournal(tmp_path / "journal.sqlite3") as journal:
+        estimator = BatchEstimator(journal, host="maquina-a")
+        probes = [estimator.probe(p) for p in paths]
+        assert journal.find_probe(paths[0]) == (4, "TEXT_ONLY")
+
+        BatchProcessor(tmp_path / "out", journal=journal).run(
+            tmp_path, OperationSpec("rotate", {"angle": 90}), file_list=paths
+        )
+        rates = journal.page_rates("rotate")
+        assert len(rates) == 6
+        assert all(r.pages == 4 and r.content_type == "TEXT_ONLY" for r in rates)
+
+        # o histórico gravado pelo lote vem de outra máquina para esta instância
+        estimate = estimator.estimate(paths, "rotate", workers=2, probes=probes)
+        assert estimate.basis == "outras máquinas"
+        assert estimate.samples == 6
+        assert estimate.low_s <= estimate.eta_s <= estimate.high_s
+        assert estimate.workers == 2
+        assert "estimativa" in estimate.summary()
+
+
+def test_journal_migrates_old_schema(tmp_path):
+    db = tmp_path / "antigo.sqlite3"
+    conn = sqlite3.connect(str(db))
+    conn.execute(
+        "CREATE TABLE files (id INTEGER PRIMARY KEY, run_id INTEGER, path TEXT, size INTEGER,"
+        " mtime REAL, operation TEXT, params TEXT, success INTEGER, message TEXT,"
+        " output_path TEXT, duration_s REAL, finished_at REAL)"
+    )
+    conn.close()
+    with BatchJournal(db) as journal:
+        run_id = journal.start_run("rotate", {})
+        journal.record(run_id, db, "rotate", {}, True, "OK", 1.0, pages=3)
+        assert journal.page_rates("rotate")[0].pages_per_s == 3.0
+
+
+def test_live_eta_blends_history_and_live_rate(tmp_path):
+    probes = [FileProbe(tmp_path / f"d{i}.pdf", 50, 0, "SCANNED") for i in range(2)]
+    estimate = BatchEstimate("ocr", files=2, pages=100, pages_per_s=1.0, eta_s=100.0)
+    estimate.low_s, estimate.high_s = 80.0, 150.0
+    live = LiveETA(estimate, probes, prior_pages=50)
+
+    eta, low, high = live.remaining(now=live._start)
+    assert eta == 100.0 and (low, high) == (80.0, 150.0)
+
+    # primeiro arquivo levou 10s para 50 páginas: vazão real 5x o histórico
+    live.observe(FileResult(path=probes[0].path, success=True, duration_s=10.0, pages=50))
+    eta, low, high = live.remaining(now=live._start + 10.0)
+    assert eta == 50 / ((50 + 50) / (50 / 1.0 + 10.0))
+    assert low < eta < high
+    assert high - low < 70  # faixa mais estreita com metade do lote concluída
+
+    cached = FileResult(path=probes[1].path, success=True, duration_s=0.0, cached=True)
+    live.observe(cached)
+    assert live.remaining() == (0.0, 0.0, 0.0)
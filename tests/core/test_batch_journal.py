@@ -0,0 +1,77 @@
+import sqlite3
+
+import fitz
+
+from core.batch_journal import BatchJournal
+from core.batch_operations import OperationSpec
+from core.batch_processor import BatchProcessor
+
+
+def _make_pdf(path):
+    doc = fitz.open()
+    doc.new_page().insert_text((50, 100), path.stem, fontsize=12)
+    doc.save(str(path))
+    doc.close()
+    return path
+
+
+def test_record_and_find_completed(tmp_path):
+    pdf = _make_pdf(tmp_path / "a.pdf")
+    with BatchJournal(tmp_path / "journal.sqlite3") as journal:
+        run_id = journal.start_run("rotate", {"angle": 90})
+        journal.record(run_id, pdf, "rotate", {"angle": 90}, True, "OK", 0.5)
+        journal.finish_run(run_id)
+
+        assert journal.find_completed(pdf, "rotate", {"angle": 90}) is not None
+        assert journal.find_completed(pdf, "rotate", {"angle": 180}) is None
+
+        _make_pdf(pdf)  # arquivo regravado: tamanho/mtime mudam
+        pdf.write_bytes(pdf.read_bytes() + b"\n%%")
+        assert journal.find_completed(pdf, "rotate", {"angle": 90}) is None
+
+
+def test_resume_skips_completed_files(tmp_path):
+    files = [_make_pdf(tmp_path / f"doc_{i}.pdf") for i in range(3)]
+    spec = OperationSpec("rotate", {"angle": 90})
+    with BatchJournal(tmp_path / "journal.sqlite3") as journal:
+        processor = BatchProcessor(tmp_path / "out", journal=journal)
+        first = processor.run(tmp_path, spec, file_list=files[:2])
+        assert first.succeeded == 2
+
+        second = processor.run(tmp_path, spec, file_list=files, resume=True)
+        assert second.succeeded == 3
+        assert [r.skipped for r in second.results] == [True, True, False]
+        assert [r.path for r in second.results] == files
+
+        history = journal.throughput("rotate")
+        assert [stats.files for stats in history] == [1, 2]
+        assert history[1].files_per_s > 0
+
+
+def test_secret_params_are_not_stored(tmp_path):
+    files = [_make_pdf(tmp_path / f"doc_{i}.pdf") for i in range(2)]
+    journal_path = tmp_path / "journal.sqlite3"
+    encrypt = OperationSpec("encrypt", {"user_password": "S3cr3t!", "owner_password": "Dono#1"})
+    pipeline = OperationSpec(
+        "pipeline",
+        {"steps": [{"name": "encrypt", "params": {"user_password": "S3cr3t!"}}]},
+    )
+    with BatchJournal(journal_path) as journal:
+        processor = BatchProcessor(tmp_path / "out", journal=journal)
+        assert processor.run(tmp_path, encrypt, file_list=files[:1]).succeeded == 1
+        assert processor.run(tmp_path, pipeline, file_list=files[1:]).succeeded == 1
+        # o resumo é estável: a retomada reconhece os arquivos já concluídos
+        resumed = processor.run(tmp_path, encrypt, file_list=files[:1], resume=True)
+        assert [r.skipped for r in resumed.results] == [True]
+
+    raw = journal_path.read_bytes()
+    for suffix in ("-wal", "-shm"):
+        extra = journal_path.with_name(journal_path.name + suffix)
+        raw += extra.read_bytes() if extra.exists() else b""
+    assert b"S3cr3t!" not in raw and b"Dono#1" not in raw
+    with sqlite3.connect(str(journal_path)) as conn:
+        rows = [
+            p for (p,) in conn.execute("SELECT params FROM runs UNION ALL SELECT params FROM files")
+        ]
+    assert rows and all("S3cr3t!" not in p and "Dono#1" not in p for p in rows)
+    assert all("blake2b:" in p for p in rows)
@@ -0,0 +1,58 @@
+import json
+
+from core.batch_metrics import BatchMetrics, percentile, report_to_prometheus
+from core.batch_operations import OperationSpec
+from core.batch_processor import BatchProcessor, BatchReport, FileResult
+
+
+def test_percentile_nearest_rank():
+    samples = [float(v) for v in range(1, 101)]
+    assert percentile(samples, 50) == 50.0
+    assert percentile(samples, 95) == 95.0
+    assert percentile([], 50) == 0.0
+
+
+def test_metrics_summary_aggregates():
+    metrics = BatchMetrics()
+    metrics.add(
+        2.0, {"open": 0.5, "save": 1.0}, pages=10, input_bytes=2 * 1024 * 1024, output_bytes=1
+    )
+    metrics.add(1.0, {"open": 0.1}, pages=4, input_bytes=1024 * 1024, output_bytes=1)
+    summary = metrics.summary()
+    assert summary["pages"] == 14
+    assert summary["stages_s"]["open"]["max"] == 0.5
+    assert summary["pages_per_s"]["max"] == 5.0
+    assert summary["mb_per_s"]["p50"] == 1.0
+
+
+def test_skipped_results_do_not_count_in_metrics():
+    report = BatchReport()
+    report.add(FileResult(path=None, success=True, duration_s=0.0, skipped=True))  # type: ignore[arg-type]
+    assert report.total == 1
+    assert report.metrics.files == 0
+
+
+def test_batch_records_stages_and_exports(sample_multipage_path, tmp_output_dir):
+    processor = BatchProcessor(output_dir=tmp_output_dir / "metrics_out")
+    report = processor.run(
+        sample_multipage_path.parent,
+        OperationSpec("rotate", {"angle": 90}),
+        file_list=[sample_multipage_path],
+    )
+    result = report.results[0]
+    assert {"open", "operate", "save"} <= set(result.stages)
+    assert result.pages == 5
+    assert result.input_bytes > 0 and result.output_bytes > 0
+    assert sum(result.stages.values()) <= result.duration_s
+
+    data = json.loads(report.to_json())
+    assert data["metrics"]["pages"] == 5
+    assert "save" in data["metrics"]["stages_s"]
+
+    text = report_to_prometheus(report)
+    assert "# TYPE pdfforge_batch_stage_seconds gauge" in text
+    assert 'pdfforge_batch_stage_seconds{job="pdfforge_batch",stage="save",stat="p95"}' in text
+
+    prom_file = tmp_output_dir / "textfile" / "pdfforge.prom"
+    report.write_prometheus(prom_file)
+    assert prom_file.read_text(encoding="utf-8").startswith("# HELP")
@@ -0,0 +1,99 @@
+import json
+import pickle
+
+import fitz
+import pytest
+
+from core.batch_operations import (
+    OperationSpec,
+    get_operation,
+    is_cacheable,
+    list_operations,
+    operation_params,
+)
+
+
+def test_builtin_operations_registered():
+    names = list_operations()
+    assert {"metadata", "rotate", "ocr"} <= set(names)
+
+
+def test_unknown_operation_fails_early():
+    with pytest.raises(ValueError):
+        OperationSpec("inexistente")
+    with pytest.raises(ValueError):
+        get_operation("inexistente")
+
+
+def test_spec_is_picklable():
+    spec = OperationSpec("rotate", {"angle": 180})
+    restored = pickle.loads(pickle.dumps(spec))
+    assert restored == spec
+
+
+def test_spec_runs_operation(sample_pdf_path, tmp_output_dir):
+    output = tmp_output_dir / "spec_rotate.pdf"
+    doc = fitz.open(str(sample_pdf_path))
+    message = OperationSpec("rotate", {"angle": 90})(doc, output)
+    doc.close()
+    assert "90" in message
+    verify = fitz.open(str(output))
+    assert verify[0].rotation == 90
+    verify.close()
+
+
+def test_output_less_operations_are_not_cacheable():
+    assert is_cacheable("rotate")
+    assert not is_cacheable("split")
+    assert not is_cacheable("images")
+
+
+def test_organize_operation(sample_multipage_path, tmp_output_dir):
+    output = tmp_output_dir / "spec_organize.pdf"
+    doc = fitz.open(str(sample_multipage_path))
+    message = OperationSpec("organize", {"delete": [0, 1], "reverse": True})(doc, output)
+    doc.close()
+    assert message == "3 de 5 páginas"
+    verify = fitz.open(str(output))
+    assert "Pagina 5" in verify[0].get_text()
+    verify.close()
+
+
+def test_every_operation_declares_json_params():
+    for name in list_operations():
+        for param in operation_params(name):
+            json.dumps(param.default)
+            assert param.choices == () or param.default in param.choices
+
+
+def test_params_are_validated_and_coerced():
+    spec = OperationSpec("rotate", {"angle": "180"})
+    assert spec.params == {"angle": 180}
+    assert OperationSpec("split", {"ranges": [(0, 1)]}).params == {"ranges": [[0, 1]]}
+    with pytest.raises(ValueError, match="desconhecido"):
+        OperationSpec("rotate", {"angulo": 90})
+    with pytest.raises(ValueError, match="inválido"):
+        OperationSpec("rotate", {"angle": 45})
+    with pytest.raises(ValueError, match="inválido"):
+        OperationSpec("watermark", {"opacity": 2.0})
+    with pytest.raises(ValueError, match="inválido"):
+        OperationSpec("replace", {"pairs": [["só um"]]})
+
+
+def test_spec_json_roundtrip():
+    spec = OperationSpec("watermark", {"text": "RASCUNHO", "color": (255, 0, 0)})
+    restored = OperationSpec.from_json(spec.to_json())
+    assert restored == spec
+    assert restored.params["color"] == [255, 0, 0]
+
+
+def test_replace_operation(sample_pdf_path, tmp_output_dir):
+    output = tmp_output_dir / "spec_replace.pdf"
+    doc = fitz.open(str(sample_pdf_path))
+    spec = OperationSpec.from_dict({"name": "replace", "params": {"pairs": [["teste", "prova"]]}})
+    message = spec(doc, output)
+    doc.close()
+    assert message.startswith("1 substituições")
+    verify = fitz.open(str(output))
+    assert "prova" in verify[0].get_text()
+    verify.close()
@@ -0,0 +1,81 @@
+import os
+import time
+
+import pytest
+
+from core.batch_pool import TaskFailure, WorkerLimits, WorkerPool, rss_mb
+
+
+def _square(value: int) -> int:
+    return value * value
+
+
+def _sleep(seconds: float) -> str:
+    time.sleep(seconds)
+    return "acordou"
+
+
+def _pid(_: int) -> int:
+    return os.getpid()
+
+
+def _crash(_: int) -> None:
+    os._exit(3)
+
+
+def _hog(megabytes: int) -> int:
+    block = bytearray(megabytes * 1024 * 1024)
+    for i in range(0, len(block), 4096):
+        block[i] = 1
+    time.sleep(5)
+    return len(block)
+
+
+def _collect(pool: WorkerPool, count: int) -> dict:
+    return dict(pool.next_result() for _ in range(count))
+
+
+def test_pool_returns_all_results():
+    with WorkerPool(2) as pool:
+        for i in range(6):
+            pool.submit(i, _square, i)
+        assert _collect(pool, 6) == {i: i * i for i in range(6)}
+        assert pool.pending == 0
+
+
+def test_pool_timeout_kills_only_slow_task():
+    with WorkerPool(2, WorkerLimits(timeout_s=0.5)) as pool:
+        pool.submit(0, _sleep, 30)
+        pool.submit(1, _square, 7)
+        results = _collect(pool, 2)
+    assert results[1] == 49
+    assert isinstance(results[0], TaskFailure)
+    assert "tempo limite" in results[0].reason
+
+
+def test_pool_reports_crashed_worker():
+    with WorkerPool(1) as pool:
+        pool.submit(0, _crash, 0)
+        pool.submit(1, _square, 3)
+        results = _collect(pool, 2)
+    assert isinstance(results[0], TaskFailure)
+    assert results[1] == 9
+
+
+def test_pool_recycles_after_max_tasks():
+    with WorkerPool(1, WorkerLimits(max_tasks_per_worker=2)) as pool:
+        for i in range(4):
+            pool.submit(i, _pid, i)
+        pids = _collect(pool, 4)
+    assert pids[0] == pids[1]
+    assert pids[2] == pids[3]
+    assert pids[0] != pids[2]
+
+
+@pytest.mark.skipif(rss_mb() is None, reason="/proc indisponível")
+def test_pool_memory_ceiling():
+    with WorkerPool(1, WorkerLimits(max_rss_mb=150, timeout_s=30)) as pool:
+        pool.submit(0, _hog, 400)
+        _, outcome = pool.next_result()
+    assert isinstance(outcome, TaskFailure)
+    assert "memória" in outcome.reason
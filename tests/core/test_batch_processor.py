@@ -1,8 +1,13 @@
 from pathlib import Path
 
 import fitz
+import pytest
 
+from core.batch_operations import OperationSpec
+from core.batch_pool import WorkerLimits
 from core.batch_processor import BatchProcessor, BatchReport
+from core.batch_scheduler import split_ranges
+from core.prefetch import ReadAhead
 
 
 def _dummy_operation(doc: fitz.Document, output_path: Path) -> str:
@@ -74,3 +79,176 @@ def test_batch_with_progress(sample_pdf_path, tmp_output_dir):
     )
     assert len(progress_calls) == 1
     assert progress_calls[0][0] == 1
+
+
+def _make_pdfs(directory: Path, count: int) -> list[Path]:
+    directory.mkdir(parents=True, exist_ok=True)
+    paths = []
+    for i in range(count):
+        path = directory / f"doc_{i:02d}.pdf"
+        doc = fitz.open()
+        doc.new_page().insert_text((50, 100), f"Documento {i}", fontsize=12)
+        doc.save(str(path))
+        doc.close()
+        paths.append(path)
+    return paths
+
+
+def test_batch_parallel_preserves_order(tmp_output_dir):
+    files = _make_pdfs(tmp_output_dir / "parallel_in", 4)
+    processor = BatchProcessor(output_dir=tmp_output_dir / "parallel_out")
+    progress_calls = []
+    report = processor.run(
+        input_dir=tmp_output_dir,
+        operation=OperationSpec("rotate", {"angle": 90}),
+        file_list=files,
+        on_progress=lambda cur, tot, name: progress_calls.append((cur, tot, name)),
+        workers=2,
+    )
+    assert report.succeeded == 4
+    assert [r.path for r in report.results] == files
+    assert [c[0] for c in progress_calls] == [1, 2, 3, 4]
+    assert all(r.output_path and r.output_path.exists() for r in report.results)
+
+
+def test_batch_parallel_rejects_closure(tmp_output_dir):
+    files = _make_pdfs(tmp_output_dir / "closure_in", 2)
+    processor = BatchProcessor(output_dir=tmp_output_dir / "closure_out")
+    with pytest.raises(TypeError):
+        processor.run(
+            input_dir=tmp_output_dir,
+            operation=lambda doc, out: "OK",
+            file_list=files,
+            workers=2,
+        )
+
+
+def test_iter_run_streams_results(tmp_output_dir):
+    input_dir = tmp_output_dir / "stream_in"
+    files = _make_pdfs(input_dir, 3)
+    processor = BatchProcessor(output_dir=tmp_output_dir / "stream_out")
+    report = BatchReport()
+    seen = []
+    for result in processor.iter_run(input_dir, _dummy_operation, report=report):
+        seen.append(result.path)
+        assert report.total == len(seen)
+    assert sorted(seen) == files
+    assert report.succeeded == 3
+    assert report.results == []
+
+
+def test_iter_run_parallel_with_window(tmp_output_dir):
+    files = _make_pdfs(tmp_output_dir / "window_in", 5)
+    processor = BatchProcessor(output_dir=tmp_output_dir / "window_out")
+    results = list(
+        processor.iter_run(
+            tmp_output_dir,
+            OperationSpec("rotate", {"angle": 180}),
+            file_list=iter(files),
+            workers=2,
+            max_pending=2,
+        )
+    )
+    assert sorted(r.path for r in results) == files
+    assert all(r.success for r in results)
+
+
+def test_batch_limits_isolate_single_worker(tmp_output_dir):
+    files = _make_pdfs(tmp_output_dir / "limits_in", 2)
+    processor = BatchProcessor(
+        output_dir=tmp_output_dir / "limits_out",
+        limits=WorkerLimits(timeout_s=60, max_tasks_per_worker=1),
+    )
+    report = processor.run(
+        input_dir=tmp_output_dir,
+        operation=OperationSpec("rotate", {"angle": 270}),
+        file_list=files,
+    )
+    assert report.succeeded == 2
+    assert [r.path for r in report.results] == files
+
+
+def test_batch_splits_large_document_into_page_ranges(tmp_output_dir, monkeypatch):
+    src = tmp_output_dir / "split_in" / "grande.pdf"
+    src.parent.mkdir(parents=True, exist_ok=True)
+    doc = fitz.open()
+    for i in range(9):
+        doc.new_page().insert_text((50, 100), f"Pagina {i}", fontsize=12)
+    doc.set_metadata({"title": "Grande"})
+    doc.set_toc([[1, "Inicio", 1], [1, "Fim", 9]])
+    doc.save(str(src))
+    doc.close()
+    small = _make_pdfs(tmp_output_dir / "split_in", 1)
+
+    monkeypatch.setattr(
+        "core.batch_processor.split_ranges",
+        lambda pages, workers: split_ranges(pages, workers, min_pages=4, min_chunk=2),
+    )
+    out_dir = tmp_output_dir / "split_out"
+    report = BatchProcessor(output_dir=out_dir).run(
+        input_dir=tmp_output_dir,
+        operation=OperationSpec("rotate", {"angle": 90}),
+        file_list=[*small, src],
+        workers=2,
+    )
+
+    assert report.succeeded == 2
+    big = report.results[1]
+    assert big.message.startswith("2 partes")
+    assert big.pages == 9
+    assert "merge" in big.stages
+    out = fitz.open(str(big.output_path))
+    assert out.page_count == 9
+    assert all(page.rotation == 90 for page in out)
+    assert out[8].get_text().strip() == "Pagina 8"
+    assert out.metadata["title"] == "Grande"
+    assert len(out.get_toc()) == 2
+    out.close()
+    assert not list(out_dir.glob(".*.parte*.pdf"))
+
+
+def test_batch_invalid_schedule(tmp_output_dir):
+    with pytest.raises(ValueError):
+        BatchProcessor(output_dir=tmp_output_dir, schedule="aleatorio")
+
+
+@pytest.mark.parametrize("prefetch_files", [0, 2])
+def test_batch_prefetch_opens_from_memory(sample_multipage_path, tmp_output_dir, prefetch_files):
+    output_dir = tmp_output_dir / f"batch_prefetch_{prefetch_files}"
+    processor = BatchProcessor(output_dir=output_dir, prefetch_files=prefetch_files)
+    report = processor.run(
+        input_dir=sample_multipage_path.parent,
+        operation=OperationSpec("images", {"dpi": 30}),
+        file_list=[sample_multipage_path] * 2,
+    )
+    assert report.succeeded == 2
+    assert report.results[0].input_bytes == sample_multipage_path.stat().st_size
+    # o nome da pasta vem do PDF de entrada mesmo com o documento aberto da memória
+    assert len(list((output_dir / sample_multipage_path.stem).glob("*.png"))) == 5
+
+
+def test_parallel_batch_skips_read_ahead(sample_multipage_path, tmp_output_dir, monkeypatch):
+    scheduled = []
+    schedule = ReadAhead._schedule
+
+    def _spy(self, path):
+        scheduled.append(path)
+        return schedule(self, path)
+
+    monkeypatch.setattr(ReadAhead, "_schedule", _spy)
+    processor = BatchProcessor(output_dir=tmp_output_dir / "paralelo", prefetch_files=4)
+    report = processor.run(
+        input_dir=sample_multipage_path.parent,
+        operation=OperationSpec("rotate", {"angle": 90}),
+        file_list=[sample_multipage_path] * 3,
+        workers=2,
+    )
+    assert report.succeeded == 3
+    assert scheduled == []  # os workers abrem pelo caminho, em paralelo
+
+    processor.run(
+        input_dir=sample_multipage_path.parent,
+        operation=OperationSpec("rotate", {"angle": 90}),
+        file_list=[sample_multipage_path] * 3,
+    )
+    assert scheduled  # o caminho sequencial continua antecipando
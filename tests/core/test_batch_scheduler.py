@@ -0,0 +1,42 @@
+import fitz
+
+from core.batch_scheduler import order_largest_first, probe_cost, split_ranges
+
+
+def _make_pdf(path, pages):
+    doc = fitz.open()
+    for i in range(pages):
+        doc.new_page().insert_text((50, 100), f"Pagina {i}", fontsize=12)
+    doc.save(str(path))
+    doc.close()
+    return path
+
+
+def test_probe_cost_counts_pages(tmp_path):
+    cost = probe_cost(_make_pdf(tmp_path / "a.pdf", 3))
+    assert cost.pages == 3
+    assert cost.size_bytes > 0
+    assert cost.cost > 3
+
+
+def test_probe_cost_unreadable_file(tmp_path):
+    broken = tmp_path / "broken.pdf"
+    broken.write_bytes(b"nao e pdf")
+    cost = probe_cost(broken)
+    assert cost.pages == 0
+    assert cost.size_bytes == len(b"nao e pdf")
+
+
+def test_order_largest_first(tmp_path):
+    small = _make_pdf(tmp_path / "small.pdf", 1)
+    big = _make_pdf(tmp_path / "big.pdf", 20)
+    medium = _make_pdf(tmp_path / "medium.pdf", 5)
+    ordered = order_largest_first([(0, small), (1, big), (2, medium)])
+    assert ordered == [(1, big), (2, medium), (0, small)]
+
+
+def test_split_ranges():
+    assert split_ranges(10, 1, min_pages=4, min_chunk=2) == [(0, 10)]
+    assert split_ranges(3, 4, min_pages=4, min_chunk=2) == [(0, 3)]
+    assert split_ranges(10, 4, min_pages=4, min_chunk=2) == [(0, 3), (3, 6), (6, 9), (9, 10)]
+    assert split_ranges(10, 8, min_pages=4, min_chunk=4) == [(0, 4), (4, 8), (8, 10)]
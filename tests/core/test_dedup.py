@@ -0,0 +1,84 @@
+import shutil
+
+import pytest
+
+from core.batch_operations import OperationSpec
+from core.batch_processor import BatchProcessor
+from core.dedup import fan_out, find_duplicates, partial_hash
+
+
+def _write(path, content: bytes):
+    path.write_bytes(content)
+    return path
+
+
+def test_find_duplicates_by_size_partial_and_full_hash(tmp_path):
+    base = b"A" * 200_000
+    paths = [
+        _write(tmp_path / "a.pdf", base),
+        _write(tmp_path / "b.pdf", base[:-1] + b"B"),  # mesmo tamanho, fim diferente
+        _write(tmp_path / "c.pdf", base),
+        # mesmo início e fim, miolo diferente: só o hash completo separa
+        _write(tmp_path / "d.pdf", base[:100_000] + b"X" + base[100_001:]),
+        _write(tmp_path / "e.pdf", b"curto"),
+    ]
+    assert partial_hash(paths[0], sample_kb=64) == partial_hash(paths[3], sample_kb=64)
+
+    groups = find_duplicates(paths + [paths[1]])
+    assert [(g.original, g.duplicates) for g in groups] == [(0, [2]), (1, [5])]
+    assert groups[0].size_bytes == 200_000
+
+
+def test_find_duplicates_without_candidates(tmp_path):
+    paths = [_write(tmp_path / "a.pdf", b"1"), _write(tmp_path / "b.pdf", b"22")]
+    assert find_duplicates(paths) == []
+
+
+@pytest.mark.parametrize("mode", ["symlink", "copy"])
+def test_fan_out_replicates_output(tmp_path, mode):
+    source = _write(tmp_path / "saida.pdf", b"conteudo")
+    target = fan_out(source, tmp_path / "sub" / "copia.pdf", mode)
+    assert target.read_bytes() == b"conteudo"
+    assert target.is_symlink() == (mode == "symlink")
+
+
+def test_batch_processes_duplicates_once(sample_pdf_path, tmp_path):
+    inputs = tmp_path / "in"
+    inputs.mkdir()
+    first = shutil.copy(sample_pdf_path, inputs / "nota.pdf")
+    second = shutil.copy(sample_pdf_path, inputs / "nota_reenviada.pdf")
+    processor = BatchProcessor(tmp_path / "out", dedupe="symlink")
+    report = processor.run(
+        inputs, OperationSpec("rotate", {"angle": 90}), file_list=[first, second]
+    )
+
+    assert report.succeeded == 2
+    assert report.duplicates == 1
+    assert report.metrics.files == 1  # só o original entra nas métricas de processamento
+    original, duplicate = report.results
+    assert original.duplicate_of is None
+    assert duplicate.duplicate_of == first
+    assert duplicate.message.startswith("duplicata de nota.pdf")
+    assert duplicate.output_path.is_symlink()
+    assert duplicate.output_path.resolve() == original.output_path.resolve()
+    assert "1 duplicatas" in report.summary()
+
+
+def test_batch_does_not_dedupe_directory_outputs(sample_multipage_path, tmp_path):
+    inputs = tmp_path / "in"
+    inputs.mkdir()
+    first = shutil.copy(sample_multipage_path, inputs / "ata.pdf")
+    second = shutil.copy(sample_multipage_path, inputs / "ata_copia.pdf")
+    processor = BatchProcessor(tmp_path / "out", dedupe="symlink")
+    report = processor.run(inputs, OperationSpec("split"), file_list=[first, second])
+
+    assert report.succeeded == 2
+    assert report.duplicates == 0  # split grava um diretório por entrada: ambas rodam
+    for result in report.results:
+        assert result.duplicate_of is None
+        assert list((tmp_path / "out" / result.path.stem).glob("*.pdf"))
+
+
+def test_invalid_dedupe_mode(tmp_path):
+    with pytest.raises(ValueError):
+        BatchProcessor(tmp_path, dedupe="hardlink")
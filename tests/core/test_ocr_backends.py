@@ -0,0 +1,74 @@
+import fitz
+import pytest
+
+import core.ocr_backends
+from core.ocr_backends import (
+    OCRBackend,
+    available_backends,
+    create_reader,
+    tesseract_languages,
+    tesseract_lines,
+)
+from core.ocr_cache import OCRPageCache
+from core.ocr_engine import OCREngine
+
+
+class _LineReader:
+    def __init__(self, languages):
+        self.languages = languages
+
+    def readtext(self, image, detail=1, paragraph=False):
+        return [([[2, 4], [40, 4], [40, 16], [2, 16]], "+".join(self.languages), 0.8)]
+
+
+def _register(monkeypatch, name, create, **kwargs):
+    monkeypatch.setitem(core.ocr_backends._BACKENDS, name, OCRBackend(name, create, **kwargs))
+
+
+def test_registry_lists_builtin_backends():
+    assert {"easyocr", "tesseract"} <= set(available_backends())
+    with pytest.raises(ValueError, match="desconhecido"):
+        OCREngine(backend="inexistente")
+
+
+def test_missing_library_suggests_install(monkeypatch):
+    def _missing(languages, use_gpu):
+        raise ImportError("No module named 'falta'")
+
+    _register(monkeypatch, "falta", _missing, install_hint="pip install falta")
+    with pytest.raises(RuntimeError, match="pip install falta"):
+        create_reader("falta", ["pt"])
+
+
+def test_tesseract_words_grouped_by_line():
+    data = {
+        "text": ["", "Contrato", "de", "serviço", "Cláusula", " "],
+        "conf": [-1, 90, 80, 70, 60, -1],
+        "block_num": [1, 1, 1, 1, 1, 1],
+        "par_num": [1, 1, 1, 1, 2, 2],
+        "line_num": [0, 1, 1, 1, 1, 1],
+        "left": [0, 10, 60, 80, 10, 0],
+        "top": [0, 20, 22, 21, 50, 0],
+        "width": [0, 45, 15, 50, 60, 0],
+        "height": [0, 12, 10, 11, 12, 0],
+    }
+    first, second = tesseract_lines(data)
+    assert first[1] == "Contrato de serviço"
+    assert first[0] == [[10, 20], [130, 20], [130, 32], [10, 32]]
+    assert first[2] == pytest.approx(0.8)
+    assert second[1] == "Cláusula"
+    assert tesseract_languages(["pt", "en", "chi_sim"]) == "por+eng+chi_sim"
+
+
+def test_engine_uses_selected_backend_and_cache_separates_them(monkeypatch, tmp_path):
+    _register(monkeypatch, "linhas", lambda languages, use_gpu: _LineReader(languages))
+    cache = OCRPageCache(tmp_path / "ocr")
+    engine = OCREngine(languages=["pt", "en"], use_gpu=True, cache=cache, backend="linhas")
+    assert not engine._use_gpu  # backend sem suporte a GPU
+    doc = fitz.open()
+    doc.new_page(width=100, height=100)
+    assert engine.recognize_document(doc)[0].text == "pt+en"
+
+    pix = engine._render(doc[0])
+    assert cache.make_key(pix, ["pt"], "linhas") != cache.make_key(pix, ["pt"], "easyocr")
+    doc.close()
@@ -0,0 +1,408 @@
+import threading
+import time
+
+import fitz
+import numpy as np
+import pytest
+
+import core.ocr_batch
+from config.settings import OCR_BATCH_MAX_PAGES, OCR_IMAGE_SCALE
+from core.batch_operations import OperationSpec
+from core.batch_processor import BatchProcessor
+from core.ocr_batch import OCRPageBatcher
+from core.ocr_cache import OCRPageCache
+from core.ocr_engine import (
+    CV2_AVAILABLE,
+    OCREngine,
+    OCRPageResult,
+    PixelBuffer,
+    choose_scale,
+    close_shared_engines,
+    get_shared_engine,
+    needs_ocr,
+    pad_images,
+    page_scale,
+    pixmap_view,
+    select_ocr_pages,
+    shape_groups,
+    text_quality,
+)
+from utils.timing import StageClock, activate_clock
+
+
+class _FakeEngine:
+    batch_pages = OCR_BATCH_MAX_PAGES
+
+    def __init__(self) -> None:
+        self.batches: list[list[tuple[str, int]]] = []
+        self.saved: list[str] = []
+        self.closed = 0
+
+    def recognize_pages(self, pages, clips=None):
+        self.batches.append([(page.parent.name, page.number) for page in pages])
+        return [OCRPageResult(text=f"p{page.number}") for page in pages]
+
+    def save_ocr_layer(self, doc, results, output_path):
+        assert sorted(results) == list(range(doc.page_count))
+        self.saved.append(output_path.name)
+        doc.save(str(output_path))
+
+    def trim_cache(self):
+        pass
+
+    def close(self):
+        self.closed += 1
+
+
+class _FakeReader:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def readtext(self, image, detail=1, paragraph=False):
+        self.calls += 1
+        return [([[0, 0], [10, 0], [10, 10], [0, 10]], "texto", 0.9)]
+
+
+def _make_pdf(path, pages):
+    doc = fitz.open()
+    for i in range(pages):
+        doc.new_page().insert_text((50, 100), f"Pagina {i + 1}")
+    doc.save(str(path))
+    doc.close()
+    return path
+
+
+def test_shared_engine_is_reused():
+    engine = get_shared_engine(["pt"], use_gpu=False)
+    assert get_shared_engine(["pt"], use_gpu=False) is engine
+    assert get_shared_engine(["en"], use_gpu=False) is not engine
+
+
+def test_close_shared_engines_closes_and_forgets_engines(monkeypatch):
+    engine = get_shared_engine(["pt"], use_gpu=False)
+    closed = []
+    monkeypatch.setattr(engine, "close", lambda: closed.append(engine))
+    close_shared_engines()
+    assert closed == [engine]
+    assert get_shared_engine(["pt"], use_gpu=False) is not engine
+
+
+def test_recognize_pages_returns_one_result_per_page(sample_multipage_path):
+    engine = OCREngine(languages=["pt"], use_gpu=False)
+    engine._reader = _FakeReader()
+    with fitz.open(str(sample_multipage_path)) as doc:
+        results = engine.recognize_document(doc)
+    assert sorted(results) == list(range(5))
+    assert results[0].text == "texto"
+    assert engine._reader.calls == 5
+
+
+def test_batcher_packs_pages_across_documents(tmp_path):
+    paths = [_make_pdf(tmp_path / f"doc{i}.pdf", 3) for i in range(3)]
+    engine = _FakeEngine()
+    batcher = OCRPageBatcher(engine, batch_pages=4)  # type: ignore[arg-type]
+    done = []
+    for i, path in enumerate(paths):
+        done += batcher.add(i, fitz.open(str(path)), tmp_path / f"out{i}.pdf")
+    done += batcher.flush()
+
+    assert [len(batch) for batch in engine.batches] == [4, 4, 1]
+    # o segundo lote junta o fim do doc1 com o começo do doc2
+    assert {name for name, _ in engine.batches[1]} == {str(paths[1]), str(paths[2])}
+    assert [job.key for job in done] == [0, 1, 2]
+    assert all(job.message == "3 páginas com OCR" for job in done)
+    assert engine.saved == ["out0.pdf", "out1.pdf", "out2.pdf"]
+
+
+def test_batcher_failure_is_reported_per_document(tmp_path):
+    class _Broken(_FakeEngine):
+        def recognize_pages(self, pages, clips=None):
+            raise RuntimeError("GPU indisponível")
+
+    path = _make_pdf(tmp_path / "doc.pdf", 2)
+    batcher = OCRPageBatcher(_Broken(), batch_pages=2)  # type: ignore[arg-type]
+    (job,) = batcher.add("a", fitz.open(str(path)), tmp_path / "out.pdf")
+    assert job.error == "GPU indisponível"
+    assert not (tmp_path / "out.pdf").exists()
+
+
+def test_batcher_failed_batch_only_fails_the_broken_document(tmp_path):
+    class _OneBadPage(_FakeEngine):
+        def recognize_pages(self, pages, clips=None):
+            if any(page.parent.name.endswith("ruim.pdf") for page in pages):
+                raise RuntimeError("página ilegível")
+            return super().recognize_pages(pages, clips)
+
+    paths = [_make_pdf(tmp_path / name, 2) for name in ("a.pdf", "ruim.pdf", "b.pdf")]
+    engine = _OneBadPage()
+    batcher = OCRPageBatcher(engine, batch_pages=4)  # type: ignore[arg-type]
+    done = []
+    for i, path in enumerate(paths):
+        done += batcher.add(i, fitz.open(str(path)), tmp_path / f"out{i}.pdf")
+    done += batcher.flush()
+
+    assert [job.key for job in done] == [0, 1, 2]
+    assert [job.error for job in done] == ["", "página ilegível", ""]
+    assert engine.saved == ["out0.pdf", "out2.pdf"]
+    assert not (tmp_path / "out1.pdf").exists()
+
+
+def test_batch_ocr_uses_one_engine_for_all_files(tmp_path, monkeypatch):
+    engine = _FakeEngine()
+    created = []
+
+    def _shared(languages=None, use_gpu=True, cpu_workers=1, backend="easyocr"):
+        created.append((languages, use_gpu))
+        return engine
+
+    monkeypatch.setattr(core.ocr_batch, "get_shared_engine", _shared)
+    paths = [_make_pdf(tmp_path / f"scan{i}.pdf", 1) for i in range(6)]
+    paths.insert(3, tmp_path / "quebrado.pdf")
+    paths[3].write_text("não é um pdf")
+    processor = BatchProcessor(tmp_path / "saida")
+    report = processor.run(tmp_path, OperationSpec("ocr", {"use_gpu": False}), file_list=paths)
+
+    assert created == [(None, False)]
+    assert engine.closed == 1  # processos de OCR encerrados no fim do lote
+    # páginas únicas de arquivos diferentes preenchem os lotes de OCR_BATCH_MAX_PAGES
+    sizes = [len(batch) for batch in engine.batches]
+    assert sum(sizes) == 6
+    assert all(size == OCR_BATCH_MAX_PAGES for size in sizes[:-1])
+    assert report.succeeded == 6 and report.failed == 1
+    assert [r.path for r in report.results] == paths
+    assert all(r.pages == 1 for r in report.results if r.success)
+
+
+class _FakeBatchedReader(_FakeReader):
+    def __init__(self) -> None:
+        super().__init__()
+        self.batched_shapes: list[list[tuple]] = []
+
+    def readtext_batched(self, images, detail=1, paragraph=False, batch_size=1):
+        self.batched_shapes.append([img.shape for img in images])
+        return [
+            [([[0, 0], [10, 0], [10, 10], [0, 10]], f"img{i}", 0.9)] for i in range(len(images))
+        ]
+
+
+def test_recognize_document_uses_one_batched_call_per_group(tmp_path):
+    doc = fitz.open()
+    doc.new_page(width=300, height=400)
+    doc.new_page(width=500, height=200)
+    doc.new_page(width=300, height=400)
+    engine = OCREngine(languages=["pt"], use_gpu=False)
+    engine._reader = _FakeBatchedReader()
+    results = engine.recognize_document(doc, batch_pages=2)
+    doc.close()
+    assert [results[i].text for i in range(3)] == ["img0", "img1", "texto"]
+    assert engine._reader.calls == 1  # grupo final de uma página vai por readtext
+    (shapes,) = engine._reader.batched_shapes
+    assert shapes[0] == shapes[1] == (800, 1000)  # cinza, completado ao maior formato
+
+
+def test_crops_are_not_padded_to_full_page_shape():
+    page = np.zeros((1600, 1200), np.uint8)
+    stamp = np.zeros((200, 300), np.uint8)
+    assert shape_groups([stamp, page, np.zeros((1500, 1200), np.uint8), stamp]) == [[1, 2], [0, 3]]
+
+    engine = OCREngine(languages=["pt"], use_gpu=False)
+    engine._reader = _FakeBatchedReader()
+    results = engine._recognize_batch([stamp, page, page.copy(), stamp], [0, 1, 2, 3], [2.0] * 4)
+    assert len(results) == 4
+    # as páginas vão num lote e os carimbos em outro, cada um no próprio formato
+    assert sorted(engine._reader.batched_shapes) == [[(200, 300)] * 2, [(1600, 1200)] * 2]
+
+
+def test_pad_images_keeps_origin():
+    small = np.zeros((2, 3, 3), dtype=np.uint8)
+    large = np.zeros((4, 2, 3), dtype=np.uint8)
+    padded_small, padded_large = pad_images([small, large])
+    assert padded_small.shape == padded_large.shape == (4, 3, 3)
+    assert (padded_small[:2, :3] == 0).all() and (padded_small[2:] == 255).all()
+    assert (padded_large[:, 2] == 255).all()
+
+
+def test_pixmap_view_matches_samples_without_copy(sample_pdf_path):
+    with fitz.open(str(sample_pdf_path)) as doc:
+        pix = doc[0].get_pixmap(colorspace=fitz.csGRAY, alpha=False)
+        view = pixmap_view(pix)
+        assert view.shape == (pix.height, pix.width)
+        assert view.tobytes() == pix.samples
+        assert not view.flags.owndata
+        rgb = pixmap_view(doc[0].get_pixmap(alpha=False))
+        assert rgb.shape[2] == 3
+
+
+def test_pad_images_reuses_buffer():
+    images = [np.zeros((2, 3), np.uint8), np.zeros((4, 2), np.uint8)]
+    first = pad_images(images)
+    again = pad_images(images, out=first[0].base)
+    assert again[0].base is first[0].base
+    assert pad_images(images, out=np.empty((1, 1, 1), np.uint8))[0].base is not first[0].base
+
+
+def _make_mixed_pdf(path):
+    """Página 0 com texto nativo, 1 só imagem, 2 com camada de texto ilegível."""
+    doc = fitz.open()
+    doc.new_page().insert_text((50, 100), "Contrato de prestação de serviços, cláusula 1.")
+    scan = doc.new_page()
+    pix = fitz.Pixmap(fitz.csGRAY, fitz.IRect(0, 0, 40, 40), False)
+    pix.clear_with(200)
+    scan.insert_image(scan.rect, pixmap=pix)
+    doc.new_page().insert_text((50, 100), "¤¤¶¶ ©©®® ¤¶©® ¤¤¤¤")
+    doc.save(str(path))
+    doc.close()
+    return path
+
+
+def test_text_quality_and_page_selection(tmp_path):
+    assert text_quality("Olá, mundo! R$ 10,00") == 1.0
+    assert text_quality("�� ab") == 0.5
+    assert text_quality("   ") == 0.0
+    with fitz.open(str(_make_mixed_pdf(tmp_path / "misto.pdf"))) as doc:
+        assert select_ocr_pages(doc) == [1, 2]
+        assert select_ocr_pages(doc, min_quality=0.0) == [1]
+        assert not needs_ocr(doc[0])
+
+
+def test_auto_mode_recognizes_only_pages_without_text(tmp_path, monkeypatch):
+    engine = OCREngine(languages=["pt"], use_gpu=False)
+    engine._reader = _FakeReader()
+    path = _make_mixed_pdf(tmp_path / "misto.pdf")
+    with fitz.open(str(path)) as doc:
+        assert sorted(engine.recognize_document(doc, mode="auto")) == [1, 2]
+
+    monkeypatch.setattr(core.ocr_batch, "get_shared_engine", lambda *a, **k: engine)
+    report = BatchProcessor(tmp_path / "saida").run(
+        tmp_path, OperationSpec("ocr", {"mode": "auto", "min_quality": 0}), file_list=[path]
+    )
+    (result,) = report.results
+    assert result.success
+    assert result.message == "1 páginas com OCR (2 já tinham texto)"
+    with fitz.open(str(result.output_path)) as out:
+        assert "texto" in out[1].get_text()
+        assert "texto" not in out[0].get_text()
+
+
+class _SlowReader(_FakeReader):
+    """Simula a inferência: dorme (liberando o GIL, como o torch) e anota a thread."""
+
+    def readtext(self, image, detail=1, paragraph=False):
+        time.sleep(0.005)
+        return super().readtext(image, detail, paragraph)
+
+
+def test_render_ahead_overlaps_and_matches_sequential(sample_multipage_path):
+    engine = OCREngine(languages=["pt"], use_gpu=False)
+    engine._reader = _SlowReader()
+    threads = set()
+    render = engine._render
+
+    def _tracking_render(page):
+        threads.add(threading.current_thread().name)
+        return render(page)
+
+    engine._render = _tracking_render  # type: ignore[method-assign]
+    clock = StageClock()
+    with fitz.open(str(sample_multipage_path)) as doc, activate_clock(clock):
+        ahead = engine.recognize_document(doc, batch_pages=1, render_ahead=2)
+        sequential = engine.recognize_document(doc, batch_pages=1, render_ahead=0)
+    assert sorted(ahead) == sorted(sequential) == list(range(5))
+    assert "pdfforge-ocr-render" in threads
+    assert clock.stages["render"] > 0 and clock.stages["recognize"] > 0
+
+
+def test_render_ahead_propagates_errors_and_stops(sample_multipage_path):
+    engine = OCREngine(languages=["pt"], use_gpu=False)
+
+    def _broken(page):
+        if page.number == 3:
+            raise RuntimeError("página corrompida")
+        return fitz.Pixmap(fitz.csGRAY, fitz.IRect(0, 0, 4, 4), False)
+
+    engine._render = _broken  # type: ignore[method-assign]
+    with fitz.open(str(sample_multipage_path)) as doc:
+        rendered = engine._render_ahead(doc, list(range(5)), depth=1)
+        assert next(rendered)[0] == 0
+        rendered.close()  # consumidor desiste: a produtora é encerrada
+        with pytest.raises(RuntimeError, match="corrompida"):
+            list(engine._render_ahead(doc, list(range(5)), depth=2))
+    assert not any(t.name == "pdfforge-ocr-render" for t in threading.enumerate())
+
+
+def test_render_ahead_hands_over_buffers_detached_from_mupdf(sample_multipage_path, tmp_path):
+    engine = OCREngine(languages=["pt"], use_gpu=False, adaptive_scale=False)
+    cache = OCRPageCache(tmp_path / "cache")
+    with fitz.open(str(sample_multipage_path)) as doc:
+        clip = fitz.Rect(10, 20, 110, 70)
+        rendered = list(engine._render_ahead(doc, [0, (1, clip)], depth=2))
+        pixmaps = [engine._render(doc[0]), engine._render(doc[1], clip)]
+    for (_num, buffer), pix in zip(rendered, pixmaps):
+        assert isinstance(buffer, PixelBuffer)
+        assert (buffer.x, buffer.y, buffer.xres) == (pix.x, pix.y, pix.xres)
+        assert (pixmap_view(buffer) == pixmap_view(pix)).all()
+        assert pixmap_view(buffer).flags.writeable
+        # mesma chave do pixmap: o cache de OCR continua valendo
+        assert cache.make_key(buffer, ["pt"]) == cache.make_key(pix, ["pt"])
+
+
+def _text_page(doc, fontsize, width=595, height=842):
+    page = doc.new_page(width=width, height=height)
+    y = 60.0
+    while y < height - 60:
+        page.insert_text((40, y), "Contrato de prestação de serviços, cláusula", fontsize=fontsize)
+        y += fontsize * 1.4
+    return page
+
+
+def test_choose_scale_targets_xheight_within_budget():
+    assert choose_scale(None, 595, 842) == OCR_IMAGE_SCALE
+    assert choose_scale(6.0, 595, 842) == 2.0  # corpo 11 pt
+    assert choose_scale(3.0, 595, 842) == 4.0
+    assert choose_scale(40.0, 595, 842) == 0.5  # piso
+    # pôster A0 com texto miúdo: o teto de pixels manda
+    poster = choose_scale(3.0, 2384, 3370)
+    assert poster < 4.0 and 2384 * 3370 * poster**2 <= 12e6
+    assert poster % 0.25 == 0
+
+
+@pytest.mark.skipif(not CV2_AVAILABLE, reason="OpenCV ausente")
+def test_page_scale_follows_text_size():
+    doc = fitz.open()
+    for fontsize in (6, 11, 36):
+        _text_page(doc, fontsize)
+    doc.new_page()
+    small, body, large, blank = (page_scale(page) for page in doc)
+    assert small > body > large
+    assert body == 2.0 and blank == OCR_IMAGE_SCALE
+    doc.close()
+
+
+class _BoxReader(_FakeReader):
+    def __init__(self) -> None:
+        super().__init__()
+        self.shapes: list[tuple] = []
+
+    def readtext(self, image, detail=1, paragraph=False):
+        self.shapes.append(image.shape)
+        return [([[100, 200], [300, 200], [300, 230], [100, 230]], "marcador", 0.9)]
+
+
+@pytest.mark.skipif(not CV2_AVAILABLE, reason="OpenCV ausente")
+def test_adaptive_scale_is_kept_per_page_for_the_text_layer(tmp_path):
+    doc = fitz.open()
+    _text_page(doc, 36)
+    engine = OCREngine(languages=["pt"], use_gpu=False)
+    engine._reader = _BoxReader()
+    (result,) = engine.recognize_document(doc).values()
+    assert result.scale == page_scale(doc[0]) < OCR_IMAGE_SCALE
+    assert engine._reader.shapes == [(round(842 * result.scale), round(595 * result.scale))]
+
+    engine.save_ocr_layer(doc, {0: result}, tmp_path / "saida.pdf")
+    with fitz.open(str(tmp_path / "saida.pdf")) as out:
+        blocks = out[0].get_text("dict")["blocks"]
+    spans = [s for b in blocks for line in b["lines"] for s in line["spans"]]
+    (span,) = [s for s in spans if s["text"] == "marcador"]
+    # canto esquerdo e linha de base da caixa, de volta a pontos
+    assert span["origin"] == pytest.approx((100 / result.scale, 230 / result.scale), abs=0.5)
+    doc.close()
@@ -0,0 +1,83 @@
+import os
+import time
+
+import fitz
+import numpy as np
+
+from core.ocr_cache import OCRPageCache, decode_details, encode_details
+from core.ocr_engine import OCREngine
+
+
+class _CountingReader:
+    def __init__(self) -> None:
+        self.pages = 0
+
+    def readtext(self, image, detail=1, paragraph=False):
+        self.pages += 1
+        return [([[np.int32(1), 2], [30, 2], [30, 12], [1, 12]], "página", np.float64(0.5))]
+
+
+def _scanned_pdf(path, shades):
+    """Uma página só com imagem por tom de cinza; tons repetidos dão páginas iguais."""
+    doc = fitz.open()
+    for shade in shades:
+        pix = fitz.Pixmap(fitz.csGRAY, fitz.IRect(0, 0, 40, 40), False)
+        pix.clear_with(shade)
+        page = doc.new_page(width=200, height=200)
+        page.insert_image(page.rect, pixmap=pix)
+    doc.save(str(path))
+    doc.close()
+    return path
+
+
+def test_details_roundtrip():
+    details = [
+        ([[0, 0], [10.5, 0], [10.5, 8], [0, 8]], "Olá, ção", 0.875),
+        ([[1, 2], [3, 4], [5, 6], [7, 8]], "", 1.0),
+    ]
+    decoded = decode_details(encode_details(details))
+    assert decoded == [(bbox, text, conf) for bbox, text, conf in details]
+    assert decode_details(encode_details([])) == []
+
+
+def test_get_put_and_evict(tmp_path):
+    cache = OCRPageCache(tmp_path / "ocr", max_mb=0)
+    assert cache.get("aa" * 20) is None
+    assert not cache.root.exists()  # nada é criado antes da primeira gravação
+    cache.put("aa" * 20, [([[0, 0], [1, 0], [1, 1], [0, 1]], "a", 0.5)])
+    cache.put("bb" * 20, [([[0, 0], [1, 0], [1, 1], [0, 1]], "b", 0.5)])
+    assert cache.get("bb" * 20)[0][1] == "b"
+
+    (cache.root / "cc").mkdir()
+    (cache.root / "cc" / f"{'cc' * 20}.ocr").write_bytes(b"lixo")
+    assert cache.get("cc" * 20) is None  # entrada corrompida é descartada
+    assert not (cache.root / "cc" / f"{'cc' * 20}.ocr").exists()
+
+    past = time.time() - 100
+    os.utime(cache.root / "aa" / f"{'aa' * 20}.ocr", (past, past))
+    assert cache.evict() == 2
+    assert cache.size_bytes() == 0
+
+
+def test_engine_recognizes_only_misses(tmp_path):
+    cache = OCRPageCache(tmp_path / "ocr")
+    engine = OCREngine(languages=["pt"], use_gpu=False, cache=cache)
+    engine._reader = _CountingReader()
+    path = _scanned_pdf(tmp_path / "scan.pdf", [40, 120, 40])
+
+    with fitz.open(str(path)) as doc:
+        first = engine.recognize_document(doc, batch_pages=1)
+        assert engine._reader.pages == 2  # a terceira página repete a primeira
+        second = engine.recognize_document(doc)
+        assert engine._reader.pages == 2
+        assert [second[i].text for i in range(3)] == ["página"] * 3
+        assert second[0].details[0][0] == [[1.0, 2.0], [30.0, 2.0], [30.0, 12.0], [1.0, 12.0]]
+        assert sorted(first) == sorted(second)
+
+    other_lang = OCREngine(languages=["en"], use_gpu=False, cache=cache)
+    other_lang._reader = _CountingReader()
+    with fitz.open(str(_scanned_pdf(tmp_path / "novo.pdf", [120, 200]))) as doc:
+        engine.recognize_pages([doc[0], doc[1]])
+        assert engine._reader.pages == 3  # só a página de tom 200 é nova
+        other_lang.recognize_pages([doc[0]])
+        assert other_lang._reader.pages == 1  # idiomas fazem parte da chave
@@ -0,0 +1,55 @@
+import fitz
+import pytest
+
+from core.ocr_layer import insert_text_layer, text_layer_stream
+
+
+def _box(x0, y0, x1, y1, scale=2.0):
+    return [[x0 * scale, y0 * scale], [x1 * scale, y0 * scale], [x1 * scale, y1 * scale],
+            [x0 * scale, y1 * scale]]  # fmt: skip
+
+
+def test_layer_words_fit_their_boxes_and_are_invisible(tmp_path):
+    doc = fitz.open()
+    page = doc.new_page()
+    details = [
+        (_box(50, 100, 250, 115), "Cláusula (primeira)", 0.9),
+        (_box(50, 130, 90, 142), "R$ 10", 0.8),
+        (_box(50, 150, 90, 160), "   ", 0.1),
+    ]
+    insert_text_layer(page, details, 2.0)
+    doc.save(str(tmp_path / "camada.pdf"))
+    doc.close()
+
+    with fitz.open(str(tmp_path / "camada.pdf")) as out:
+        page = out[0]
+        words = page.get_text("words")
+        assert [w[4] for w in words] == ["Cláusula", "(primeira)", "R$", "10"]
+        assert words[0][0] == pytest.approx(50, abs=0.5)
+        assert words[1][2] == pytest.approx(250, abs=0.5)  # Tz leva o fim do texto ao da caixa
+        assert words[3][2] == pytest.approx(90, abs=0.5)
+        # nada aparece na página renderizada
+        assert set(page.get_pixmap(colorspace=fitz.csGRAY).samples) == {255}
+        assert b"3 Tr" in page.read_contents()
+
+
+def test_layer_keeps_existing_content_and_mediabox_origin():
+    doc = fitz.open()
+    page = doc.new_page(width=300, height=400)
+    page.insert_text((20, 40), "Texto nativo")
+    page.set_mediabox(fitz.Rect(0, 100, 300, 500))
+    insert_text_layer(page, [(_box(10, 200, 60, 212), "OCR", 0.9)], 2.0)
+    text = page.get_text()
+    assert "Texto nativo" in text and "OCR" in text
+    (word,) = [w for w in page.get_text("words") if w[4] == "OCR"]
+    assert word[0] == pytest.approx(10, abs=0.5)
+    assert page.is_wrapped
+    doc.close()
+
+
+def test_stream_replaces_characters_outside_winansi():
+    doc = fitz.open()
+    page = doc.new_page()
+    stream = text_layer_stream(page, [(_box(0, 0, 40, 10), "a\\b 中", 0.9)], 2.0)
+    assert b"(a\\\\b ?) Tj" in stream
+    doc.close()
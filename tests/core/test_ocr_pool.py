@@ -0,0 +1,62 @@
+import os
+
+import fitz
+import numpy as np
+import pytest
+
+from core.ocr_engine import OCREngine
+from core.ocr_pool import OCRProcessPool, cpu_ocr_workers
+
+
+class _PidReader:
+    def readtext(self, image, detail=1, paragraph=False):
+        if image.shape[0] == 666:
+            raise ValueError("imagem ilegível")
+        return [([[0, 0], [8, 0], [8, 8], [0, 8]], f"{os.getpid()}:{image.shape[0]}", 0.9)]
+
+
+def _pid_reader(languages):
+    return _PidReader()
+
+
+def test_cpu_ocr_workers_resolution():
+    assert cpu_ocr_workers(3) == 3
+    assert cpu_ocr_workers(0, threads=1) >= 1
+    assert cpu_ocr_workers(0, threads=10_000) == 1
+
+
+def test_engine_shards_pages_across_processes_in_order():
+    doc = fitz.open()
+    for i in range(7):
+        doc.new_page(width=100, height=100 + 10 * i)
+    engine = OCREngine(languages=["pt"], use_gpu=False, adaptive_scale=False, cpu_workers=2)
+    engine._cpu_pool = OCRProcessPool(["pt"], 2, _pid_reader, threads=1)
+    progress = []
+    try:
+        results = engine.recognize_document(
+            doc, on_progress=lambda cur, tot, _msg: progress.append((cur, tot)), render_ahead=0
+        )
+    finally:
+        engine.close()
+        doc.close()
+
+    assert sorted(results) == list(range(7))
+    heights = [int(results[i].text.split(":")[1]) for i in range(7)]
+    assert heights == [2 * (100 + 10 * i) for i in range(7)]
+    assert len({results[i].text.split(":")[0] for i in range(7)}) == 2
+    assert str(os.getpid()) not in {results[i].text.split(":")[0] for i in range(7)}
+    # lotes de batch_pages por processo: 4 + 3 páginas
+    assert progress == [(4, 7), (7, 7)]
+    assert engine.batch_pages == 4
+
+
+def test_pool_failure_is_raised_and_pool_stays_usable():
+    with OCRProcessPool(["pt"], 2, _pid_reader, threads=1) as pool:
+        with pytest.raises(RuntimeError, match="imagem ilegível"):
+            pool.recognize([_blank(10), _blank(666), _blank(20)])
+        (detailed,) = pool.recognize([_blank(30)])
+        assert detailed[0][1].endswith(":30")
+
+
+def _blank(height):
+    return np.full((height, 8), 255, np.uint8)
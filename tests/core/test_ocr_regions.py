@@ -0,0 +1,118 @@
+import fitz
+import pytest
+
+import core.ocr_batch
+from config.settings import OCR_REGION_PADDING_PT
+from core.batch_operations import OperationSpec
+from core.batch_processor import BatchProcessor
+from core.ocr_engine import OCREngine, OCRPageResult, plan_ocr_regions
+from core.ocr_regions import image_regions, merge_rects
+
+_STAMP = fitz.Rect(300, 500, 500, 600)
+
+
+class _LocalBoxReader:
+    """Devolve uma caixa fixa, em pixels da imagem recebida, e anota os formatos."""
+
+    def __init__(self) -> None:
+        self.shapes: list[tuple] = []
+
+    def readtext(self, image, detail=1, paragraph=False):
+        self.shapes.append(image.shape)
+        return [([[10, 20], [110, 20], [110, 40], [10, 40]], "CARIMBO", 0.9)]
+
+
+def _image(doc_page, rect, side=40):
+    pix = fitz.Pixmap(fitz.csGRAY, fitz.IRect(0, 0, side, side), False)
+    pix.clear_with(180)
+    doc_page.insert_image(rect, pixmap=pix)
+
+
+def _make_form_pdf(path):
+    """Página 0: formulário com carimbo e ícone; 1: só texto; 2: escaneada."""
+    doc = fitz.open()
+    form = doc.new_page()
+    form.insert_text((50, 100), "Formulário de requerimento, preencha todos os campos.")
+    _image(form, _STAMP)
+    _image(form, fitz.Rect(50, 700, 60, 710))  # ícone: pequeno demais para ter texto
+    doc.new_page().insert_text((50, 100), "Página só com texto nativo, sem imagens.")
+    scan = doc.new_page()
+    _image(scan, scan.rect)
+    doc.save(str(path))
+    doc.close()
+    return path
+
+
+def test_image_regions_skip_small_images_and_merge_overlaps():
+    doc = fitz.open()
+    page = doc.new_page()
+    _image(page, _STAMP)
+    _image(page, fitz.Rect(50, 700, 60, 710))
+    _image(page, fitz.Rect(480, 580, 580, 700))  # sobrepõe o carimbo
+    pad = OCR_REGION_PADDING_PT
+    (region,) = image_regions(page)
+    assert region == fitz.Rect(300 - pad, 500 - pad, 580 + pad, 700 + pad)
+    assert merge_rects([fitz.Rect(0, 50, 10, 60), fitz.Rect(0, 0, 10, 10)])[0].y0 == 0
+    doc.close()
+
+
+def test_image_regions_follow_page_rotation():
+    doc = fitz.open()
+    page = doc.new_page(width=600, height=800)
+    _image(page, fitz.Rect(100, 200, 300, 300))
+    page.set_rotation(90)
+    (region,) = image_regions(page, padding=0)
+    assert region == fitz.Rect(500, 100, 600, 300)  # nas coordenadas do render
+    doc.close()
+
+
+def test_regions_mode_ocrs_only_image_areas_in_page_coordinates(tmp_path):
+    path = _make_form_pdf(tmp_path / "formulario.pdf")
+    engine = OCREngine(languages=["pt"], use_gpu=False, adaptive_scale=False)
+    engine._reader = _LocalBoxReader()
+    with fitz.open(str(path)) as doc:
+        units = plan_ocr_regions(doc)
+        assert [u if isinstance(u, int) else u[0] for u in units] == [0, 2]
+        results = engine.recognize_document(doc, mode="regions")
+        engine.save_ocr_layer(doc, results, tmp_path / "saida.pdf")
+
+    assert sorted(results) == [0, 2]
+    pad = OCR_REGION_PADDING_PT
+    scale = results[0].scale
+    # só o carimbo (com a folga) foi rasterizado na página do formulário
+    assert engine._reader.shapes[0] == (
+        round((100 + 2 * pad) * scale),
+        round((200 + 2 * pad) * scale),
+    )
+    bbox = results[0].details[0][0]
+    assert bbox[0] == pytest.approx([(300 - pad) * scale + 10, (500 - pad) * scale + 20], abs=1)
+    with fitz.open(str(tmp_path / "saida.pdf")) as out:
+        text = out[0].get_text()
+        assert "Formulário de requerimento" in text and "CARIMBO" in text
+        (word,) = [w for w in out[0].get_text("words") if w[4] == "CARIMBO"]
+        assert word[0] == pytest.approx(300 - pad + 10 / scale, abs=1)
+        assert "CARIMBO" not in out[1].get_text()
+
+
+def test_merged_regions_share_the_page_scale():
+    first = OCRPageResult.from_details([([[0, 0], [4, 0], [4, 2], [0, 2]], "a", 0.9)], 2.0)
+    other = OCRPageResult.from_details([([[10, 10], [20, 10], [20, 12], [10, 12]], "b", 0.9)], 4.0)
+    merged = first.merged(other.shifted(2, 2))
+    assert merged.text == "a\nb" and merged.scale == 2.0
+    assert merged.details[1][0][0] == [6, 6]
+
+
+def test_regions_mode_in_batch_pipeline(tmp_path, monkeypatch):
+    engine = OCREngine(languages=["pt"], use_gpu=False, adaptive_scale=False)
+    engine._reader = _LocalBoxReader()
+    monkeypatch.setattr(core.ocr_batch, "get_shared_engine", lambda *a, **k: engine)
+    path = _make_form_pdf(tmp_path / "formulario.pdf")
+    report = BatchProcessor(tmp_path / "saida").run(
+        tmp_path, OperationSpec("ocr", {"mode": "regions"}), file_list=[path]
+    )
+    (result,) = report.results
+    assert result.success
+    assert result.message == "2 páginas com OCR (1 já tinham texto)"
+    with fitz.open(str(result.output_path)) as out:
+        assert "CARIMBO" in out[0].get_text() and "CARIMBO" in out[2].get_text()
+        assert "Formulário de requerimento" in out[0].get_text()
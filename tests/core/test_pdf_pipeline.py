@@ -0,0 +1,98 @@
+import fitz
+import pytest
+
+from core.batch_operations import OperationSpec
+from core.pdf_pipeline import PDFPipeline, PipelineStep
+from utils.timing import StageClock, activate_clock
+
+
+def test_pipeline_applies_all_steps_with_single_save(sample_multipage_path, tmp_output_dir):
+    pipeline = PDFPipeline.from_dicts(
+        [
+            {"name": "rotate", "params": {"angle": 90}},
+            {"name": "compress", "params": {"profile": "leve"}},
+            {"name": "watermark", "params": {"text": "RASCUNHO"}},
+            {"name": "metadata", "params": {"title": "Pipeline"}},
+            {"name": "encrypt", "params": {"user_password": "abc"}},
+        ]
+    )
+    output = tmp_output_dir / "pipeline.pdf"
+    doc = fitz.open(str(sample_multipage_path))
+    clock = StageClock()
+    with activate_clock(clock):
+        result = pipeline.run(doc, output)
+    doc.close()
+
+    assert result.success, result.error
+    assert [s.name for s in result.steps] == [
+        "rotate",
+        "compress",
+        "watermark",
+        "metadata",
+        "encrypt",
+    ]
+    assert set(clock.stages) >= {"rotate", "compress", "watermark", "metadata", "save"}
+
+    out = fitz.open(str(output))
+    assert out.is_encrypted
+    assert out.authenticate("abc")
+    assert out[0].rotation == 90
+    assert out.metadata["title"] == "Pipeline"
+    out.close()
+
+
+def test_pipeline_rejects_encrypt_before_last():
+    with pytest.raises(ValueError, match="última"):
+        PDFPipeline([PipelineStep("encrypt", {"user_password": "x"}), PipelineStep("rotate")])
+
+
+def test_pipeline_rejects_unknown_step():
+    with pytest.raises(ValueError, match="desconhecida"):
+        PDFPipeline([PipelineStep("ocr")])
+
+
+def test_pipeline_validates_step_params():
+    with pytest.raises(ValueError, match="angle"):
+        PDFPipeline([PipelineStep("rotate", {"angle": 45})])
+    with pytest.raises(ValueError, match="desconhecido para 'watermark': txt"):
+        PDFPipeline.from_dicts([{"name": "watermark", "params": {"txt": "RASCUNHO"}}])
+    with pytest.raises(ValueError, match="steps"):
+        OperationSpec("pipeline", {"steps": [{"name": "metadata", "params": {"titulo": "x"}}]})
+    (step,) = PDFPipeline([PipelineStep("rotate", {"angle": "90", "pages": [0]})]).steps
+    assert step.params == {"angle": 90, "pages": [0]}
+
+
+def test_pipeline_watermark_with_null_image_uses_text(sample_pdf_path, tmp_output_dir):
+    pipeline = PDFPipeline.from_dicts(
+        [{"name": "watermark", "params": {"text": "RASCUNHO", "image_path": None}}]
+    )
+    with fitz.open(str(sample_pdf_path)) as doc:
+        result = pipeline.run(doc, tmp_output_dir / "marca.pdf")
+    assert result.success, result.error
+    assert result.steps[0].detail.startswith("texto")
+
+
+def test_pipeline_failure_reports_error(sample_pdf_path, tmp_output_dir):
+    missing = tmp_output_dir / "nao_existe.png"
+    pipeline = PDFPipeline([PipelineStep("watermark", {"image_path": str(missing)})])
+    doc = fitz.open(str(sample_pdf_path))
+    result = pipeline.run(doc, tmp_output_dir / "bad_pipeline.pdf")
+    doc.close()
+    assert not result.success
+    assert result.output_path is None
+    assert result.error
+
+
+def test_pipeline_batch_operation(sample_pdf_path, tmp_output_dir):
+    spec = OperationSpec(
+        "pipeline",
+        {"steps": [{"name": "rotate", "params": {"angle": 180}}, {"name": "metadata"}]},
+    )
+    output = tmp_output_dir / "pipeline_op.pdf"
+    doc = fitz.open(str(sample_pdf_path))
+    message = spec(doc, output)
+    doc.close()
+    assert "rotate" in message
+    out = fitz.open(str(output))
+    assert out[0].rotation == 180
+    out.close()
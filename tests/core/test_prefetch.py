@@ -0,0 +1,75 @@
+from core.prefetch import ReadAhead
+
+
+def _make_files(directory, sizes):
+    paths = []
+    for i, size in enumerate(sizes):
+        path = directory / f"arquivo_{i}.pdf"
+        path.write_bytes(bytes([i]) * size)
+        paths.append(path)
+    return paths
+
+
+def test_read_ahead_preserves_order_and_content(tmp_path):
+    paths = _make_files(tmp_path, [10, 20, 30, 40])
+    with ReadAhead(depth=2, max_mb=1) as read_ahead:
+        seen = []
+        for idx, path, prefetched in read_ahead.iterate(enumerate(paths)):
+            assert prefetched is not None
+            assert prefetched.data() == path.read_bytes()
+            prefetched.release()
+            seen.append(idx)
+        assert read_ahead.reserved_bytes == 0
+    assert seen == [0, 1, 2, 3]
+
+
+def test_read_ahead_respects_byte_budget(tmp_path):
+    big, small = _make_files(tmp_path, [2 * 1024 * 1024, 100])
+    with ReadAhead(depth=4, max_mb=1) as read_ahead:
+        items = list(read_ahead.iterate([(0, big), (1, small)]))
+        # arquivo maior que o orçamento segue sem leitura antecipada
+        assert items[0][2] is None
+        assert items[1][2] is not None
+        assert read_ahead.reserved_bytes == 100
+        items[1][2].release()
+        assert read_ahead.reserved_bytes == 0
+
+
+def test_read_ahead_disabled_with_zero_depth(tmp_path):
+    paths = _make_files(tmp_path, [10, 10])
+    with ReadAhead(depth=0) as read_ahead:
+        items = list(read_ahead.iterate(enumerate(paths)))
+    assert [prefetched for _, _, prefetched in items] == [None, None]
+
+
+def test_read_ahead_stops_at_idle_marker(tmp_path):
+    (path,) = _make_files(tmp_path, [10])
+    pulled = []
+
+    def source():
+        pulled.append(0)
+        yield 0, path
+        pulled.append(None)
+        yield 0, None
+        pulled.append("depois")
+        yield 1, path
+
+    with ReadAhead(depth=4) as read_ahead:
+        stream = read_ahead.iterate(source())
+        first = next(stream)
+        assert first[1] == path
+        # a pausa foi lida, mas nada além dela antes de ser consumida
+        assert pulled == [0, None]
+        first[2].release()
+        assert next(stream)[1] is None
+        stream.close()
+
+
+def test_read_ahead_releases_unconsumed_on_close(tmp_path):
+    paths = _make_files(tmp_path, [10, 10, 10])
+    with ReadAhead(depth=2) as read_ahead:
+        stream = read_ahead.iterate(enumerate(paths))
+        _, _, prefetched = next(stream)
+        prefetched.release()
+        stream.close()
+        assert read_ahead.reserved_bytes == 0
@@ -0,0 +1,83 @@
+import os
+import time
+
+import fitz
+
+from core.batch_operations import OperationSpec
+from core.batch_processor import BatchProcessor
+from core.result_cache import ResultCache
+
+
+def _make_pdf(path, text="conteúdo"):
+    doc = fitz.open()
+    doc.new_page().insert_text((50, 100), text, fontsize=12)
+    doc.save(str(path))
+    doc.close()
+    return path
+
+
+def test_key_depends_on_content_and_params(tmp_path):
+    cache = ResultCache(tmp_path / "cache")
+    a = _make_pdf(tmp_path / "a.pdf", "um")
+    b = _make_pdf(tmp_path / "b.pdf", "dois")
+    copy = tmp_path / "copia.pdf"
+    copy.write_bytes(a.read_bytes())
+    assert cache.make_key(a, "rotate", {"angle": 90}) == cache.make_key(
+        copy, "rotate", {"angle": 90}
+    )
+    assert cache.make_key(a, "rotate", {"angle": 90}) != cache.make_key(b, "rotate", {"angle": 90})
+    assert cache.make_key(a, "rotate", {"angle": 90}) != cache.make_key(a, "rotate", {"angle": 180})
+
+
+def test_key_depends_on_content_of_file_params(tmp_path):
+    cache = ResultCache(tmp_path / "cache")
+    pdf = _make_pdf(tmp_path / "a.pdf")
+    logo = tmp_path / "logo.png"
+    logo.write_bytes(b"primeira")
+    params = {"image_path": str(logo)}
+    steps = {"steps": [{"name": "watermark", "params": params}]}
+    before = cache.make_key(pdf, "watermark", params), cache.make_key(pdf, "pipeline", steps)
+
+    logo.write_bytes(b"segunda")  # mesmo caminho, outra imagem
+    after = cache.make_key(pdf, "watermark", params), cache.make_key(pdf, "pipeline", steps)
+    assert before[0] != after[0] and before[1] != after[1]
+    assert cache.make_key(pdf, "watermark", params) == after[0]
+
+
+def test_store_and_lookup_restores_output(tmp_path):
+    cache = ResultCache(tmp_path / "cache")
+    produced = _make_pdf(tmp_path / "saida.pdf")
+    cache.store("ab" * 32, produced, "1 páginas rotacionadas 90°")
+
+    restored = tmp_path / "restaurado.pdf"
+    assert cache.lookup("ab" * 32, restored) == "1 páginas rotacionadas 90°"
+    assert restored.read_bytes() == produced.read_bytes()
+    assert cache.lookup("cd" * 32, tmp_path / "nada.pdf") is None
+
+
+def test_evict_removes_least_recently_used(tmp_path):
+    cache = ResultCache(tmp_path / "cache", max_mb=0)
+    produced = _make_pdf(tmp_path / "saida.pdf")
+    cache.store("aa" * 32, produced, "antigo")
+    cache.store("bb" * 32, produced, "novo")
+    old_index = cache.root / "aa" / f"{'aa' * 32}.json"
+    past = time.time() - 100
+    os.utime(old_index, (past, past))
+    assert cache.evict() == 2
+    assert cache.size_bytes() == 0
+
+
+def test_batch_rerun_hits_cache(tmp_path):
+    files = [_make_pdf(tmp_path / f"doc_{i}.pdf", f"doc {i}") for i in range(2)]
+    processor = BatchProcessor(tmp_path / "out", cache=ResultCache(tmp_path / "cache"))
+    spec = OperationSpec("rotate", {"angle": 90})
+
+    first = processor.run(tmp_path, spec, file_list=files)
+    assert not any(r.cached for r in first.results)
+
+    second = processor.run(tmp_path, spec, file_list=files)
+    assert all(r.cached for r in second.results)
+    assert [r.message for r in second.results] == [r.message for r in first.results]
+    verify = fitz.open(str(second.results[0].output_path))
+    assert verify[0].rotation == 90
+    verify.close()
@@ -0,0 +1,143 @@
+import threading
+import time
+from pathlib import Path
+
+import fitz
+import pytest
+
+import core.ocr_batch
+from core.batch_operations import OperationSpec
+from core.ocr_engine import OCRPageResult
+from core.watch_folder import WatchConfig, WatchFolder
+
+
+def _make_pdf(path: Path) -> Path:
+    doc = fitz.open()
+    doc.new_page().insert_text((50, 100), path.stem, fontsize=12)
+    doc.save(str(path))
+    doc.close()
+    return path
+
+
+def _config(tmp_path: Path, **overrides) -> WatchConfig:
+    values = {
+        "input_dir": tmp_path / "entrada",
+        "output_dir": tmp_path / "saida",
+        "settle_s": 0.2,
+        "poll_s": 0.1,
+    }
+    values.update(overrides)
+    return WatchConfig(**values)
+
+
+def _wait_for(predicate, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            raise AssertionError("tempo esgotado aguardando o daemon")
+        time.sleep(0.05)
+
+
+def _start(daemon: WatchFolder) -> tuple[threading.Thread, list]:
+    reports: list = []
+    thread = threading.Thread(target=lambda: reports.append(daemon.run()))
+    thread.start()
+    return thread, reports
+
+
+def test_scan_waits_for_settle_and_respects_queue_bound(tmp_path):
+    config = _config(tmp_path, settle_s=5.0, queue_size=1)
+    config.input_dir.mkdir(parents=True)
+    daemon = WatchFolder(OperationSpec("metadata"), config)
+    first = _make_pdf(config.input_dir / "a.pdf")
+    _make_pdf(config.input_dir / "b.pdf")
+    (config.input_dir / ".parcial.pdf").write_bytes(b"%PDF")
+
+    now = time.monotonic()
+    assert daemon._scan(now) == pytest.approx(5.0)
+    assert daemon.state.queued == 0
+
+    # arquivo ainda crescendo reinicia a contagem
+    with first.open("ab") as fh:
+        fh.write(b"\n% mais dados")
+    daemon._scan(now + 3.0)
+    daemon._scan(now + 6.0)
+    assert daemon.state.queued == 1  # só b.pdf estabilizou; fila de 1 cheia
+
+    daemon._scan(now + 9.0)
+    assert daemon.state.queued == 1  # a.pdf estável, mas aguarda espaço na fila
+
+
+@pytest.mark.parametrize("use_inotify", [True, False])
+def test_daemon_processes_and_moves_files(tmp_path, use_inotify):
+    config = _config(tmp_path, use_inotify=use_inotify)
+    daemon = WatchFolder(OperationSpec("rotate", {"angle": 90}), config)
+    thread, reports = _start(daemon)
+
+    config.input_dir.mkdir(parents=True, exist_ok=True)
+    _make_pdf(config.input_dir / "scan1.pdf")
+    (config.input_dir / "quebrado.pdf").write_bytes(b"nao e pdf")
+    _wait_for(lambda: daemon.state.done + daemon.state.failed == 2)
+
+    _make_pdf(config.input_dir / "scan2.pdf")
+    _wait_for(lambda: daemon.state.done == 2)
+    daemon.stop()
+    thread.join(timeout=30)
+
+    assert not thread.is_alive()
+    assert reports[0].succeeded == 2
+    assert reports[0].failed == 1
+    assert sorted(p.name for p in config.done_path.iterdir()) == ["scan1.pdf", "scan2.pdf"]
+    assert (config.failed_path / "quebrado.pdf").exists()
+    assert (config.failed_path / "quebrado.pdf.erro.txt").read_text(encoding="utf-8")
+    assert (config.output_dir / "scan2_edited.pdf").exists()
+    assert not list(config.input_dir.glob("*.pdf"))
+
+
+def test_daemon_parallel_drains_queue_on_stop(tmp_path):
+    config = _config(tmp_path, workers=2, settle_s=0.1)
+    config.input_dir.mkdir(parents=True)
+    for i in range(4):
+        _make_pdf(config.input_dir / f"doc{i}.pdf")
+    daemon = WatchFolder(OperationSpec("rotate", {"angle": 180}), config)
+    thread, reports = _start(daemon)
+
+    _wait_for(lambda: daemon.state.queued == 4)
+    daemon.stop()  # arquivos já aceitos terminam antes de run() retornar
+    thread.join(timeout=60)
+
+    assert reports[0].succeeded == 4
+    assert len(list(config.done_path.glob("*.pdf"))) == 4
+
+
+class _FakeOCREngine:
+    batch_pages = 8  # maior que a fila: o lote nunca enche sozinho
+
+    def recognize_pages(self, pages, clips=None):
+        return [OCRPageResult(text="ocr") for _ in pages]
+
+    def save_ocr_layer(self, doc, results, output_path):
+        doc.save(str(output_path))
+
+    def trim_cache(self):
+        pass
+
+    def close(self):
+        pass
+
+
+def test_daemon_ocr_flushes_partial_batch_when_idle(tmp_path, monkeypatch):
+    monkeypatch.setattr(core.ocr_batch, "get_shared_engine", lambda *a, **k: _FakeOCREngine())
+    config = _config(tmp_path)
+    config.input_dir.mkdir(parents=True)
+    _make_pdf(config.input_dir / "scan.pdf")
+    daemon = WatchFolder(OperationSpec("ocr", {"use_gpu": False}), config)
+    thread, reports = _start(daemon)
+    try:
+        # a página única sai na primeira pausa da fonte, sem esperar o daemon parar
+        _wait_for(lambda: daemon.state.done == 1, timeout=10)
+    finally:
+        daemon.stop()
+        thread.join(timeout=30)
+    assert reports[0].succeeded == 1
+    assert (config.done_path / "scan.pdf").exists()
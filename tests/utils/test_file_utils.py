@@ -0,0 +1,14 @@
+from utils.file_utils import iter_pdfs, list_pdfs
+
+
+def test_iter_pdfs_matches_list_pdfs(tmp_path):
+    for name in ("b.pdf", "a.pdf", "notas.txt"):
+        (tmp_path / name).write_bytes(b"%PDF-1.4")
+    lazy = iter_pdfs(tmp_path)
+    assert not isinstance(lazy, list)
+    assert sorted(lazy) == list_pdfs(tmp_path)
+
+
+def test_iter_pdfs_skips_directories(tmp_path):
+    (tmp_path / "pasta.pdf").mkdir()
+    assert list(iter_pdfs(tmp_path)) == []
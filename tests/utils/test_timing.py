@@ -0,0 +1,31 @@
+import time
+
+from utils.timing import StageClock, activate_clock, add_stages, stage
+
+
+def test_nested_stages_are_exclusive():
+    clock = StageClock()
+    with activate_clock(clock):
+        with clock.measure("operate"):
+            time.sleep(0.01)
+            with stage("save"):
+                time.sleep(0.02)
+    assert clock.stages["save"] >= 0.02
+    assert 0.01 <= clock.stages["operate"] < clock.stages["save"]
+
+
+def test_stage_without_clock_is_noop():
+    with stage("save"):
+        value = 1
+    assert value == 1
+
+
+def test_add_stages_merges_into_active_clock():
+    clock = StageClock()
+    add_stages({"render": 1.0})  # sem relógio ativo: ignorado
+    with activate_clock(clock):
+        with stage("render"):
+            pass
+        add_stages({"render": 0.5, "recognize": 0.25})
+    assert clock.stages["render"] >= 0.5
+    assert clock.stages["recognize"] == 0.25
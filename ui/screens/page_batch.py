@@ -1,21 +1,28 @@
 import logging
+import os
 from pathlib import Path
 
 from PyQt6.QtCore import Qt, pyqtSignal
 from PyQt6.QtGui import QColor
 from PyQt6.QtWidgets import (
+    QCheckBox,
     QComboBox,
+    QDoubleSpinBox,
+    QFormLayout,
     QHBoxLayout,
     QLabel,
+    QLineEdit,
     QProgressBar,
     QPushButton,
     QSizePolicy,
+    QSpinBox,
     QTableWidget,
     QTableWidgetItem,
     QVBoxLayout,
     QWidget,
 )
 
+from core.batch_operations import OperationSpec, Param, operation_params
 from ui.components import ExportDialog, FilePathButton, SectionHeader, Toast
 from ui.styles import DraculaTheme
 from ui.workers import BatchWorker
@@ -25,11 +32,45 @@ logger = logging.getLogger("pdfforge.screens.batch")
 _OPERATIONS = {
     "Extrair Metadados": "metadata",
     "Aplicar OCR": "ocr",
-    "Rotacionar 90°": "rotate_90",
-    "Rotacionar 180°": "rotate_180",
-    "Rotacionar 270°": "rotate_270",
+    "Rotacionar": "rotate",
+    "Comprimir": "compress",
+    "Marca d'Água": "watermark",
+    "Dividir": "split",
+    "Substituir Texto": "replace",
+    "Encriptar": "encrypt",
+    "Exportar Imagens": "images",
+    "Organizar Páginas": "organize",
+    "Classificar": "classify",
 }
 
+# Vêm da configuração da aplicação, não do formulário
+_HIDDEN_PARAMS = {"use_gpu"}
+
+# Exemplos de preenchimento dos parâmetros em lista
+_LIST_HINTS = {
+    "ints": "0, 2, 1 (base 0)",
+    "strs": "pt, en",
+    "pairs": "buscar=substituir; outro=novo",
+    "ranges": "0-2, 3-9 (base 0)",
+    "color": "128, 128, 128",
+}
+
+
+def _parse_list(param: Param, text: str) -> list:
+    """Converte o texto de um campo de lista no valor JSON do parâmetro."""
+    if param.type == "pairs":
+        pairs = []
+        for item in filter(None, (part.strip() for part in text.split(";"))):
+            search, sep, replacement = item.partition("=")
+            if not sep:
+                raise ValueError(f"{param.label}: use buscar=substituir")
+            pairs.append([search, replacement])
+        return pairs
+    items = [part.strip() for part in text.split(",") if part.strip()]
+    if param.type == "ranges":
+        return [[int(a), int(b)] for a, _sep, b in (i.partition("-") for i in items)]
+    return items  # validate_params converte para o tipo declarado
+
 
 class PageBatch(QWidget):
     """Tela de processamento em lote de múltiplos PDFs."""
@@ -40,6 +81,7 @@ class PageBatch(QWidget):
         super().__init__(parent)
         self._use_gpu = use_gpu
         self._worker: BatchWorker | None = None
+        self._estimate_text = ""
         self._setup_ui()
 
     def _setup_ui(self) -> None:
@@ -68,8 +110,26 @@ class PageBatch(QWidget):
         self._cmb_op = QComboBox()
         for name in _OPERATIONS:
             self._cmb_op.addItem(name)
+        self._cmb_op.currentTextChanged.connect(self._build_param_form)
         layout.addWidget(self._cmb_op)
 
+        # Parâmetros gerados a partir da declaração da operação no registro
+        self._param_form = QFormLayout()
+        self._param_widgets: list[tuple[Param, QWidget]] = []
+        layout.addLayout(self._param_form)
+        self._build_param_form(self._cmb_op.currentText())
+
+        lbl_workers = QLabel("Processos paralelos")
+        lbl_workers.setStyleSheet(f"color: {DraculaTheme.COMMENT}; font-weight: bold;")
+        layout.addWidget(lbl_workers)
+        self._spin_workers = QSpinBox()
+        self._spin_workers.setRange(1, os.cpu_count() or 1)
+        self._spin_workers.setValue(1)
+        layout.addWidget(self._spin_workers)
+
+        self._chk_resume = QCheckBox("Retomar lote interrompido (pula arquivos já concluídos)")
+        layout.addWidget(self._chk_resume)
+
         layout.addSpacing(4)
 
         # Progresso
@@ -82,6 +142,12 @@ class PageBatch(QWidget):
         self._lbl_status.setStyleSheet(f"color: {DraculaTheme.COMMENT};")
         layout.addWidget(self._lbl_status)
 
+        # Estimativa inicial e tempo restante ao vivo
+        self._lbl_eta = QLabel("")
+        self._lbl_eta.setStyleSheet(f"color: {DraculaTheme.COMMENT};")
+        self._lbl_eta.setWordWrap(True)
+        layout.addWidget(self._lbl_eta)
+
         # Botão executar
         btn_row = QHBoxLayout()
         self._btn_run = QPushButton("EXECUTAR LOTE")
@@ -111,6 +177,70 @@ class PageBatch(QWidget):
 
         self._toast = Toast(self)
 
+    def _build_param_form(self, label: str) -> None:
+        while self._param_form.rowCount():
+            self._param_form.removeRow(0)
+        self._param_widgets.clear()
+        for param in operation_params(_OPERATIONS[label]):
+            if param.name in _HIDDEN_PARAMS or param.type == "steps":
+                continue
+            widget = self._param_widget(param)
+            self._param_widgets.append((param, widget))
+            self._param_form.addRow(param.label or param.name, widget)
+
+    def _param_widget(self, param: Param) -> QWidget:
+        if param.choices:
+            combo = QComboBox()
+            for choice in param.choices:
+                combo.addItem(str(choice), choice)
+            combo.setCurrentIndex(max(0, combo.findData(param.default)))
+            return combo
+        if param.type == "bool":
+            check = QCheckBox()
+            check.setChecked(bool(param.default))
+            return check
+        if param.type == "int" and param.default is not None:
+            spin = QSpinBox()
+            spin.setRange(int(param.minimum or 0), int(param.maximum or 1_000_000))
+            spin.setValue(int(param.default))
+            return spin
+        if param.type == "float" and param.default is not None:
+            dspin = QDoubleSpinBox()
+            dspin.setRange(param.minimum or 0.0, param.maximum or 1_000_000.0)
+            dspin.setSingleStep(0.1 if (param.maximum or 2) <= 1 else 1.0)
+            dspin.setValue(float(param.default))
+            return dspin
+        edit = QLineEdit()
+        if param.secret:
+            edit.setEchoMode(QLineEdit.EchoMode.Password)
+        if isinstance(param.default, list):
+            edit.setText(", ".join(str(v) for v in param.default))
+        elif param.default:
+            edit.setText(str(param.default))
+        edit.setPlaceholderText(_LIST_HINTS.get(param.type, "opcional"))
+        return edit
+
+    def _collect_operation(self) -> OperationSpec:
+        """Monta a operação do formulário; ValueError com mensagem legível se inválida."""
+        name = _OPERATIONS[self._cmb_op.currentText()]
+        params: dict = {}
+        for param, widget in self._param_widgets:
+            if isinstance(widget, QComboBox):
+                params[param.name] = widget.currentData()
+            elif isinstance(widget, QCheckBox):
+                params[param.name] = widget.isChecked()
+            elif isinstance(widget, (QSpinBox, QDoubleSpinBox)):
+                params[param.name] = widget.value()
+            elif isinstance(widget, QLineEdit) and widget.text().strip():
+                text = widget.text().strip() if not param.secret else widget.text()
+                if param.type in _LIST_HINTS:
+                    params[param.name] = _parse_list(param, text)
+                else:
+                    params[param.name] = text
+        if name == "ocr":
+            params["use_gpu"] = self._use_gpu
+        return OperationSpec(name, params)
+
     def refresh_state(self, pdf_path: Path | None, output_dir: Path | None) -> None:
         if output_dir:
             self._btn_out.set_path(output_dir)
@@ -128,20 +258,28 @@ class PageBatch(QWidget):
         if self._worker and self._worker.isRunning():
             return
 
-        op_name = _OPERATIONS[self._cmb_op.currentText()]
+        try:
+            operation = self._collect_operation()
+        except ValueError as exc:
+            self._toast.show_message(str(exc))
+            return
 
         self._btn_run.setEnabled(False)
         self._btn_run.setText("Processando...")
         self._progress.setValue(0)
         self._table.setRowCount(0)
+        self._lbl_eta.setText("Estimando duração...")
 
         self._worker = BatchWorker(
             input_dir=input_dir,
             output_dir=output_dir,
-            operation_name=op_name,
-            use_gpu=self._use_gpu,
+            operation=operation,
+            workers=self._spin_workers.value(),
+            resume=self._chk_resume.isChecked(),
         )
         self._worker.progress.connect(self._on_progress)
+        self._worker.estimated.connect(self._on_estimated)
+        self._worker.eta.connect(self._lbl_eta.setText)
         self._worker.finished.connect(self._on_finished)
         self._worker.error.connect(self._on_error)
         self._worker.start()
@@ -151,11 +289,16 @@ class PageBatch(QWidget):
             self._progress.setValue(int(current / total * 100))
         self._lbl_status.setText(f"[{current}/{total}] {filename}")
 
+    def _on_estimated(self, summary: str) -> None:
+        self._estimate_text = summary
+        self._lbl_eta.setText(summary)
+
     def _on_finished(self, report) -> None:
         self._btn_run.setEnabled(True)
         self._btn_run.setText("EXECUTAR LOTE")
         self._progress.setValue(100)
         self._lbl_status.setText(report.summary())
+        self._lbl_eta.setText(self._estimate_text)
 
         self._table.setRowCount(0)
         first_success_path = None
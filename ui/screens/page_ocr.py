@@ -29,6 +29,11 @@ _LANGUAGE_OPTIONS = {
     "Português + Inglês + Espanhol": ["pt", "en", "es"],
 }
 
+_BACKEND_OPTIONS = {
+    "EasyOCR (GPU)": "easyocr",
+    "Tesseract (CPU, mais leve)": "tesseract",
+}
+
 
 class PageOCR(QWidget):
     """Tela de reconhecimento óptico de caracteres (OCR)."""
@@ -71,10 +76,26 @@ class PageOCR(QWidget):
             self._cmb_lang.addItem(option)
         layout.addWidget(self._cmb_lang)
 
+        lbl_backend = QLabel("Motor de OCR")
+        lbl_backend.setStyleSheet(f"color: {DraculaTheme.COMMENT}; font-weight: bold;")
+        layout.addWidget(lbl_backend)
+        self._cmb_backend = QComboBox()
+        for option in _BACKEND_OPTIONS:
+            self._cmb_backend.addItem(option)
+        layout.addWidget(self._cmb_backend)
+
         self._chk_gpu = QCheckBox("Usar GPU (CUDA)")
         self._chk_gpu.setChecked(self._use_gpu)
         layout.addWidget(self._chk_gpu)
 
+        self._chk_auto = QCheckBox("Só páginas sem texto (mantém as que já têm texto legível)")
+        self._chk_auto.setChecked(False)
+        layout.addWidget(self._chk_auto)
+
+        self._chk_regions = QCheckBox("Nas páginas com texto, reconhecer só as imagens (carimbos)")
+        self._chk_regions.setChecked(False)
+        layout.addWidget(self._chk_regions)
+
         layout.addSpacing(4)
 
         # Barra de progresso
@@ -156,12 +177,19 @@ class PageOCR(QWidget):
             output_path=output_path,
             languages=languages,
             use_gpu=use_gpu,
+            mode=self._selected_mode(),
+            backend=_BACKEND_OPTIONS.get(self._cmb_backend.currentText(), "easyocr"),
         )
         self._worker.progress.connect(self._on_progress)
         self._worker.finished.connect(self._on_finished)
         self._worker.error.connect(self._on_error)
         self._worker.start()
 
+    def _selected_mode(self) -> str:
+        if self._chk_regions.isChecked():
+            return "regions"
+        return "auto" if self._chk_auto.isChecked() else "all"
+
     def _on_progress(self, current: int, total: int, msg: str) -> None:
         if total > 0:
             pct = int(current / total * 100)
@@ -4,15 +4,21 @@ from pathlib import Path
 import fitz
 from PyQt6.QtCore import QThread, pyqtSignal
 
-from core.batch_processor import BatchProcessor
+from config.settings import OCR_BACKEND, OCR_CACHE_ENABLED
+from core.batch_estimator import BatchEstimator, LiveETA
+from core.batch_journal import BatchJournal
+from core.batch_operations import OperationSpec
+from core.batch_processor import BatchProcessor, FileResult
 from core.document_classifier import ClassificationResult, DocumentClassifier
-from core.metadata import PDFMetadata
+from core.ocr_cache import OCRPageCache
 from core.ocr_engine import OCREngine
 from core.pdf_compressor import PDFCompressor
 from core.pdf_editor import PDFEditor
 from core.pdf_merger import MergeEntry, PDFMerger
 from core.pdf_splitter import PDFSplitter
+from core.result_cache import ResultCache
 from core.signature_handler import SignatureHandler, SignatureRegion
+from utils.file_utils import list_pdfs
 
 logger = logging.getLogger("pdfforge.workers")
 
@@ -93,26 +99,37 @@ class OCRWorker(QThread):
         output_path: Path,
         languages: list[str],
         use_gpu: bool = True,
+        mode: str = "all",
+        backend: str = OCR_BACKEND,
     ) -> None:
         super().__init__()
         self._pdf_path = pdf_path
         self._output_path = output_path
         self._languages = languages
         self._use_gpu = use_gpu
+        self._mode = mode
+        self._backend = backend
 
     def run(self) -> None:
         try:
-            engine = OCREngine(languages=self._languages, use_gpu=self._use_gpu)
+            cache = OCRPageCache() if OCR_CACHE_ENABLED else None
+            engine = OCREngine(
+                languages=self._languages,
+                use_gpu=self._use_gpu,
+                cache=cache,
+                backend=self._backend,
+            )
             doc = fitz.open(str(self._pdf_path))
             try:
 
                 def _on_progress(cur: int, tot: int, msg: str) -> None:
                     self.progress.emit(cur, tot, msg)
 
-                results = engine.recognize_document(doc, on_progress=_on_progress)
+                results = engine.recognize_document(doc, on_progress=_on_progress, mode=self._mode)
                 engine.save_ocr_layer(doc, results, self._output_path)
             finally:
                 doc.close()
+                engine.close()
             self.finished.emit(results)
         except Exception as exc:
             logger.error("OCRWorker falhou: %s", exc, exc_info=True)
@@ -120,69 +137,74 @@ class OCRWorker(QThread):
 
 
 class BatchWorker(QThread):
-    """Executa BatchProcessor.run() em thread separada."""
+    """
+    Executa BatchProcessor.run() em thread separada. Antes do lote emite a
+    estimativa de duração (estimated) e, a cada arquivo concluído, o tempo
+    restante atualizado pela vazão ao vivo (eta).
+    """
 
     finished = pyqtSignal(object)  # BatchReport
     progress = pyqtSignal(int, int, str)
+    estimated = pyqtSignal(str)
+    eta = pyqtSignal(str)
     error = pyqtSignal(str)
 
     def __init__(
         self,
         input_dir: Path,
         output_dir: Path,
-        operation_name: str = "metadata",
-        use_gpu: bool = True,
+        operation: OperationSpec,
+        workers: int = 1,
+        resume: bool = False,
     ) -> None:
         super().__init__()
         self._input_dir = input_dir
         self._output_dir = output_dir
-        self._operation_name = operation_name
-        self._use_gpu = use_gpu
+        self._operation = operation
+        self._workers = workers
+        self._resume = resume
 
     def run(self) -> None:
         try:
-            processor = BatchProcessor(self._output_dir)
-            operation = self._build_operation()
+            operation = self._operation
 
             def _on_progress(cur: int, tot: int, fname: str) -> None:
                 self.progress.emit(cur, tot, fname)
 
-            report = processor.run(self._input_dir, operation, on_progress=_on_progress)
+            # conexão SQLite criada na própria thread do worker
+            with BatchJournal() as journal:
+                files = list_pdfs(self._input_dir)
+                estimator = BatchEstimator(journal)
+                probes = [estimator.probe(p) for p in files]
+                estimate = estimator.estimate(
+                    files, operation.name, workers=self._workers, probes=probes
+                )
+                self.estimated.emit(estimate.summary())
+                live = LiveETA(estimate, probes)
+
+                def _on_result(result: FileResult) -> None:
+                    live.observe(result)
+                    self.eta.emit(live.summary())
+
+                processor = BatchProcessor(
+                    self._output_dir,
+                    journal=journal,
+                    cache=ResultCache(),
+                )
+                report = processor.run(
+                    self._input_dir,
+                    operation,
+                    on_progress=_on_progress,
+                    file_list=files,
+                    workers=self._workers,
+                    resume=self._resume,
+                    on_result=_on_result,
+                )
             self.finished.emit(report)
         except Exception as exc:
             logger.error("BatchWorker falhou: %s", exc, exc_info=True)
             self.error.emit(str(exc))
 
-    def _build_operation(self):
-        if self._operation_name == "ocr":
-            use_gpu = self._use_gpu
-
-            def _ocr_op(doc: fitz.Document, output_path: Path) -> str:
-                engine = OCREngine(use_gpu=use_gpu)
-                results = engine.recognize_document(doc)
-                engine.save_ocr_layer(doc, results, output_path)
-                return f"{len(results)} páginas com OCR"
-
-            return _ocr_op
-
-        if self._operation_name.startswith("rotate_"):
-            angle = int(self._operation_name.split("_")[1])
-
-            def _rotate_op(doc: fitz.Document, output_path: Path) -> str:
-                from core.pdf_rotator import PDFRotator
-
-                result = PDFRotator().rotate_all(doc, angle, output_path)
-                return f"{result.pages_rotated} páginas rotacionadas {angle}°"
-
-            return _rotate_op
-
-        def _meta_op(doc: fitz.Document, output_path: Path) -> str:
-            meta = PDFMetadata().read(doc)
-            title = meta.title[:40] if meta.title else "(sem título)"
-            return f"título='{title}'"
-
-        return _meta_op
-
 
 class MergeWorker(QThread):
     finished = pyqtSignal(object)  # MergeResult
@@ -1,8 +1,29 @@
-from .file_utils import ensure_output_path, human_size, setup_logging
-from .font_matcher import FontMatcher
-from .gpu_utils import GPUMonitor
+import importlib
+from typing import Any
+
+# Importação preguiçosa (PEP 562): GPUMonitor importa torch, que não deve ser
+# carregado só para usar file_utils ou timing.
+_EXPORTS = {
+    "setup_logging": ".file_utils",
+    "ensure_output_path": ".file_utils",
+    "human_size": ".file_utils",
+    "GPUMonitor": ".gpu_utils",
+    "FontMatcher": ".font_matcher",
+}
 
 __all__ = ["setup_logging", "ensure_output_path", "human_size", "GPUMonitor", "FontMatcher"]
 
 
+def __getattr__(name: str) -> Any:
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(__all__)
+
+
 # "As ferramentas ampliam o alcance da mão." — Ernst Kapp
@@ -1,5 +1,8 @@
+import hashlib
 import logging
 import logging.handlers
+import os
+from collections.abc import Iterator
 from pathlib import Path
 
 from config.settings import LOG_BACKUP_COUNT, LOG_DATE_FORMAT, LOG_DIR, LOG_FORMAT
@@ -38,7 +41,10 @@ def setup_logging(debug: bool = False) -> logging.Logger:
     return root
 
 
-def ensure_output_path(input_path: Path, output_dir: Path, suffix: str = "_edited") -> Path:
+OUTPUT_SUFFIX = "_edited"
+
+
+def ensure_output_path(input_path: Path, output_dir: Path, suffix: str = OUTPUT_SUFFIX) -> Path:
     """
     Deriva caminho de saída a partir do caminho de entrada.
     Garante que o diretório de saída exista.
@@ -62,6 +68,26 @@ def list_pdfs(directory: Path) -> list[Path]:
     return sorted(directory.glob("*.pdf"))
 
 
+def iter_pdfs(directory: Path) -> Iterator[Path]:
+    """
+    Itera preguiçosamente sobre os PDFs de um diretório (não recursivo) via os.scandir.
+    Sem ordenação: adequado para pastas com dezenas de milhares de arquivos.
+    """
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.name.lower().endswith(".pdf") and entry.is_file():
+                yield Path(entry.path)
+
+
+def hash_file(path: Path, chunk_size: int = 1024 * 1024) -> str:
+    """SHA-256 do conteúdo do arquivo, lido em blocos (memória constante)."""
+    digest = hashlib.sha256()
+    with path.open("rb") as fh:
+        while chunk := fh.read(chunk_size):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
 def validate_pdf_path(path: Path) -> None:
     """
     Valida que o caminho aponta para um PDF legível.
@@ -0,0 +1,71 @@
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+
+class StageClock:
+    """
+    Acumula tempos por estágio (open, operate, save, render...) de uma unidade de trabalho.
+
+    Estágios aninhados são exclusivos: o tempo de um "save" medido dentro de
+    "operate" é descontado de "operate", então a soma dos estágios não conta
+    nada duas vezes.
+    """
+
+    def __init__(self) -> None:
+        self.stages: dict[str, float] = {}
+        self._stack: list[str] = []
+
+    @contextmanager
+    def measure(self, name: str) -> Iterator[None]:
+        parent = self._stack[-1] if self._stack else None
+        self._stack.append(name)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self._stack.pop()
+            self.stages[name] = self.stages.get(name, 0.0) + elapsed
+            if parent is not None:
+                self.stages[parent] = self.stages.get(parent, 0.0) - elapsed
+
+
+_ACTIVE_CLOCK: ContextVar[StageClock | None] = ContextVar("pdfforge_stage_clock", default=None)
+
+
+@contextmanager
+def activate_clock(clock: StageClock) -> Iterator[StageClock]:
+    """Torna clock o relógio corrente para stage() no contexto atual."""
+    token = _ACTIVE_CLOCK.set(clock)
+    try:
+        yield clock
+    finally:
+        _ACTIVE_CLOCK.reset(token)
+
+
+def add_stages(stages: dict[str, float]) -> None:
+    """Soma ao relógio ativo tempos medidos à parte (ex.: em outra thread)."""
+    clock = _ACTIVE_CLOCK.get()
+    if clock is None:
+        return
+    for name, seconds in stages.items():
+        clock.stages[name] = clock.stages.get(name, 0.0) + seconds
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    """
+    Marca um estágio no relógio ativo, se houver. Sem relógio ativo (uso fora do
+    lote), não faz nada além de executar o bloco.
+    """
+    clock = _ACTIVE_CLOCK.get()
+    if clock is None:
+        yield
+        return
+    with clock.measure(name):
+        yield
+
+
+# "O tempo é a coisa mais valiosa que um homem pode gastar." — Teofrasto